@@ -1,7 +1,10 @@
+import os
 from typing import Optional
 
-from flask import jsonify, Flask
+from flask import jsonify, Flask, request
 from flask_cors import CORS
+from pymongo.errors import PyMongoError
+from werkzeug.middleware.proxy_fix import ProxyFix
 
 from app.auth.routes import auth_bp
 from app.products.routes import products_bp
@@ -9,15 +12,31 @@ from app.orders.routes import orders_bp
 from app.lists.routes import lists_bp
 from app.settings.routes import settings_bp
 
+from app.auth import AuthRepository, admin_required
+from app.products import ProductsRepository
+from app.orders import OrdersRepository
+from app.lists import ListsRepository
+from app.settings import SettingsRepository
+
 from app.config import Config
-from app.extensions.mongo import init_mongo
+from app.extensions.mongo import init_mongo, db_cli, ensure_indexes, get_mongo_db
 from app.extensions.redis import init_redis
+from app.extensions.json_provider import init_json_provider
+from app.extensions.compression import init_compression
+from app.extensions.rate_limit import rate_limited
+from app.extensions.metrics import init_metrics
+
+
+INDEXED_REPOSITORIES = [AuthRepository, ProductsRepository, OrdersRepository, ListsRepository, SettingsRepository]
 
 
 def register_routes(app: Flask):
     """
     Register all Flask blueprints for the application.
 
+    Every blueprint is wrapped by `rate_limited`, which enforces the per-endpoint
+    limits from `RATE_LIMITS` (or `RATE_LIMIT_DEFAULT`) before the view runs.
+
     Args:
         app (Flask): The Flask application instance.
     """
@@ -30,7 +49,7 @@ def register_routes(app: Flask):
     ]
 
     for bp, prefix in blueprints:
-        app.register_blueprint(bp, url_prefix=prefix)
+        app.register_blueprint(rate_limited(bp), url_prefix=prefix)
 
 
 
@@ -46,10 +65,28 @@ def create_app(config_object: Optional[type[Config]] = None):
     """
     app = Flask(__name__)
     app.config.from_object(config_object or Config)
+    init_json_provider(app)
+
+    hops = app.config.get("PROXY_FIX_TRUSTED_HOPS", 0)
+    if hops:
+        # Only the proxies' own entries are trusted, so a client cannot pick its address.
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops, x_proto=hops, x_host=hops)
 
     init_mongo(app)
+    init_metrics(app)
     init_redis(app)
     register_routes(app)
+    init_compression(app)
+    app.cli.add_command(db_cli)
+
+    if app.config.get("MONGO_ENSURE_INDEXES"):
+        # Opt-in convenience for local development. A failure is logged rather than
+        # raised, so the app still starts and answers health checks.
+        try:
+            with app.app_context():
+                ensure_indexes(get_mongo_db(), INDEXED_REPOSITORIES)
+        except PyMongoError:
+            app.logger.exception("Could not reconcile MongoDB indexes at startup; run `flask db ensure-indexes`")
 
     CORS(app, origins=Config.FRONTEND_URL, supports_credentials=True)
 
@@ -70,17 +107,45 @@ def create_app(config_object: Optional[type[Config]] = None):
         except Exception as e:
             return jsonify({"redis_status": "error", "details": str(e)}), 500
 
+    @app.route("/health/sessions", methods=["GET"])
+    def session_cache_stats():
+        from .auth.session_cache import session_cache
+
+        return jsonify({"session_cache": session_cache.stats()}), 200
+
+    @app.route("/health/passwords", methods=["GET"])
+    def password_hasher_stats():
+        from .auth.passwords import password_hasher
+
+        return jsonify({"password_hasher": password_hasher.stats()}), 200
+
     @app.route("/health/mongo", methods=["GET"])
     def mongo_health_check():
-        from .extensions.mongo import get_mongo_db
+        from .extensions.mongo import get_mongo_db, get_mongo_pool_stats
 
         try:
             mongo_db = get_mongo_db()
             pong = mongo_db.command("ping")
             if pong:
-                return jsonify({"mongo_status": "ok"}), 200
-            return jsonify({"mongo_status": "unreachable"}), 500
+                return jsonify({"mongo_status": "ok", "pool": get_mongo_pool_stats()}), 200
+            return jsonify({"mongo_status": "unreachable", "pool": get_mongo_pool_stats()}), 500
         except Exception as e:
             return jsonify({"mongo_status": "error", "details": str(e)}), 500
 
+    @app.route("/admin/slow-queries", methods=["GET", "DELETE"])
+    @admin_required
+    def slow_queries(user):
+        recorder = app.slow_query_recorder
+        if recorder is None:
+            return jsonify({"error": "slow_query_log_disabled"}), 404
+        if request.method == "DELETE":
+            recorder.clear()
+            return "", 204
+        limit = request.args.get("limit", type=int)
+        return jsonify({
+            "threshold_ms": app.config.get("SLOW_QUERY_THRESHOLD_MS"),
+            "pid": os.getpid(),
+            "slow_queries": recorder.entries(limit),
+        }), 200
+
     return app
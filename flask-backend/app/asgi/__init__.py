@@ -0,0 +1,105 @@
+from typing import Optional
+
+from hypercorn.middleware import AsyncioWSGIMiddleware, ProxyFixMiddleware
+from quart import Quart, request
+from werkzeug.exceptions import HTTPException
+from werkzeug.routing import RequestRedirect
+
+from app import create_app
+from app.config import Config
+from app.extensions.json_provider import init_json_provider
+from app.extensions.metrics import init_async_metrics
+from app.extensions.mongo.async_client import init_async_mongo
+from app.extensions.rate_limit import rate_limited
+from app.extensions.redis.async_client import init_async_redis
+from app.auth.async_routes import auth_bp
+from app.lists.async_routes import lists_bp
+from app.orders.async_routes import orders_bp
+from app.products.async_routes import products_bp
+from app.settings.async_routes import settings_bp
+
+ASYNC_BLUEPRINTS = [
+    (products_bp, "/products"),
+    (auth_bp, "/auth"),
+    (orders_bp, "/orders"),
+    (lists_bp, "/lists"),
+    (settings_bp, "/settings"),
+]
+
+
+class AsyncRouteDispatcher:
+    """ASGI application serving async handlers natively and everything else through WSGI.
+
+    Routing is decided by the sync app's URL map, so both modes resolve every path to
+    the same endpoint. An endpoint is served by the Quart app when it has a handler of
+    the same name there; otherwise, and for CORS preflights, the request runs on the
+    sync Flask app in a worker thread.
+    """
+
+    def __init__(self, async_app: Quart, wsgi_app, max_body_size: int):
+        self.async_app = async_app
+        self.wsgi_app = wsgi_app
+        self._wsgi = AsyncioWSGIMiddleware(wsgi_app, max_body_size=max_body_size)
+        self._urls = wsgi_app.url_map.bind("")
+
+    def is_async(self, path: str, method: str):
+        if method == "OPTIONS":
+            return False
+        try:
+            endpoint, _ = self._urls.match(path, method=method)
+        except (HTTPException, RequestRedirect):
+            return False
+        return endpoint in self.async_app.view_functions
+
+    async def __call__(self, scope, receive, send):
+        # Lifespan events go to Quart so the async clients are opened and closed with it.
+        if scope["type"] != "http" or self.is_async(scope["path"], scope["method"]):
+            return await self.async_app(scope, receive, send)
+        return await self._wsgi(scope, receive, send)
+
+
+def create_asgi_app(config_object: Optional[type[Config]] = None):
+    """
+    Application factory for ASGI servers.
+
+    Builds the sync app with `create_app` and a Quart app holding the async handlers,
+    which run on `AsyncMongoClient` and `redis.asyncio` and never block a thread while
+    waiting on I/O.
+
+    Args:
+        config_object (Optional[Type[Config]]): Configuration class. Defaults to `Config`.
+
+    Returns:
+        AsyncRouteDispatcher: The ASGI application.
+    """
+    flask_app = create_app(config_object)
+
+    app = Quart(__name__)
+    app.config.from_object(config_object or Config)
+    init_json_provider(app)
+    # WSGI requests go through `create_app`'s `ProxyFix`; this is its Quart counterpart.
+    hops = app.config.get("PROXY_FIX_TRUSTED_HOPS", 0)
+    if hops:
+        app.asgi_app = ProxyFixMiddleware(app.asgi_app, mode="legacy", trusted_hops=hops)
+    init_async_mongo(app, event_listeners=flask_app.mongo_event_listeners)
+    init_async_metrics(app)
+    init_async_redis(app)
+    for bp, prefix in ASYNC_BLUEPRINTS:
+        app.register_blueprint(rate_limited(bp), url_prefix=prefix)
+
+    allowed_origins = {Config.FRONTEND_URL}
+    compressor = getattr(flask_app, "compressor", None)
+
+    @app.after_request
+    async def finish_response(response):
+        # The sync app gets these from flask-cors and `init_compression`.
+        origin = request.headers.get("Origin")
+        if origin in allowed_origins:
+            response.headers["Access-Control-Allow-Origin"] = origin
+            response.headers["Access-Control-Allow-Credentials"] = "true"
+            response.vary.add("Origin")
+        if compressor is not None:
+            response = await compressor.compress_async(response, request)
+        return response
+
+    return AsyncRouteDispatcher(app, flask_app, max_body_size=app.config["ASGI_MAX_BODY_BYTES"])
@@ -0,0 +1,55 @@
+from functools import wraps
+from http import HTTPStatus
+
+import jwt
+from jwt import InvalidTokenError, ExpiredSignatureError, DecodeError
+from quart import current_app, jsonify, request
+
+from app.auth.async_repository import AsyncSessionsRepository
+from app.auth.session_cache import session_cache
+from app.auth.sessions import session_id_for_token
+from app.config import Config
+from app.extensions.mongo import parse_object_id
+
+sessions_repo = AsyncSessionsRepository()
+
+
+def auth_required(f):
+    """`app.auth.auth_required` for Quart handlers.
+
+    Hits in the in-process session cache are used as-is. Misses are looked up in Redis
+    but not cached, because only the sync app runs the invalidation listener that
+    keeps cached sessions from outliving a revocation.
+    """
+    @wraps(f)
+    async def decorated(*args, **kwargs):
+        token = request.cookies.get(Config.JWT_COOKIE_NAME)
+        if not token:
+            return jsonify({"error": "missing_token"}), HTTPStatus.UNAUTHORIZED
+
+        session_id = session_id_for_token(token)
+        user = session_cache.get(session_id)
+        if user is not None:
+            return await f(user, *args, **kwargs)
+
+        try:
+            payload = jwt.decode(token, current_app.config["JWT_SECRET_KEY"], algorithms=[current_app.config["JWT_ALGORITHM"]])
+        except (InvalidTokenError, ExpiredSignatureError, DecodeError):
+            return jsonify({"error": "invalid_token"}), HTTPStatus.UNAUTHORIZED
+
+        user = await sessions_repo.get_session_for_token(token)
+        if not user:
+            return jsonify({"error": "session_expired"}), HTTPStatus.UNAUTHORIZED
+
+        if payload.get("sub") != user.get("user_id"):
+            return jsonify({"error": "session_mismatch"}), HTTPStatus.UNAUTHORIZED
+
+        user_id_obj = parse_object_id(user.get("user_id"))
+        if not user_id_obj:
+            return jsonify({"error": "invalid_user_id"}), HTTPStatus.UNAUTHORIZED
+        user["id"] = user_id_obj
+        user["session_id"] = session_id
+
+        return await f(user, *args, **kwargs)
+
+    return decorated
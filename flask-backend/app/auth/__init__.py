@@ -1,4 +1,4 @@
-from .decorators import auth_required
+from .decorators import admin_required, auth_required
 from .jwt import create_access_token, decode_token
 from .repository import AuthRepository
 from .utils import generate_user_response
@@ -0,0 +1,136 @@
+import json
+from typing import Optional
+
+from pydantic import EmailStr
+
+from app.extensions.mongo import parse_object_id
+from app.extensions.mongo.async_client import get_async_mongo_db
+from app.extensions.redis.async_client import get_async_redis_client
+from app.auth.repository import AuthRepository
+from app.auth.sessions import DELETE_OWN_SESSION_LUA, LEGACY_SESSION_KEY_PREFIX, SessionsRepository, session_id_for_token
+
+
+class AsyncAuthRepository:
+    """`AuthRepository` on the async MongoDB client."""
+
+    def __init__(self):
+        pass
+
+    @property
+    def db(self):
+        return get_async_mongo_db()
+
+    @property
+    def users(self):
+        return self.db.users
+
+    async def find_user_by_email(self, email: EmailStr):
+        return await self.users.find_one({"email": email})
+
+    async def find_user_by_id(self, user_id: str):
+        return await self.users.find_one({"_id": parse_object_id(user_id)})
+
+    async def create_user(self, name: str, email: EmailStr, password_hash: str, role: str = "customer"):
+        user_data = AuthRepository.build_user(name=name, email=email, password_hash=password_hash, role=role)
+        await self.users.insert_one(user_data)
+        return user_data
+
+    async def update_password_hash(self, user_id: str, old_hash: str, new_hash: str):
+        """Replace a password hash unless it was changed since `old_hash` was read."""
+        result = await self.users.update_one(
+            {"_id": parse_object_id(user_id), "password_hash": old_hash},
+            {"$set": {"password_hash": new_hash}},
+        )
+        return result.modified_count == 1
+
+    async def delete_user(self, user_id: str):
+        return await self.users.delete_one({"_id": parse_object_id(user_id)})
+
+
+class AsyncSessionsRepository:
+    """`SessionsRepository` on the `redis.asyncio` client, sharing its key layout."""
+
+    def __init__(self):
+        self._delete_own_session = None
+        self._script_client = None
+
+    @property
+    def redis(self):
+        return get_async_redis_client()
+
+    async def create_session(self, token: str, user: dict, ttl_seconds: int, user_agent: Optional[str] = None):
+        session_id = session_id_for_token(token)
+        session_data = SessionsRepository.build_session(user, user_agent)
+        index_key = SessionsRepository._user_sessions_key(session_data["user_id"])
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.set(SessionsRepository._session_key(session_id), json.dumps(session_data, separators=(",", ":")), ex=ttl_seconds)
+            pipe.sadd(index_key, session_id)
+            pipe.expire(index_key, ttl_seconds)
+            await pipe.execute()
+        return session_id
+
+    async def get_session(self, session_id: str):
+        value = await self.redis.get(SessionsRepository._session_key(session_id))
+        if not value:
+            return None
+        if isinstance(value, bytes):
+            value = value.decode("utf-8")
+        return json.loads(value)
+
+    async def get_session_for_token(self, token: str):
+        """`SessionsRepository.get_session_for_token`; legacy sessions are read but left for the sync app to migrate."""
+        session = await self.get_session(session_id_for_token(token))
+        if session is not None:
+            return session
+        value = await self.redis.get(f"{LEGACY_SESSION_KEY_PREFIX}{token}")
+        if not value:
+            return None
+        if isinstance(value, bytes):
+            value = value.decode("utf-8")
+        return json.loads(value)
+
+    async def delete_session(self, user_id: str, session_id: str):
+        """`SessionsRepository.delete_session`: only a session in the user's own index is deleted."""
+        redis_client = self.redis
+        if self._script_client is not redis_client:
+            self._delete_own_session = redis_client.register_script(DELETE_OWN_SESSION_LUA)
+            self._script_client = redis_client
+        deleted = await self._delete_own_session(
+            keys=[SessionsRepository._user_sessions_key(str(user_id)), SessionsRepository._session_key(session_id)],
+            args=[session_id],
+        )
+        return deleted > 0
+
+    async def list_sessions(self, user_id: str):
+        """`SessionsRepository.list_sessions`, pruning index entries whose session expired."""
+        index_key = SessionsRepository._user_sessions_key(str(user_id))
+        session_ids = sorted(await self.redis.smembers(index_key))
+        if not session_ids:
+            return []
+
+        values = await self.redis.mget([SessionsRepository._session_key(sid) for sid in session_ids])
+        sessions, expired = [], []
+        for session_id, value in zip(session_ids, values):
+            if not value:
+                expired.append(session_id)
+                continue
+            if isinstance(value, bytes):
+                value = value.decode("utf-8")
+            sessions.append(SessionsRepository.session_summary(session_id, json.loads(value)))
+
+        if expired:
+            await self.redis.srem(index_key, *expired)
+        return sessions
+
+    async def revoke_all_sessions(self, user_id: str):
+        """`SessionsRepository.revoke_all_sessions`; returns the revoked session ids."""
+        index_key = SessionsRepository._user_sessions_key(str(user_id))
+        session_ids = list(await self.redis.smembers(index_key))
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for session_id in session_ids:
+                pipe.delete(SessionsRepository._session_key(session_id))
+            pipe.delete(index_key)
+            await pipe.execute()
+        return session_ids
@@ -0,0 +1,136 @@
+from http import HTTPStatus
+
+from pymongo.errors import DuplicateKeyError
+from quart import Blueprint, jsonify, request
+
+from app.asgi.auth import auth_required
+from app.config import Config
+from app.extensions.mongo.async_client import get_async_mongo_db, insert_across_collections_async
+from app.extensions.redis.async_client import get_async_redis_client
+from app.extensions.validation import validate_body
+from app.auth import generate_user_response
+from app.auth.async_repository import AsyncAuthRepository, AsyncSessionsRepository
+from app.auth.passwords import PasswordHasherBusy, password_hasher
+from app.auth.routes import LoginSchema, RegisterSchema, _hasher_busy
+from app.auth.session_cache import session_cache
+from app.auth.sessions import session_id_for_token
+from app.lists import ListsRepository
+from app.settings import SettingsRepository
+from app.utils import error_response
+
+# Same name as the sync blueprint, so endpoints line up with `auth_bp`.
+auth_bp = Blueprint("auth", __name__)
+
+auth_repo = AsyncAuthRepository()
+sessions_repo = AsyncSessionsRepository()
+
+
+async def _start_session(user: dict, access_token: str):
+    """Persist the Redis session backing a freshly issued access token."""
+    await sessions_repo.create_session(
+        token=access_token,
+        user=user,
+        ttl_seconds=60 * Config.JWT_ACCESS_EXPIRES_MINUTES,
+        user_agent=request.headers.get("User-Agent"),
+    )
+
+
+@auth_bp.post("/register")
+@validate_body(RegisterSchema)
+async def register(data: RegisterSchema):
+    try:
+        password_hash = await password_hasher.hash_async(data.password)
+    except PasswordHasherBusy:
+        return _hasher_busy()
+
+    try:
+        user = await auth_repo.create_user(name=data.name, email=data.email, password_hash=password_hash)
+    except DuplicateKeyError:
+        return error_response("email_in_use", HTTPStatus.CONFLICT)
+
+    await insert_across_collections_async(get_async_mongo_db(), [
+        ("settings", SettingsRepository.build_settings(user_id=user["_id"])),
+        ("lists", ListsRepository.build_list(user_id=user["_id"], name="Wishlist", product_ids=[])),
+    ])
+
+    response_body, access_token = generate_user_response(user=user)
+    await _start_session(user=user, access_token=access_token)
+    return response_body, HTTPStatus.CREATED
+
+
+@auth_bp.post("/login")
+@validate_body(LoginSchema)
+async def login(data: LoginSchema):
+    user = await auth_repo.find_user_by_email(email=data.email)
+    if not user:
+        return error_response("invalid_credentials", HTTPStatus.UNAUTHORIZED)
+    try:
+        if not await password_hasher.verify_async(pwhash=user["password_hash"], password=data.password):
+            return error_response("invalid_credentials", HTTPStatus.UNAUTHORIZED)
+    except PasswordHasherBusy:
+        return _hasher_busy()
+
+    if password_hasher.needs_rehash(user["password_hash"]):
+        try:
+            new_hash = await password_hasher.hash_async(data.password)
+        except PasswordHasherBusy:
+            new_hash = None
+        if new_hash and await auth_repo.update_password_hash(user["_id"], user["password_hash"], new_hash):
+            password_hasher.record_rehash()
+
+    response_body, access_token = generate_user_response(user=user)
+    await _start_session(user=user, access_token=access_token)
+    return response_body, HTTPStatus.OK
+
+
+@auth_bp.post("/logout")
+async def logout():
+    token = request.cookies.get(Config.JWT_COOKIE_NAME)
+    if token:
+        session_id = session_id_for_token(token)
+        session = await sessions_repo.get_session_for_token(token)
+        if session:
+            await sessions_repo.delete_session(user_id=session["user_id"], session_id=session_id)
+        await session_cache.invalidate_async(get_async_redis_client(), session_id)
+
+    response = jsonify({"message": "logged_out"})
+    response.delete_cookie(
+        key=Config.JWT_COOKIE_NAME,
+        domain=Config.JWT_COOKIE_DOMAIN,
+        secure=Config.JWT_COOKIE_SECURE,
+        samesite=Config.JWT_COOKIE_SAMESITE,
+    )
+    return response, HTTPStatus.OK
+
+
+@auth_bp.delete("/delete")
+@auth_required
+async def delete_account(user):
+    db_user = await auth_repo.find_user_by_id(user_id=user["id"])
+    if not db_user:
+        return error_response("user_not_found", HTTPStatus.NOT_FOUND)
+
+    await auth_repo.delete_user(user_id=user["id"])
+
+    revoked = await sessions_repo.revoke_all_sessions(user_id=user["id"])
+    await session_cache.invalidate_async(get_async_redis_client(), *revoked)
+
+    return jsonify({"message": "account_deleted"}), HTTPStatus.OK
+
+
+@auth_bp.get("/sessions")
+@auth_required
+async def list_sessions(user):
+    sessions = await sessions_repo.list_sessions(user_id=user["id"])
+    for session in sessions:
+        session["current"] = session["id"] == user["session_id"]
+    return jsonify(sessions), HTTPStatus.OK
+
+
+@auth_bp.delete("/sessions/<session_id>")
+@auth_required
+async def revoke_session(user, session_id: str):
+    if not await sessions_repo.delete_session(user_id=user["id"], session_id=session_id):
+        return error_response("session_not_found", HTTPStatus.NOT_FOUND)
+    await session_cache.invalidate_async(get_async_redis_client(), session_id)
+    return jsonify({"revoked": True, "session_id": session_id}), HTTPStatus.OK
@@ -1,14 +1,18 @@
-import json
 from functools import wraps
 from http import HTTPStatus
 
 from flask import request, jsonify
 from jwt import InvalidTokenError, ExpiredSignatureError, DecodeError
+from redis.exceptions import RedisError
 
 from app.auth.jwt import decode_token
+from app.auth.session_cache import session_cache
+from app.auth.sessions import SessionsRepository, session_id_for_token
 from app.extensions.mongo import parse_object_id
 from app.extensions.redis import get_redis_client
 
+sessions_repo = SessionsRepository()
+
 
 def auth_required(f):
     @wraps(f)
@@ -17,19 +21,27 @@ def auth_required(f):
         if not token:
             return jsonify({"error": "missing_token"}), HTTPStatus.UNAUTHORIZED
 
+        session_id = session_id_for_token(token)
+        user = session_cache.get(session_id)
+        if user is not None:
+            return f(user, *args, **kwargs)
+
         try:
             payload = decode_token(token)
         except (InvalidTokenError, ExpiredSignatureError, DecodeError):
             return jsonify({"error": "invalid_token"}), HTTPStatus.UNAUTHORIZED
 
-        redis_client = get_redis_client()
-        user_json = redis_client.get(f"user_session:{token}")
-        if not user_json:
-            return jsonify({"error": "session_expired"}), HTTPStatus.UNAUTHORIZED
+        try:
+            session_cache.ensure_subscribed(get_redis_client())
+            cacheable = True
+        except RedisError:
+            cacheable = False
 
-        if isinstance(user_json, bytes):
-            user_json = user_json.decode("utf-8")
-        user = json.loads(user_json)
+        # Sampled before the read, so a logout evicted while it is in flight is not re-cached.
+        generation = session_cache.generation
+        user = sessions_repo.get_session_for_token(token)
+        if not user:
+            return jsonify({"error": "session_expired"}), HTTPStatus.UNAUTHORIZED
 
         if payload.get("sub") != user.get("user_id"):
             return jsonify({"error": "session_mismatch"}), HTTPStatus.UNAUTHORIZED
@@ -38,7 +50,22 @@ def auth_required(f):
         if not user_id_obj:
             return jsonify({"error": "invalid_user_id"}), HTTPStatus.UNAUTHORIZED
         user["id"] = user_id_obj
+        user["session_id"] = session_id
+
+        if cacheable:
+            session_cache.set(session_id, user, token_exp=payload.get("exp"), generation=generation)
 
         return f(user, *args, **kwargs)
 
     return decorated
+
+
+def admin_required(f):
+    @auth_required
+    @wraps(f)
+    def decorated(user, *args, **kwargs):
+        if user.get("role") != "admin":
+            return jsonify({"error": "forbidden"}), HTTPStatus.FORBIDDEN
+        return f(user, *args, **kwargs)
+
+    return decorated
@@ -2,9 +2,10 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 import jwt
-from flask import current_app
 from jwt import InvalidTokenError, ExpiredSignatureError
 
+from app.utils import current_config
+
 
 def create_access_token(subject: str, claims: Optional[dict[str, any]] = None):
     """
@@ -17,8 +18,9 @@ def create_access_token(subject: str, claims: Optional[dict[str, any]] = None):
     Returns:
         str: The encoded JWT access token.
     """
+    config = current_config()
     now = datetime.now(timezone.utc)
-    expires_delta = timedelta(minutes=current_app.config["JWT_ACCESS_EXPIRES_MINUTES"])
+    expires_delta = timedelta(minutes=config["JWT_ACCESS_EXPIRES_MINUTES"])
 
     payload: dict[str, any] = {
         "sub": subject,
@@ -31,8 +33,8 @@ def create_access_token(subject: str, claims: Optional[dict[str, any]] = None):
 
     token = jwt.encode(
         payload,
-        current_app.config["JWT_SECRET_KEY"],
-        algorithm=current_app.config["JWT_ALGORITHM"],
+        config["JWT_SECRET_KEY"],
+        algorithm=config["JWT_ALGORITHM"],
     )
 
     return token
@@ -52,11 +54,12 @@ def decode_token(token: str):
         jwt.ExpiredSignatureError: If the token has expired.
         jwt.InvalidTokenError: If the token is invalid or cannot be decoded.
     """
+    config = current_config()
     try:
         payload = jwt.decode(
             token,
-            current_app.config["JWT_SECRET_KEY"],
-            algorithms=[current_app.config["JWT_ALGORITHM"]],
+            config["JWT_SECRET_KEY"],
+            algorithms=[config["JWT_ALGORITHM"]],
         )
         return payload
     except ExpiredSignatureError as e:
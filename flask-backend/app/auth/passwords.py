@@ -0,0 +1,176 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from functools import cached_property
+from typing import Optional
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from app.config import Config
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the pool cannot take a call: its queue is full, a hash timed out or the pool broke."""
+
+
+class PasswordHasher:
+    """Password hashing and verification off the request thread.
+
+    Inline, every request thread that logs in burns a core on scrypt/pbkdf2 at once, and
+    a login burst starves the threads serving everything else. Calls are instead sent
+    to a process pool of `workers` processes, which caps the CPU spent on hashing; the
+    request thread only waits on the result. At most `max_pending` calls may be queued
+    or running per worker process, and further calls fail fast with
+    `PasswordHasherBusy` instead of piling up behind the burst. A call that times out
+    keeps its slot until its hash finishes, since a running hash cannot be cancelled.
+
+    The pool is created on first use in each process, so it is never inherited
+    across `fork()`. With `workers=0` hashing runs inline.
+    """
+
+    def __init__(self, method: str, salt_length: int, workers: int, max_pending: int, timeout_seconds: float):
+        self.method = method
+        self.salt_length = salt_length
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout_seconds = timeout_seconds
+        self.rejected = 0
+        self.rehashed = 0
+        self._pending = threading.BoundedSemaphore(max_pending)
+        self._executor: Optional[Executor] = None
+        self._executor_pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @cached_property
+    def method_prefix(self):
+        """
+        The method as it is written into hashes, with werkzeug's defaults filled in.
+
+        `scrypt` is stored as `scrypt:32768:8:1`, so hashes are compared against one
+        generated with the configured method rather than against the setting itself.
+        """
+        return generate_password_hash("", method=self.method, salt_length=1).split("$", 1)[0]
+
+    def hash(self, password: str):
+        """
+        Hash a password with the configured method and work factor.
+
+        Raises:
+            PasswordHasherBusy: If the pool is saturated.
+        """
+        return self._run(generate_password_hash, password, self.method, self.salt_length)
+
+    def verify(self, pwhash: str, password: str):
+        """
+        Check a password against a stored hash of any supported method.
+
+        Raises:
+            PasswordHasherBusy: If the pool is saturated.
+        """
+        return self._run(check_password_hash, pwhash, password)
+
+    async def hash_async(self, password: str):
+        """`hash` for async handlers, awaiting the pool instead of blocking a thread."""
+        return await self._run_async(generate_password_hash, password, self.method, self.salt_length)
+
+    async def verify_async(self, pwhash: str, password: str):
+        """`verify` for async handlers, awaiting the pool instead of blocking a thread."""
+        return await self._run_async(check_password_hash, pwhash, password)
+
+    def needs_rehash(self, pwhash: str):
+        """Whether a stored hash was made with a different method or work factor."""
+        return pwhash.split("$", 1)[0] != self.method_prefix
+
+    def stats(self):
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "method": self.method_prefix,
+            "rejected": self.rejected,
+            "rehashed": self.rehashed,
+        }
+
+    def record_rehash(self):
+        """Count a stored hash that was upgraded to the configured method."""
+        with self._lock:
+            self.rehashed += 1
+
+    def _busy(self):
+        with self._lock:
+            self.rejected += 1
+        return PasswordHasherBusy()
+
+    def _submit(self, fn, *args):
+        if not self._pending.acquire(blocking=False):
+            raise self._busy()
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._pending.release()
+            raise
+        # Released when the hash finishes, not when the caller stops waiting for it.
+        future.add_done_callback(lambda _: self._pending.release())
+        return future
+
+    def _run(self, fn, *args):
+        if not self.workers:
+            return fn(*args)
+        try:
+            future = self._submit(fn, *args)
+            try:
+                return future.result(timeout=self.timeout_seconds)
+            except FutureTimeout:
+                future.cancel()
+                raise self._busy() from None
+        except BrokenProcessPool:
+            # A hashing process died (e.g. OOM-killed); start a fresh pool next call.
+            self.shutdown()
+            raise PasswordHasherBusy() from None
+
+    async def _run_async(self, fn, *args):
+        if not self.workers:
+            # Inline hashing would stall every request on the event loop.
+            return await asyncio.to_thread(fn, *args)
+        try:
+            future = self._submit(fn, *args)
+            try:
+                return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout_seconds)
+            except asyncio.TimeoutError:
+                future.cancel()
+                raise self._busy() from None
+        except BrokenProcessPool:
+            self.shutdown()
+            raise PasswordHasherBusy() from None
+
+    def _get_executor(self):
+        pid = os.getpid()
+        if self._executor is None or self._executor_pid != pid:
+            with self._lock:
+                if self._executor is None or self._executor_pid != pid:
+                    # `spawn` children do not inherit the threads and sockets of a running
+                    # server, which `fork` from a threaded worker would copy unsafely.
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                    self._executor_pid = pid
+        return self._executor
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None and self._executor_pid == os.getpid():
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._executor_pid = None
+
+
+password_hasher = PasswordHasher(
+    method=Config.PASSWORD_HASH_METHOD,
+    salt_length=Config.PASSWORD_SALT_LENGTH,
+    workers=Config.PASSWORD_HASH_WORKERS,
+    max_pending=Config.PASSWORD_HASH_MAX_PENDING,
+    timeout_seconds=Config.PASSWORD_HASH_TIMEOUT_SECONDS,
+)
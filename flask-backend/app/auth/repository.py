@@ -1,11 +1,18 @@
 from datetime import datetime
-from werkzeug.security import generate_password_hash
+
+from pymongo import ASCENDING, IndexModel
 from pydantic import EmailStr
 
 from app.extensions.mongo import get_mongo_db, parse_object_id
 
 
 class AuthRepository:
+    INDEXES = {
+        "users": [
+            IndexModel([("email", ASCENDING)], name="users_email_unique", unique=True),
+        ],
+    }
+
     def __init__(self):
         pass
 
@@ -23,16 +30,28 @@ class AuthRepository:
     def find_user_by_id(self, user_id: str):
         return self.users.find_one({"_id": parse_object_id(user_id)})
 
-    def create_user(self, name: str, email: EmailStr, password: str, role: str = "customer"):
-        user_data = {
+    @staticmethod
+    def build_user(name: str, email: EmailStr, password_hash: str, role: str = "customer"):
+        return {
             "name": name,
             "email": email,
-            "password_hash": generate_password_hash(password),
+            "password_hash": password_hash,
             "role": role,
             "created_at": datetime.now(),
         }
-        inserted_id = self.users.insert_one(user_data).inserted_id
-        return self.find_user_by_id(inserted_id)
+
+    def create_user(self, name: str, email: EmailStr, password_hash: str, role: str = "customer"):
+        user_data = self.build_user(name=name, email=email, password_hash=password_hash, role=role)
+        self.users.insert_one(user_data)
+        return user_data
+
+    def update_password_hash(self, user_id: str, old_hash: str, new_hash: str):
+        """Replace a password hash unless it was changed since `old_hash` was read."""
+        result = self.users.update_one(
+            {"_id": parse_object_id(user_id), "password_hash": old_hash},
+            {"$set": {"password_hash": new_hash}},
+        )
+        return result.modified_count == 1
 
     def delete_user(self, user_id: str):
         return self.users.delete_one({"_id": parse_object_id(user_id)})
@@ -1,13 +1,17 @@
-import json
 from http import HTTPStatus
 
 from flask import Blueprint, jsonify, request
-from werkzeug.security import check_password_hash
-from pydantic import BaseModel, EmailStr, constr, ValidationError
+from pydantic import BaseModel, EmailStr, constr
+from pymongo.errors import DuplicateKeyError
 
 from app.config import Config
+from app.extensions.mongo import get_mongo_db, insert_across_collections
 from app.extensions.redis import get_redis_client
+from app.extensions.validation import validate_body
 from app.auth import auth_required, AuthRepository, generate_user_response
+from app.auth.passwords import PasswordHasherBusy, password_hasher
+from app.auth.session_cache import session_cache
+from app.auth.sessions import SessionsRepository, session_id_for_token
 from app.settings import SettingsRepository
 from app.lists import ListsRepository
 from app.utils import error_response
@@ -15,8 +19,7 @@ from app.utils import error_response
 auth_bp = Blueprint("auth", __name__)
 
 auth_repo = AuthRepository()
-settings_repo = SettingsRepository()
-lists_repo = ListsRepository()
+sessions_repo = SessionsRepository()
 
 
 class RegisterSchema(BaseModel):
@@ -30,59 +33,91 @@ class LoginSchema(BaseModel):
     password: constr(min_length=8)
 
 
-@auth_bp.post("/register")
-def register():
-    payload = request.get_json()
-    if payload is None:
-        return error_response("invalid_json")
+def _hasher_busy():
+    response, status = error_response("auth_busy", HTTPStatus.SERVICE_UNAVAILABLE)
+    response.headers["Retry-After"] = "1"
+    return response, status
+
+
+def _start_session(user: dict, access_token: str):
+    """Persist the Redis session backing a freshly issued access token."""
+    sessions_repo.create_session(
+        token=access_token,
+        user=user,
+        ttl_seconds=60 * Config.JWT_ACCESS_EXPIRES_MINUTES,
+        user_agent=request.headers.get("User-Agent"),
+    )
+
 
+@auth_bp.post("/register")
+@validate_body(RegisterSchema)
+def register(data: RegisterSchema):
     try:
-        data = RegisterSchema(**payload)
-    except ValidationError as e:
-        return error_response("invalid_payload", details=e.errors(), status=HTTPStatus.BAD_REQUEST)
+        password_hash = password_hasher.hash(data.password)
+    except PasswordHasherBusy:
+        return _hasher_busy()
 
-    if auth_repo.find_user_by_email(email=data.email):
+    # The unique `users_email_unique` index rejects duplicates, so no lookup is needed first.
+    try:
+        user = auth_repo.create_user(name=data.name, email=data.email, password_hash=password_hash)
+    except DuplicateKeyError:
         return error_response("email_in_use", HTTPStatus.CONFLICT)
 
-    user = auth_repo.create_user(name=data.name, email=data.email, password=data.password)
-
-    settings_repo.create_settings(user_id=user["user_id"])
-    lists_repo.create_list(user_id=user["user_id"], name="Wishlist", product_ids=[])
+    insert_across_collections(get_mongo_db(), [
+        ("settings", SettingsRepository.build_settings(user_id=user["_id"])),
+        ("lists", ListsRepository.build_list(user_id=user["_id"], name="Wishlist", product_ids=[])),
+    ])
 
-    response_body, _ = generate_user_response(user=user)
+    response_body, access_token = generate_user_response(user=user)
+    _start_session(user=user, access_token=access_token)
     return response_body, HTTPStatus.CREATED
 
 
 @auth_bp.post("/login")
-def login():
-    payload = request.get_json()
-    if payload is None:
-        return error_response("invalid_json")
-
-    try:
-        data = LoginSchema(**payload)
-    except ValidationError as e:
-        return error_response("invalid_payload", details=e.errors(), status=HTTPStatus.BAD_REQUEST)
-
+@validate_body(LoginSchema)
+def login(data: LoginSchema):
     user = auth_repo.find_user_by_email(email=data.email)
-    if not user or not check_password_hash(pwhash=user["password_hash"], password=data.password):
+    if not user:
         return error_response("invalid_credentials", HTTPStatus.UNAUTHORIZED)
+    try:
+        if not password_hasher.verify(pwhash=user["password_hash"], password=data.password):
+            return error_response("invalid_credentials", HTTPStatus.UNAUTHORIZED)
+    except PasswordHasherBusy:
+        return _hasher_busy()
+
+    # The plaintext is only available now, so this is when hashes made with an older
+    # method or work factor can be upgraded. A busy pool just defers it to a later login.
+    if password_hasher.needs_rehash(user["password_hash"]):
+        try:
+            new_hash = password_hasher.hash(data.password)
+        except PasswordHasherBusy:
+            new_hash = None
+        if new_hash and auth_repo.update_password_hash(user["_id"], user["password_hash"], new_hash):
+            password_hasher.record_rehash()
 
     response_body, access_token = generate_user_response(user=user)
+    _start_session(user=user, access_token=access_token)
+    return response_body, HTTPStatus.OK
 
-    redis_client = get_redis_client()
-    redis_key = f"user_session:{access_token}"
-    redis_client.set(
-        redis_key,
-        json.dumps({
-            "user_id": str(user["_id"]),
-            "role": user.get("role", "customer"),
-            "email": user["email"],
-        }),
-        ex=(60 * Config.JWT_ACCESS_EXPIRES_MINUTES)
-    )
 
-    return response_body, HTTPStatus.OK
+@auth_bp.post("/logout")
+def logout():
+    token = request.cookies.get(Config.JWT_COOKIE_NAME)
+    if token:
+        session_id = session_id_for_token(token)
+        session = sessions_repo.get_session_for_token(token)
+        if session:
+            sessions_repo.delete_session(user_id=session["user_id"], session_id=session_id)
+        session_cache.invalidate(get_redis_client(), session_id)
+
+    response = jsonify({"message": "logged_out"})
+    response.delete_cookie(
+        key=Config.JWT_COOKIE_NAME,
+        domain=Config.JWT_COOKIE_DOMAIN,
+        secure=Config.JWT_COOKIE_SECURE,
+        samesite=Config.JWT_COOKIE_SAMESITE,
+    )
+    return response, HTTPStatus.OK
 
 
 @auth_bp.delete("/delete")
@@ -94,11 +129,25 @@ def delete_account(user):
 
     auth_repo.delete_user(user_id=user["id"])
 
-    redis_client = get_redis_client()
-    keys = redis_client.keys(f"user_session:*")
-    for key in keys:
-        value = redis_client.get(key)
-        if value and json.loads(value).get("_id") == str(user["id"]):
-            redis_client.delete(key)
+    revoked = sessions_repo.revoke_all_sessions(user_id=user["id"])
+    session_cache.invalidate(get_redis_client(), *revoked)
+
+    return jsonify({"message": "account_deleted"}), HTTPStatus.OK
 
-    return jsonify({"message": "account_deleted"}), HTTPStatus.OK
\ No newline at end of file
+
+@auth_bp.get("/sessions")
+@auth_required
+def list_sessions(user):
+    sessions = sessions_repo.list_sessions(user_id=user["id"])
+    for session in sessions:
+        session["current"] = session["id"] == user["session_id"]
+    return jsonify(sessions), HTTPStatus.OK
+
+
+@auth_bp.delete("/sessions/<session_id>")
+@auth_required
+def revoke_session(user, session_id: str):
+    if not sessions_repo.delete_session(user_id=user["id"], session_id=session_id):
+        return error_response("session_not_found", HTTPStatus.NOT_FOUND)
+    session_cache.invalidate(get_redis_client(), session_id)
+    return jsonify({"revoked": True, "session_id": session_id}), HTTPStatus.OK
\ No newline at end of file
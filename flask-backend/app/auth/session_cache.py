@@ -0,0 +1,181 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.config import Config
+
+
+class SessionCache:
+    """Bounded in-process LRU cache of validated sessions with per-entry expiry.
+
+    Entries are keyed by session id and evicted across workers by publishing that id
+    on a Redis pub/sub channel; every process subscribes lazily on first use. Every
+    eviction bumps `generation`, so a session read from Redis before an eviction is not
+    cached after it.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int, channel: str):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.channel = channel
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._subscribe_lock = threading.Lock()
+        self._subscriber = None
+        self._subscriber_pid: Optional[int] = None
+
+    @property
+    def generation(self):
+        """Counter of evictions; sample it before reading a session to pass to `set`."""
+        return self._generation
+
+    def get(self, session_id: str):
+        """
+        Look up a cached session.
+
+        Args:
+            session_id (str): Session id.
+
+        Returns:
+            Optional[dict]: A copy of the cached session, or None on miss or expiry.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[session_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(session_id)
+            self.hits += 1
+            return dict(entry[1])
+
+    def set(self, session_id: str, session: dict, token_exp: Optional[int] = None, generation: Optional[int] = None):
+        """
+        Cache a validated session.
+
+        Args:
+            session_id (str): Session id.
+            session (dict): Session payload as stored in Redis.
+            token_exp (Optional[int]): JWT `exp` claim; the entry never outlives the token.
+            generation (Optional[int]): `generation` sampled before the session was read
+                from Redis. If any session was evicted since, the read may predate a
+                revocation, so nothing is cached.
+        """
+        ttl = self.ttl_seconds
+        if token_exp is not None:
+            ttl = min(ttl, token_exp - time.time())
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[session_id] = (time.monotonic() + ttl, dict(session))
+            self._entries.move_to_end(session_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def discard(self, session_id: str):
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(session_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def invalidate(self, redis_client, *session_ids: str):
+        """
+        Evict sessions locally and broadcast the evictions to every worker.
+
+        Args:
+            redis_client (redis.Redis): Redis client used to publish.
+            *session_ids (str): Session ids to evict.
+        """
+        if not session_ids:
+            return
+        pipe = redis_client.pipeline(transaction=False)
+        for session_id in session_ids:
+            self.discard(session_id)
+            pipe.publish(self.channel, session_id)
+        pipe.execute()
+
+    async def invalidate_async(self, redis_client, *session_ids: str):
+        """`invalidate` on a `redis.asyncio` client."""
+        if not session_ids:
+            return
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for session_id in session_ids:
+                self.discard(session_id)
+                pipe.publish(self.channel, session_id)
+            await pipe.execute()
+
+    def ensure_subscribed(self, redis_client):
+        """
+        Start the invalidation listener for this process if it is not running.
+
+        A listener inherited across `fork()` is not running in the child, so it is
+        restarted whenever the process id changes.
+
+        Args:
+            redis_client (redis.Redis): Redis client used to subscribe.
+        """
+        pid = os.getpid()
+        if self._subscriber is not None and self._subscriber_pid == pid and self._subscriber.is_alive():
+            return
+
+        # A lock of its own, so cache hits are not held up by the subscribe round trip.
+        with self._subscribe_lock:
+            if self._subscriber is not None and self._subscriber_pid == pid and self._subscriber.is_alive():
+                return
+            pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{self.channel: self._on_message})
+            self._subscriber = pubsub.run_in_thread(
+                sleep_time=1.0,
+                daemon=True,
+                exception_handler=self._on_subscriber_error,
+            )
+            self._subscriber_pid = pid
+        # Anything cached while no listener was running may have missed an eviction.
+        self.clear()
+
+    def _on_message(self, message: dict):
+        session_id = message.get("data")
+        if isinstance(session_id, bytes):
+            session_id = session_id.decode("utf-8")
+        if session_id:
+            self.discard(session_id)
+
+    def _on_subscriber_error(self, exc: BaseException, pubsub, thread):
+        # Without a listener evictions could be missed, so drop everything and let
+        # the next request resubscribe.
+        thread.stop()
+        pubsub.close()
+        self.clear()
+
+
+session_cache = SessionCache(
+    max_entries=Config.SESSION_CACHE_MAX_ENTRIES,
+    ttl_seconds=Config.SESSION_CACHE_TTL_SECONDS,
+    channel=Config.SESSION_INVALIDATION_CHANNEL,
+)
@@ -0,0 +1,224 @@
+import base64
+import hashlib
+import json
+from datetime import datetime
+from typing import Optional
+
+from app.extensions.redis import get_redis_client
+
+SESSION_KEY_PREFIX = "session:"
+USER_SESSIONS_KEY_PREFIX = "user_sessions:"
+USER_AGENT_MAX_LENGTH = 128
+
+# Sessions issued before sessions were indexed per user were stored as `user_session:<token>`.
+# They expire with their token, so this fallback can go once JWT_ACCESS_EXPIRES_MINUTES
+# have passed since the deploy that introduced `session:<id>`.
+LEGACY_SESSION_KEY_PREFIX = "user_session:"
+
+# KEYS[1] = user_sessions:<user_id>, KEYS[2] = session:<session_id>; ARGV[1] = session id.
+# Deletes the session only if it belongs to the user; returns the number of keys deleted.
+DELETE_OWN_SESSION_LUA = """
+if redis.call("SREM", KEYS[1], ARGV[1]) == 0 then
+    return 0
+end
+return redis.call("DEL", KEYS[2])
+"""
+
+
+def session_id_for_token(token: str):
+    """
+    Derive the compact session id for an access token.
+
+    The id is the first 128 bits of the token's SHA-256 digest, base64url-encoded
+    (22 characters), so Redis keys stay short regardless of JWT size.
+
+    Args:
+        token (str): The raw JWT access token.
+
+    Returns:
+        str: The session id.
+    """
+    digest = hashlib.sha256(token.encode("utf-8")).digest()[:16]
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode("ascii")
+
+
+class SessionsRepository:
+    """Redis-backed sessions indexed per user.
+
+    Each session is stored under `session:<session_id>` with the token's lifetime, and
+    `user_sessions:<user_id>` is a set of that user's session ids so per-user operations
+    never scan the keyspace.
+    """
+
+    def __init__(self):
+        self._delete_own_session = None
+        self._script_client = None
+
+    @property
+    def redis(self):
+        return get_redis_client()
+
+    @staticmethod
+    def _session_key(session_id: str):
+        return f"{SESSION_KEY_PREFIX}{session_id}"
+
+    @staticmethod
+    def _user_sessions_key(user_id: str):
+        return f"{USER_SESSIONS_KEY_PREFIX}{user_id}"
+
+    @staticmethod
+    def build_session(user: dict, user_agent: Optional[str] = None):
+        return {
+            "user_id": str(user["_id"]),
+            "role": user.get("role", "customer"),
+            "email": user["email"],
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "user_agent": (user_agent or "")[:USER_AGENT_MAX_LENGTH],
+        }
+
+    @staticmethod
+    def session_summary(session_id: str, session: dict):
+        """The fields of a session that `list_sessions` returns."""
+        return {"id": session_id, "created_at": session.get("created_at"), "user_agent": session.get("user_agent")}
+
+    def create_session(self, token: str, user: dict, ttl_seconds: int, user_agent: Optional[str] = None):
+        session_id = session_id_for_token(token)
+        user_id = str(user["_id"])
+        session_data = self.build_session(user, user_agent)
+
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.set(self._session_key(session_id), json.dumps(session_data, separators=(",", ":")), ex=ttl_seconds)
+        pipe.sadd(self._user_sessions_key(user_id), session_id)
+        # The index only has to outlive the newest session in it.
+        pipe.expire(self._user_sessions_key(user_id), ttl_seconds)
+        pipe.execute()
+        return session_id
+
+    def get_session(self, session_id: str):
+        value = self.redis.get(self._session_key(session_id))
+        if not value:
+            return None
+        if isinstance(value, bytes):
+            value = value.decode("utf-8")
+        return json.loads(value)
+
+    def get_session_for_token(self, token: str):
+        """
+        Look up the session of an access token, moving a legacy `user_session:<token>` entry
+        to the indexed layout on first use.
+
+        Args:
+            token (str): The raw JWT access token.
+
+        Returns:
+            Optional[dict[str, any]]: The session, or None if it does not exist.
+        """
+        session_id = session_id_for_token(token)
+        session = self.get_session(session_id)
+        if session is None:
+            session = self._migrate_legacy_session(token, session_id)
+        return session
+
+    def _migrate_legacy_session(self, token: str, session_id: str):
+        legacy_key = f"{LEGACY_SESSION_KEY_PREFIX}{token}"
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.get(legacy_key)
+        pipe.pttl(legacy_key)
+        value, ttl_ms = pipe.execute()
+        if not value or ttl_ms <= 0:
+            return None
+        if isinstance(value, bytes):
+            value = value.decode("utf-8")
+        legacy = json.loads(value)
+        session = {
+            "user_id": legacy["user_id"],
+            "role": legacy.get("role", "customer"),
+            "email": legacy.get("email"),
+            "created_at": None,
+            "user_agent": "",
+        }
+
+        index_key = self._user_sessions_key(session["user_id"])
+        # Extend the index to cover this session, but never shorten it for newer ones.
+        index_ttl_ms = max(ttl_ms, self.redis.pttl(index_key))
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.set(self._session_key(session_id), json.dumps(session, separators=(",", ":")), px=ttl_ms)
+        pipe.sadd(index_key, session_id)
+        pipe.pexpire(index_key, index_ttl_ms)
+        pipe.delete(legacy_key)
+        pipe.execute()
+        return session
+
+    def delete_session(self, user_id: str, session_id: str):
+        """
+        Delete one of a user's sessions.
+
+        Membership in the user's index and the deletion run as one script, so a session id
+        belonging to someone else is never deleted.
+
+        Args:
+            user_id (str): The user the session must belong to.
+            session_id (str): The session id.
+
+        Returns:
+            bool: True if the user's session existed and was deleted.
+        """
+        redis_client = self.redis
+        if self._script_client is not redis_client:
+            self._delete_own_session = redis_client.register_script(DELETE_OWN_SESSION_LUA)
+            self._script_client = redis_client
+        deleted = self._delete_own_session(
+            keys=[self._user_sessions_key(str(user_id)), self._session_key(session_id)],
+            args=[session_id],
+            client=redis_client,
+        )
+        return deleted > 0
+
+    def list_sessions(self, user_id: str):
+        """
+        List the live sessions of a user, pruning index entries whose session expired.
+
+        Args:
+            user_id (str): The user id.
+
+        Returns:
+            list[dict[str, any]]: Session metadata with an added `id` field.
+        """
+        index_key = self._user_sessions_key(str(user_id))
+        session_ids = sorted(self.redis.smembers(index_key))
+        if not session_ids:
+            return []
+
+        values = self.redis.mget([self._session_key(sid) for sid in session_ids])
+        sessions, expired = [], []
+        for session_id, value in zip(session_ids, values):
+            if not value:
+                expired.append(session_id)
+                continue
+            if isinstance(value, bytes):
+                value = value.decode("utf-8")
+            sessions.append(self.session_summary(session_id, json.loads(value)))
+
+        if expired:
+            self.redis.srem(index_key, *expired)
+        return sessions
+
+    def revoke_all_sessions(self, user_id: str):
+        """
+        Delete every session belonging to a user.
+
+        Args:
+            user_id (str): The user id.
+
+        Returns:
+            list[str]: The revoked session ids.
+        """
+        index_key = self._user_sessions_key(str(user_id))
+        session_ids = list(self.redis.smembers(index_key))
+
+        pipe = self.redis.pipeline(transaction=False)
+        for session_id in session_ids:
+            pipe.delete(self._session_key(session_id))
+        pipe.delete(index_key)
+        pipe.execute()
+        return session_ids
@@ -1,21 +1,22 @@
-from flask import jsonify
-
 from app.config import Config
 from app.extensions.mongo import serialize_document
 from app.auth import create_access_token
+from app.utils import json_response
 
 
 def generate_user_response(user):
-    """Generate a Flask JSON response for a user and set a JWT access token as a cookie.
+    """Generate a JSON response for a user and set a JWT access token as a cookie.
+
+    Works for both the Flask and the Quart app.
 
     Args:
         user (dict): User dictionary with "_id", "name", "email", and optional "role".
 
     Returns:
-        tuple: (response_body (flask Response with serialized user), access_token (str JWT token)).
+        tuple: (response_body (Response with serialized user), access_token (str JWT token)).
     """
     access_token = create_access_token(subject=str(user["_id"]), claims={"email": user["email"], "role": user.get("role", "customer")},)
-    response_body = jsonify({"user": serialize_document({"_id": user["_id"], "name": user["name"], "email": user["email"], "role": user.get("role", "customer")})})
+    response_body = json_response({"user": serialize_document({"_id": user["_id"], "name": user["name"], "email": user["email"], "role": user.get("role", "customer")})})
     response_body.set_cookie(
         key=Config.JWT_COOKIE_NAME,
         value=access_token,
@@ -14,10 +14,98 @@ class Config:
 
     MONGO_URI: str = os.getenv("MONGO_URI", "mongodb://localhost:27017")
     MONGO_DB: str = os.getenv("MONGO_DB", "ecommerce")
+    MONGO_MAX_POOL_SIZE: int = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+    MONGO_MIN_POOL_SIZE: int = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+    MONGO_MAX_IDLE_TIME_MS: int = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "0"))  # 0 = never reap idle connections
+    MONGO_CONNECT_TIMEOUT_MS: int = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "20000"))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "30000"))
+    MONGO_SOCKET_TIMEOUT_MS: int = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "0"))  # 0 = no timeout
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "0"))  # 0 = wait indefinitely
+    MONGO_ENSURE_INDEXES: bool = os.getenv("MONGO_ENSURE_INDEXES", "0") == "1"  # deploys run `flask db ensure-indexes` instead
+    MONGO_VERIFY_QUERY_PLANS: bool = os.getenv("MONGO_VERIFY_QUERY_PLANS", "0") == "1"
+
+    SLOW_QUERY_LOG_ENABLED: bool = os.getenv("SLOW_QUERY_LOG_ENABLED", "1") == "1"
+    SLOW_QUERY_THRESHOLD_MS: float = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "100"))
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = float(os.getenv("SLOW_QUERY_EXPLAIN_SAMPLE_RATE", "0.1"))  # share of slow commands explained
+    SLOW_QUERY_LOG_SIZE: int = int(os.getenv("SLOW_QUERY_LOG_SIZE", "200"))  # entries kept per worker
 
     REDIS_HOST: str = os.getenv("REDIS_HOST", "localhost")
     REDIS_PORT: str = os.getenv("REDIS_PORT", 6379)
 
+    SESSION_CACHE_MAX_ENTRIES: int = int(os.getenv("SESSION_CACHE_MAX_ENTRIES", "10000"))
+    SESSION_CACHE_TTL_SECONDS: int = int(os.getenv("SESSION_CACHE_TTL_SECONDS", "60"))
+    SESSION_INVALIDATION_CHANNEL: str = os.getenv("SESSION_INVALIDATION_CHANNEL", "session_invalidations")
+
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+    EXPORT_CHUNK_BYTES: int = int(os.getenv("EXPORT_CHUNK_BYTES", "65536"))
+    EXPORT_GZIP_LEVEL: int = int(os.getenv("EXPORT_GZIP_LEVEL", "6"))
+
+    CACHE_CONTROL_CATALOG: str = os.getenv("CACHE_CONTROL_CATALOG", "public, max-age=60, stale-while-revalidate=300")
+    CACHE_CONTROL_PRIVATE: str = os.getenv("CACHE_CONTROL_PRIVATE", "private, no-cache")
+
+    COMPRESSION_ENABLED: bool = os.getenv("COMPRESSION_ENABLED", "1") == "1"
+    COMPRESSION_ALGORITHMS: str = os.getenv("COMPRESSION_ALGORITHMS", "zstd,br,gzip")  # server preference order
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_LEVEL: int = int(os.getenv("COMPRESSION_BROTLI_LEVEL", "4"))
+    COMPRESSION_ZSTD_LEVEL: int = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
+    COMPRESSION_MIMETYPES: str = os.getenv(
+        "COMPRESSION_MIMETYPES",
+        "application/json,application/x-ndjson,text/csv,text/plain,text/html,application/javascript",
+    )
+
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "1") == "1"
+    RATE_LIMITS: str = os.getenv(
+        "RATE_LIMITS",
+        "auth.login=20/minute,100/hour,5/minute@email;auth.register=5/minute,20/day;products.bulk_import_products=30/hour@user",
+    )
+    RATE_LIMIT_DEFAULT: str = os.getenv("RATE_LIMIT_DEFAULT", "")  # e.g. "600/minute"; empty = unlimited
+    RATE_LIMIT_KEY_PREFIX: str = os.getenv("RATE_LIMIT_KEY_PREFIX", "ratelimit")
+    RATE_LIMIT_FALLBACK_SECONDS: float = float(os.getenv("RATE_LIMIT_FALLBACK_SECONDS", "5"))
+    RATE_LIMIT_LOCAL_MAX_ENTRIES: int = int(os.getenv("RATE_LIMIT_LOCAL_MAX_ENTRIES", "10000"))
+    PROXY_FIX_TRUSTED_HOPS: int = int(os.getenv("PROXY_FIX_TRUSTED_HOPS", "0"))  # proxies in front of the app; 0 = ignore X-Forwarded-*
+
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "1") == "1"
+    SERVER_TIMING_ENABLED: bool = os.getenv("SERVER_TIMING_ENABLED", "1") == "1"
+
+    WSGI_BIND: str = os.getenv("WSGI_BIND", "0.0.0.0:5000")
+    WSGI_WORKERS: int = int(os.getenv("WSGI_WORKERS", "0"))  # 0 = one per usable CPU
+    WSGI_THREADS: int = int(os.getenv("WSGI_THREADS", "0"))  # 0 = sized from WSGI_IO_RATIO
+    WSGI_MAX_THREADS: int = int(os.getenv("WSGI_MAX_THREADS", "64"))
+    WSGI_IO_RATIO: float = float(os.getenv("WSGI_IO_RATIO", "0.75"))  # share of request time spent waiting on I/O
+    WSGI_PRELOAD: bool = os.getenv("WSGI_PRELOAD", "1") == "1"
+    WSGI_TIMEOUT_SECONDS: int = int(os.getenv("WSGI_TIMEOUT_SECONDS", "60"))
+    WSGI_GRACEFUL_TIMEOUT_SECONDS: int = int(os.getenv("WSGI_GRACEFUL_TIMEOUT_SECONDS", "30"))
+    WSGI_KEEPALIVE_SECONDS: int = int(os.getenv("WSGI_KEEPALIVE_SECONDS", "5"))
+    WSGI_MAX_REQUESTS: int = int(os.getenv("WSGI_MAX_REQUESTS", "0"))  # recycle workers after N requests; 0 = never
+
+    ASGI_MAX_BODY_BYTES: int = int(os.getenv("ASGI_MAX_BODY_BYTES", str(64 * 1024 * 1024)))  # bodies forwarded to the sync app
+    ASGI_REDIS_MAX_CONNECTIONS: int = int(os.getenv("ASGI_REDIS_MAX_CONNECTIONS", "1000"))  # per worker; each long poll holds one
+    ASGI_REDIS_POOL_TIMEOUT_SECONDS: float = float(os.getenv("ASGI_REDIS_POOL_TIMEOUT_SECONDS", "2"))
+
+    MAX_JSON_BODY_BYTES: int = int(os.getenv("MAX_JSON_BODY_BYTES", str(1024 * 1024)))  # JSON bodies of validated write routes
+
+    DEFAULT_PAGE_SIZE: int = int(os.getenv("DEFAULT_PAGE_SIZE", "50"))
+    MAX_PAGE_SIZE: int = int(os.getenv("MAX_PAGE_SIZE", "100"))
+
+    PRODUCT_CACHE_TTL_SECONDS: int = int(os.getenv("PRODUCT_CACHE_TTL_SECONDS", "300"))
+    PRODUCT_CACHE_NOT_FOUND_TTL_SECONDS: int = int(os.getenv("PRODUCT_CACHE_NOT_FOUND_TTL_SECONDS", "30"))
+    PRODUCT_CACHE_L1_TTL_SECONDS: float = float(os.getenv("PRODUCT_CACHE_L1_TTL_SECONDS", "2"))
+    PRODUCT_CACHE_L1_MAX_ENTRIES: int = int(os.getenv("PRODUCT_CACHE_L1_MAX_ENTRIES", "1000"))
+    PRODUCT_CACHE_LOCK_TIMEOUT_MS: int = int(os.getenv("PRODUCT_CACHE_LOCK_TIMEOUT_MS", "2000"))
+
+    PRODUCT_SEARCH_LANGUAGE: str = os.getenv("PRODUCT_SEARCH_LANGUAGE", "english")
+
+    PRODUCT_BULK_BATCH_SIZE: int = int(os.getenv("PRODUCT_BULK_BATCH_SIZE", "1000"))
+    PRODUCT_BULK_MAX_BATCH_SIZE: int = int(os.getenv("PRODUCT_BULK_MAX_BATCH_SIZE", "10000"))
+    PRODUCT_BULK_MAX_ERRORS: int = int(os.getenv("PRODUCT_BULK_MAX_ERRORS", "1000"))
+
+    PASSWORD_HASH_METHOD: str = os.getenv("PASSWORD_HASH_METHOD", "scrypt")  # werkzeug method, e.g. "pbkdf2:sha256:1000000"
+    PASSWORD_SALT_LENGTH: int = int(os.getenv("PASSWORD_SALT_LENGTH", "16"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))  # 0 = hash inline
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
+    PASSWORD_HASH_TIMEOUT_SECONDS: float = float(os.getenv("PASSWORD_HASH_TIMEOUT_SECONDS", "10"))
+
     JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY", SECRET_KEY)
     JWT_ALGORITHM: str = os.getenv("JWT_ALGORITHM", "HS256")
     JWT_ACCESS_EXPIRES_MINUTES: int = int(os.getenv("JWT_ACCESS_EXPIRES_MINUTES", "43200"))
@@ -27,3 +115,14 @@ class Config:
     JWT_COOKIE_DOMAIN: str | None = os.getenv("JWT_COOKIE_DOMAIN", None)
 
     STRIPE_SECRET_KEY: str = os.getenv("STRIPE_SECRET_KEY", "change-me")
+
+    PAYMENT_PROVIDER: str = os.getenv("PAYMENT_PROVIDER", "stripe")  # "stripe" or "stub"
+    PAYMENT_STUB_DELAY_MS: int = int(os.getenv("PAYMENT_STUB_DELAY_MS", "0"))
+    CHECKOUT_QUEUE: str = os.getenv("CHECKOUT_QUEUE", "checkout:queue")
+    CHECKOUT_WORKERS: int = int(os.getenv("CHECKOUT_WORKERS", "4"))
+    CHECKOUT_MAX_ATTEMPTS: int = int(os.getenv("CHECKOUT_MAX_ATTEMPTS", "5"))
+    CHECKOUT_RETRY_BACKOFF_SECONDS: float = float(os.getenv("CHECKOUT_RETRY_BACKOFF_SECONDS", "0.5"))
+    CHECKOUT_RESULT_TTL_SECONDS: int = int(os.getenv("CHECKOUT_RESULT_TTL_SECONDS", "600"))
+    CHECKOUT_POLL_MAX_WAIT_SECONDS: int = int(os.getenv("CHECKOUT_POLL_MAX_WAIT_SECONDS", "20"))
+    CHECKOUT_WSGI_POLL_MAX_WAIT_SECONDS: int = int(os.getenv("CHECKOUT_WSGI_POLL_MAX_WAIT_SECONDS", "1"))  # each wait holds a WSGI thread
+    CHECKOUT_WORKER_HEARTBEAT_SECONDS: int = int(os.getenv("CHECKOUT_WORKER_HEARTBEAT_SECONDS", "5"))
@@ -0,0 +1 @@
+from .compressor import CODECS, compress, init_compression, negotiate_encoding
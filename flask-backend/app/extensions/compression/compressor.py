@@ -0,0 +1,168 @@
+import gzip
+import inspect
+from typing import Callable
+
+from flask import Flask, Request, Response, request
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+
+def _gzip(data: bytes, level: int):
+    # mtime=0 keeps the output deterministic for identical bodies.
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def _brotli(data: bytes, level: int):
+    return brotli.compress(data, quality=level, mode=brotli.MODE_TEXT)
+
+
+def _zstd(data: bytes, level: int):
+    return zstandard.ZstdCompressor(level=level).compress(data)
+
+
+# Content-Encoding token -> compress function, for every codec importable here.
+CODECS: dict[str, Callable[[bytes, int], bytes]] = {"gzip": _gzip}
+if brotli is not None:
+    CODECS["br"] = _brotli
+if zstandard is not None:
+    CODECS["zstd"] = _zstd
+
+
+def compress(encoding: str, data: bytes, level: int):
+    """
+    Compress `data` with the codec registered for a Content-Encoding token.
+
+    Args:
+        encoding (str): "gzip", "br" or "zstd".
+        data (bytes): The payload.
+        level (int): Codec-specific compression level.
+
+    Returns:
+        bytes: The compressed payload.
+    """
+    return CODECS[encoding](data, level)
+
+
+def negotiate_encoding(req: Request, preference: list[str]):
+    """
+    Pick the content coding to use for a request.
+
+    The client's `Accept-Encoding` q-values win; ties go to the earlier entry in
+    `preference`. Codecs that are not installed are never chosen.
+
+    Args:
+        req (Request): The current request.
+        preference (list[str]): Server preference order, e.g. `["zstd", "br", "gzip"]`.
+
+    Returns:
+        Optional[str]: The chosen Content-Encoding token, or None for identity.
+    """
+    best, best_quality = None, 0
+    for encoding in preference:
+        if encoding not in CODECS:
+            continue
+        quality = req.accept_encodings[encoding]
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class ResponseCompressor:
+    """`after_request` hook that compresses buffered responses negotiated by `Accept-Encoding`.
+
+    Responses are skipped when they are streamed, already encoded, of a content type
+    not listed as compressible (images, archives and other already-compressed types
+    never are), smaller than `min_size`, or marked `no-transform`.
+    """
+
+    def __init__(self, preference: list[str], levels: dict[str, int], min_size: int, mimetypes: set[str]):
+        self.preference = preference
+        self.levels = levels
+        self.min_size = min_size
+        self.mimetypes = mimetypes
+
+    def _compressible(self, response: Response):
+        if response.status_code < 200 or response.status_code in (204, 206, 304):
+            return False
+        if "Content-Encoding" in response.headers or response.mimetype not in self.mimetypes:
+            return False
+        return "no-transform" not in (response.headers.get("Cache-Control") or "")
+
+    def _eligible(self, response: Response):
+        if response.is_streamed or response.direct_passthrough or not self._compressible(response):
+            return False
+        return (response.calculate_content_length() or 0) >= self.min_size
+
+    def __call__(self, response: Response):
+        if not self._eligible(response):
+            return response
+        return self._encode(response, request, response.get_data())
+
+    async def compress_async(self, response, req):
+        """
+        The same hook for Quart responses, whose body is read asynchronously.
+
+        Error pages rendered by werkzeug exceptions are plain werkzeug responses even
+        under Quart, so a synchronous `get_data` is accepted as well.
+
+        Args:
+            response (quart.Response): A buffered response.
+            req (quart.Request): The current request.
+
+        Returns:
+            quart.Response: The response, compressed if eligible.
+        """
+        if not self._compressible(response):
+            return response
+        data = response.get_data()
+        if inspect.isawaitable(data):
+            data = await data
+        if len(data) < self.min_size:
+            return response
+        return self._encode(response, req, data)
+
+    def _encode(self, response, req, data: bytes):
+        # The representation now depends on Accept-Encoding, even for clients that get identity.
+        response.vary.add("Accept-Encoding")
+        encoding = negotiate_encoding(req, self.preference)
+        if encoding is None or req.method == "HEAD":
+            return response
+
+        response.set_data(compress(encoding, data, self.levels[encoding]))
+        response.headers["Content-Encoding"] = encoding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            # A strong validator must change with the bytes, and these are new bytes.
+            response.set_etag(etag, weak=True)
+        return response
+
+
+def init_compression(app: Flask):
+    """
+    Register response compression on a Flask application.
+
+    Args:
+        app (Flask): The Flask application instance.
+    """
+    if not app.config.get("COMPRESSION_ENABLED", True):
+        return
+    compressor = ResponseCompressor(
+        preference=[name.strip() for name in app.config["COMPRESSION_ALGORITHMS"].split(",") if name.strip()],
+        levels={
+            "gzip": app.config["COMPRESSION_GZIP_LEVEL"],
+            "br": app.config["COMPRESSION_BROTLI_LEVEL"],
+            "zstd": app.config["COMPRESSION_ZSTD_LEVEL"],
+        },
+        min_size=app.config["COMPRESSION_MIN_SIZE"],
+        mimetypes={mimetype.strip() for mimetype in app.config["COMPRESSION_MIMETYPES"].split(",") if mimetype.strip()},
+    )
+    app.compressor = compressor
+    app.after_request(compressor)
@@ -0,0 +1 @@
+from .stream import EXPORT_FORMATS, DocumentExport, export_response, parse_export_args, write_export
@@ -0,0 +1,186 @@
+import csv
+import io
+import sys
+import zlib
+from datetime import date, datetime
+from typing import Callable, Iterable, Optional
+
+from bson import ObjectId
+from flask import Response, stream_with_context
+
+from app.extensions.mongo import build_projection, parse_object_id
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+class DocumentExport:
+    """Encode a stream of MongoDB documents as NDJSON or CSV, optionally gzipped.
+
+    Iterating the export yields byte chunks of roughly `chunk_bytes` each, so it can be
+    fed straight into a streaming `Response` or written to a file. Documents are
+    consumed one at a time and never collected, so memory use does not depend on how
+    many are exported. `count` and `last_id` track progress; restart an interrupted
+    export with `_id` greater than `last_id` to resume it.
+    """
+
+    def __init__(
+        self,
+        documents: Iterable[dict],
+        export_format: str,
+        dumps: Callable[[any], bytes],
+        columns: Optional[list[str]] = None,
+        gzip_level: Optional[int] = None,
+        chunk_bytes: int = 64 * 1024,
+    ):
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {export_format}")
+        if export_format == "csv" and not columns:
+            raise ValueError("CSV exports need a column list")
+        self.documents = documents
+        self.export_format = export_format
+        self.dumps = dumps
+        self.columns = columns
+        self.gzip_level = gzip_level
+        self.chunk_bytes = chunk_bytes
+        self.count = 0
+        self.last_id: Optional[ObjectId] = None
+
+    @property
+    def mimetype(self):
+        return "application/gzip" if self.gzip_level is not None else EXPORT_FORMATS[self.export_format]
+
+    @property
+    def filename_suffix(self):
+        return f".{self.export_format}" + (".gz" if self.gzip_level is not None else "")
+
+    def __iter__(self):
+        chunks = self._encode_ndjson() if self.export_format == "ndjson" else self._encode_csv()
+        if self.gzip_level is not None:
+            chunks = self._gzip(chunks)
+        return chunks
+
+    def _track(self, document: dict):
+        self.count += 1
+        self.last_id = document["_id"]
+        document["id"] = document.pop("_id")
+        return document
+
+    def _encode_ndjson(self):
+        buffer, size = [], 0
+        for document in self.documents:
+            line = self.dumps(self._track(document)) + b"\n"
+            buffer.append(line)
+            size += len(line)
+            if size >= self.chunk_bytes:
+                yield b"".join(buffer)
+                buffer, size = [], 0
+        if buffer:
+            yield b"".join(buffer)
+
+    def _encode_csv(self):
+        text = io.StringIO()
+        writer = csv.writer(text)
+        writer.writerow(self.columns)
+        for document in self.documents:
+            document = self._track(document)
+            writer.writerow([self._csv_value(document.get(column)) for column in self.columns])
+            if text.tell() >= self.chunk_bytes:
+                yield text.getvalue().encode("utf-8")
+                text.seek(0)
+                text.truncate()
+        if text.tell():
+            yield text.getvalue().encode("utf-8")
+
+    def _csv_value(self, value: any):
+        if value is None:
+            return ""
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if isinstance(value, (dict, list)):
+            return self.dumps(value).decode("utf-8")
+        return str(value)
+
+    def _gzip(self, chunks: Iterable[bytes]):
+        # wbits=31 writes a gzip header and trailer around the deflate stream.
+        compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+
+
+def parse_export_args(args, allowed: frozenset[str], gzip_level: int):
+    """
+    Read `format`, `fields`, `after` and `gzip` from request query arguments.
+
+    Args:
+        args (MultiDict): Request query arguments.
+        allowed (frozenset[str]): Fields that may be exported.
+        gzip_level (int): Compression level used when `gzip=1`.
+
+    Returns:
+        tuple[str, Optional[dict], list[str], Optional[ObjectId], Optional[int]]: The
+        format, projection, CSV columns, resume checkpoint and gzip level.
+
+    Raises:
+        ValueError: With an error code as message if an argument is invalid.
+    """
+    export_format = args.get("format", "ndjson")
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError("invalid_format")
+
+    try:
+        projection = build_projection(args.get("fields"), allowed)
+    except ValueError:
+        raise ValueError("invalid_fields")
+    fields = [field for field in projection if field != "_id"] if projection else sorted(allowed)
+
+    after = None
+    if args.get("after"):
+        after = parse_object_id(args["after"])
+        if after is None:
+            raise ValueError("invalid_after")
+
+    gzip = args.get("gzip", "0") in ("1", "true")
+    return export_format, projection, ["id", *fields], after, gzip_level if gzip else None
+
+
+def export_response(export: DocumentExport, name: str):
+    """
+    Stream an export as a file download.
+
+    Args:
+        export (DocumentExport): The export to stream.
+        name (str): Base file name, without extension.
+
+    Returns:
+        Response: A streaming response bound to the current request context.
+    """
+    response = Response(stream_with_context(iter(export)), mimetype=export.mimetype)
+    response.headers["Content-Disposition"] = f'attachment; filename="{name}{export.filename_suffix}"'
+    return response
+
+
+def write_export(export: DocumentExport, output: str):
+    """
+    Write an export to a file, or to stdout when `output` is "-".
+
+    Args:
+        export (DocumentExport): The export to write.
+        output (str): Destination path.
+    """
+    stream = sys.stdout.buffer if output == "-" else open(output, "wb")
+    try:
+        for chunk in export:
+            stream.write(chunk)
+    finally:
+        if output == "-":
+            stream.flush()
+        else:
+            stream.close()
+        resume = f"; resume with --after {export.last_id}" if export.last_id else ""
+        print(f"Exported {export.count} documents{resume}.", file=sys.stderr)
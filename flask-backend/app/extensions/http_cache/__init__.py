@@ -0,0 +1,12 @@
+from .conditional import (
+    cache_control,
+    check_not_modified,
+    check_not_modified_async,
+    conditional_response,
+    conditional_response_async,
+    document_response,
+    document_response_async,
+    not_modified,
+    version_etag,
+    with_updated_at,
+)
@@ -0,0 +1,206 @@
+import hashlib
+from datetime import datetime
+from functools import wraps
+import inspect
+from typing import Awaitable, Callable, Optional
+
+from flask import Response, current_app, make_response, request
+
+from app.extensions.mongo import serialize_document
+
+
+def version_etag(document_id: any, updated_at: datetime, variant: bytes | str = b""):
+    """
+    Derive an ETag from a document's identity and modification time.
+
+    Args:
+        document_id (any): The document `_id`.
+        updated_at (datetime): The document's `updated_at`.
+        variant (bytes | str): Anything else that changes the representation, such as
+            the query string selecting fields.
+
+    Returns:
+        str: The opaque tag, without quotes or weakness prefix.
+    """
+    if isinstance(variant, str):
+        variant = variant.encode("utf-8")
+    key = f"{document_id}:{updated_at.isoformat()}:".encode("utf-8") + variant
+    return hashlib.blake2b(key, digest_size=12).hexdigest()
+
+
+def _set_validators(response: Response, etag: Optional[str], last_modified: Optional[datetime]):
+    if etag:
+        # Weak, because the same version is served with different content encodings.
+        response.set_etag(etag, weak=True)
+    if last_modified:
+        response.last_modified = last_modified
+    return response
+
+
+def _document_validators(document: dict[str, any], strip_updated_at: bool, variant: bytes):
+    updated_at = document.pop("updated_at") if strip_updated_at else document["updated_at"]
+    return version_etag(document["_id"], updated_at, variant), updated_at
+
+
+def not_modified(etag: Optional[str] = None, last_modified: Optional[datetime] = None):
+    """
+    Answer a conditional request without building the response body.
+
+    Call this with validators from a cheap lookup (e.g. a projection of `updated_at`)
+    before loading the full document.
+
+    Args:
+        etag (Optional[str]): Tag from `version_etag`.
+        last_modified (Optional[datetime]): The document's `updated_at`.
+
+    Returns:
+        Optional[Response]: A 304 response if the client's copy is current, otherwise None.
+    """
+    if not request.if_none_match and not request.if_modified_since:
+        return None
+    response = _set_validators(current_app.response_class(status=200), etag, last_modified)
+    response.make_conditional(request)
+    return response if response.status_code == 304 else None
+
+
+def check_not_modified(load_version: Callable[[], Optional[dict]]):
+    """
+    Answer a conditional request from a version lookup, before loading the document.
+
+    `load_version` runs only when the request carries `If-None-Match` or
+    `If-Modified-Since`, and should fetch just `_id` and `updated_at`.
+
+    Args:
+        load_version (Callable[[], Optional[dict]]): Projection-only lookup.
+
+    Returns:
+        Optional[Response]: A 304 response if the client's copy is current, otherwise None.
+    """
+    if not request.if_none_match and not request.if_modified_since:
+        return None
+    version = load_version()
+    if not version or "updated_at" not in version:
+        return None
+    return not_modified(version_etag(version["_id"], version["updated_at"], request.query_string), version["updated_at"])
+
+
+async def check_not_modified_async(load_version: Callable[[], Awaitable[Optional[dict]]]):
+    """`check_not_modified` for Quart handlers, with an awaitable version lookup."""
+    # Quart is imported only by the async helpers, so the WSGI app runs without it installed.
+    import quart
+
+    if not quart.request.if_none_match and not quart.request.if_modified_since:
+        return None
+    version = await load_version()
+    if not version or "updated_at" not in version:
+        return None
+    etag = version_etag(version["_id"], version["updated_at"], quart.request.query_string)
+    response = _set_validators(quart.current_app.response_class(b""), etag, version["updated_at"])
+    response = await response.make_conditional(quart.request)
+    return response if response.status_code == 304 else None
+
+
+def with_updated_at(projection: Optional[dict[str, any]]):
+    """
+    Make sure a projection returns `updated_at`, which `document_response` needs.
+
+    Args:
+        projection (Optional[dict[str, any]]): A projection built from `?fields=`.
+
+    Returns:
+        tuple[Optional[dict[str, any]], bool]: The projection, and whether `updated_at`
+        was added and should be stripped from the body.
+    """
+    if not projection or "updated_at" in projection or any(value == 0 for value in projection.values()):
+        return projection, False
+    return {**projection, "updated_at": 1}, True
+
+
+def document_response(document: dict[str, any], strip_updated_at: bool = False):
+    """
+    Serialize a single document with validators derived from its `_id` and `updated_at`.
+
+    Args:
+        document (dict[str, any]): The document; must include `_id` and `updated_at`.
+        strip_updated_at (bool): Drop `updated_at` from the body, for projections that
+            only fetched it to build the validators.
+
+    Returns:
+        Response: A 200 response, or 304 if the client's copy matches.
+    """
+    etag, updated_at = _document_validators(document, strip_updated_at, request.query_string)
+    return conditional_response(current_app.json.response(serialize_document(document)), etag, updated_at)
+
+
+async def document_response_async(document: dict[str, any], strip_updated_at: bool = False):
+    """`document_response` for Quart handlers."""
+    import quart
+
+    etag, updated_at = _document_validators(document, strip_updated_at, quart.request.query_string)
+    return await conditional_response_async(quart.current_app.json.response(serialize_document(document)), etag, updated_at)
+
+
+def conditional_response(
+    response: Response,
+    etag: Optional[str] = None,
+    last_modified: Optional[datetime] = None,
+):
+    """
+    Attach validators to a response and downgrade it to 304 if the client's copy matches.
+
+    Without an explicit `etag`, a strong tag is computed from the body, which suits
+    collection responses that have no single modification time.
+
+    Args:
+        response (Response): A buffered 200 response.
+        etag (Optional[str]): Tag from `version_etag`.
+        last_modified (Optional[datetime]): The resource's modification time.
+
+    Returns:
+        Response: The same response, possibly converted to 304.
+    """
+    if not etag:
+        response.add_etag()
+    return _set_validators(response, etag, last_modified).make_conditional(request)
+
+
+async def conditional_response_async(response, etag: Optional[str] = None, last_modified: Optional[datetime] = None):
+    """`conditional_response` for Quart handlers, taking a `quart.Response`."""
+    import quart
+
+    if not etag:
+        await response.add_etag()
+    return await _set_validators(response, etag, last_modified).make_conditional(quart.request)
+
+
+def cache_control(policy: str):
+    """
+    Set the `Cache-Control` header of successful and 304 responses of a view.
+
+    Works on sync Flask views and on Quart coroutine views alike.
+
+    Args:
+        policy (str): The header value, e.g. `Config.CACHE_CONTROL_CATALOG`.
+    """
+    def apply(response):
+        if response.status_code in (200, 304) and "Cache-Control" not in response.headers:
+            response.headers["Cache-Control"] = policy
+        return response
+
+    def decorator(f):
+        if inspect.iscoroutinefunction(f):
+            import quart
+
+            @wraps(f)
+            async def decorated_async(*args, **kwargs):
+                return apply(await quart.make_response(await f(*args, **kwargs)))
+
+            return decorated_async
+
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            return apply(make_response(f(*args, **kwargs)))
+
+        return decorated
+
+    return decorator
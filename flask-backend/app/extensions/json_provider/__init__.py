@@ -0,0 +1 @@
+from .provider import MongoJSONProvider, init_json_provider
@@ -0,0 +1,2 @@
+from .instrumentation import CommandTimingListener, InstrumentedAsyncRedis, InstrumentedRedis, init_async_metrics, init_metrics, metrics_response
+from .timing import PHASES, RequestTimings, current_timings, record, timed
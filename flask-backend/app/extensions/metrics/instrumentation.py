@@ -0,0 +1,224 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import redis
+import redis.asyncio
+from flask import Flask, Response, request
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess
+from pymongo import monitoring
+
+from app.extensions.mongo import command_collection
+
+from .timing import current_timings, end_request, record, start_request
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+COMMAND_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time to build a response, by route.",
+    ["method", "endpoint", "status"],
+    buckets=REQUEST_BUCKETS,
+)
+MONGO_COMMAND_DURATION = Histogram(
+    "mongodb_command_duration_seconds",
+    "MongoDB command round trips, by command and collection.",
+    ["command", "collection"],
+    buckets=COMMAND_BUCKETS,
+)
+MONGO_COMMAND_FAILURES = Counter(
+    "mongodb_command_failures",
+    "MongoDB commands that returned an error.",
+    ["command", "collection"],
+)
+REDIS_COMMAND_DURATION = Histogram(
+    "redis_command_duration_seconds",
+    "Redis command round trips; a pipeline counts as one `PIPELINE` command.",
+    ["command"],
+    buckets=COMMAND_BUCKETS,
+)
+REDIS_COMMAND_FAILURES = Counter(
+    "redis_command_failures",
+    "Redis commands that raised an error.",
+    ["command"],
+)
+
+
+class CommandTimingListener(monitoring.CommandListener):
+    """Time every MongoDB command into the command histogram and the current request's `db` phase.
+
+    The driver reports durations on completion but names the collection only when the
+    command starts, so the collection is remembered by request id in between.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._collections: dict[int, str] = {}
+
+    def started(self, event):
+        collection = command_collection(event.command_name, event.command)
+        with self._lock:
+            self._collections[event.request_id] = collection
+
+    def succeeded(self, event):
+        self._finish(event, failed=False)
+
+    def failed(self, event):
+        self._finish(event, failed=True)
+
+    def _finish(self, event, failed: bool):
+        with self._lock:
+            collection = self._collections.pop(event.request_id, "")
+        seconds = event.duration_micros / 1_000_000
+        MONGO_COMMAND_DURATION.labels(event.command_name, collection).observe(seconds)
+        if failed:
+            MONGO_COMMAND_FAILURES.labels(event.command_name, collection).inc()
+        record("db", seconds)
+
+
+class InstrumentedRedis(redis.Redis):
+    """`redis.Redis` that times each command and pipeline into the Redis histogram and the `cache` phase."""
+
+    def execute_command(self, *args, **options):
+        with _timed_redis(str(args[0]).upper()):
+            return super().execute_command(*args, **options)
+
+    def pipeline(self, transaction: bool = True, shard_hint=None):
+        pipe = super().pipeline(transaction, shard_hint)
+        execute = pipe.execute
+
+        def timed_execute(raise_on_error: bool = True):
+            with _timed_redis("PIPELINE"):
+                return execute(raise_on_error)
+
+        pipe.execute = timed_execute
+        return pipe
+
+
+class InstrumentedAsyncRedis(redis.asyncio.Redis):
+    """`InstrumentedRedis` for the `redis.asyncio` client of the ASGI app."""
+
+    async def execute_command(self, *args, **options):
+        with _timed_redis(str(args[0]).upper()):
+            return await super().execute_command(*args, **options)
+
+    def pipeline(self, transaction: bool = True, shard_hint=None):
+        pipe = super().pipeline(transaction, shard_hint)
+        execute = pipe.execute
+
+        async def timed_execute(raise_on_error: bool = True):
+            with _timed_redis("PIPELINE"):
+                return await execute(raise_on_error)
+
+        pipe.execute = timed_execute
+        return pipe
+
+
+@contextmanager
+def _timed_redis(command: str):
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        REDIS_COMMAND_FAILURES.labels(command).inc()
+        raise
+    finally:
+        seconds = time.perf_counter() - started
+        REDIS_COMMAND_DURATION.labels(command).observe(seconds)
+        record("cache", seconds)
+
+
+def metrics_response():
+    """
+    Render every metric in the Prometheus text format.
+
+    Under gunicorn each worker keeps its own counters. With `PROMETHEUS_MULTIPROC_DIR`
+    set, workers write them to files in that directory and this aggregates all
+    workers, so a scrape does not depend on which worker answers it.
+
+    Returns:
+        Response: The exposition, with Prometheus' content type.
+    """
+    registry = REGISTRY
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+
+
+def _observe_request(method: str, endpoint: str, response, server_timing: bool):
+    timings = current_timings()
+    if timings is None:
+        return response
+    REQUEST_DURATION.labels(method, endpoint or "unmatched", response.status_code).observe(time.perf_counter() - timings.started)
+    if server_timing:
+        response.headers["Server-Timing"] = timings.server_timing()
+    return response
+
+
+def init_metrics(app: Flask):
+    """
+    Register Prometheus metrics, MongoDB/Redis command timing and `Server-Timing` headers.
+
+    Must run after `init_mongo`, which owns the command listener list, and before
+    `init_redis`, which builds its client from `app.redis_client_class`.
+
+    Args:
+        app (Flask): The Flask application instance.
+    """
+    if not app.config.get("METRICS_ENABLED", True):
+        return
+
+    app.mongo_event_listeners.append(CommandTimingListener())
+    app.redis_client_class = InstrumentedRedis
+    server_timing = app.config.get("SERVER_TIMING_ENABLED", True)
+
+    @app.before_request
+    def start_request_timing():
+        start_request()
+
+    @app.after_request
+    def observe_request(response):
+        return _observe_request(request.method, request.endpoint, response, server_timing)
+
+    @app.teardown_request
+    def end_request_timing(exc):
+        end_request()
+
+    app.add_url_rule("/metrics", "metrics", metrics_response, methods=["GET"])
+
+
+def init_async_metrics(app):
+    """
+    `init_metrics` for the Quart app serving the async handlers under ASGI.
+
+    Requests it serves are observed into the same histogram, with the same
+    `Server-Timing` header, and its `redis.asyncio` client is timed like the sync one.
+    MongoDB commands are already timed by the listeners the async client shares with
+    the sync app. Must run before `init_async_redis`; `/metrics` stays on the sync app.
+
+    Args:
+        app (quart.Quart): The Quart application instance.
+    """
+    if not app.config.get("METRICS_ENABLED", True):
+        return
+
+    # Imported here, so the WSGI app runs without Quart installed.
+    import quart
+
+    app.redis_client_class = InstrumentedAsyncRedis
+    server_timing = app.config.get("SERVER_TIMING_ENABLED", True)
+
+    @app.before_request
+    async def start_request_timing():
+        start_request()
+
+    @app.after_request
+    async def observe_request(response):
+        return _observe_request(quart.request.method, quart.request.endpoint, response, server_timing)
+
+    @app.teardown_request
+    async def end_request_timing(exc):
+        end_request()
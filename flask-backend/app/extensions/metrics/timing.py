@@ -0,0 +1,82 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+# Server-Timing entries, in the order they are reported, with their descriptions.
+PHASES = {
+    "db": "MongoDB",
+    "cache": "Redis",
+    "validate": "Request validation",
+    "serialize": "JSON encoding",
+}
+
+
+class RequestTimings:
+    """Time spent in each phase of one request, in seconds, plus the number of calls."""
+
+    __slots__ = ("started", "durations", "calls")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.durations = dict.fromkeys(PHASES, 0.0)
+        self.calls = dict.fromkeys(PHASES, 0)
+
+    def add(self, phase: str, seconds: float):
+        self.durations[phase] += seconds
+        self.calls[phase] += 1
+
+    def server_timing(self):
+        """
+        Format the timings as a `Server-Timing` header value.
+
+        Phases that never ran are left out; `total` is the time since the request started.
+
+        Returns:
+            str: e.g. `db;dur=12.4;desc="MongoDB (3)", total;dur=15.1`.
+        """
+        entries = [
+            f'{phase};dur={self.durations[phase] * 1000:.1f};desc="{PHASES[phase]} ({self.calls[phase]})"'
+            for phase in PHASES
+            if self.calls[phase]
+        ]
+        entries.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.1f}")
+        return ", ".join(entries)
+
+
+# Context variables follow the request into the thread (WSGI) or task (ASGI) serving it,
+# which is also where pymongo and redis-py run their monitoring callbacks.
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def start_request():
+    """Start collecting timings for the request handled in the current context."""
+    timings = RequestTimings()
+    _current.set(timings)
+    return timings
+
+
+def current_timings():
+    """The timings of the current request, or None outside a request."""
+    return _current.get()
+
+
+def end_request():
+    _current.set(None)
+
+
+def record(phase: str, seconds: float):
+    """Add `seconds` to `phase` of the current request; a no-op outside a request."""
+    timings = _current.get()
+    if timings is not None:
+        timings.add(phase, seconds)
+
+
+@contextmanager
+def timed(phase: str):
+    """Time the enclosed block as `phase` of the current request."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(phase, time.perf_counter() - started)
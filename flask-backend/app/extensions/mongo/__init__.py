@@ -1,2 +1,5 @@
-from .client import init_mongo, get_mongo_db
-from .utils import parse_object_id, serialize_id, serialize_document, _serialize_recursive
\ No newline at end of file
+from .client import init_mongo, insert_across_collections, get_mongo_client, get_mongo_db, get_mongo_pool_stats
+from .utils import build_projection, parse_object_id, serialize_id, serialize_document, _serialize_recursive
+from .indexes import db_cli, ensure_indexes
+from .plans import CollectionScanError, command_collection, explainable_command
+from .pagination import KEYSET_SORT, InvalidCursor, encode_cursor, decode_cursor, iter_by_id, keyset_page, keyset_page_async, parse_page_params
\ No newline at end of file
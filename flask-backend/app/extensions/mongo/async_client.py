@@ -0,0 +1,92 @@
+from typing import Optional
+
+from bson import ObjectId
+from pymongo import AsyncMongoClient, InsertOne
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import InvalidOperation
+from quart import Quart, current_app
+
+from .client import PoolStatsListener, _client_bulk_write_support, client_options
+
+
+def init_async_mongo(app: Quart, event_listeners: Optional[list] = None):
+    """
+    Initialize async MongoDB support for the ASGI application.
+
+    The `AsyncMongoClient` is created on first use, inside the worker's event loop,
+    and closed when the application stops serving.
+
+    Args:
+        app (Quart): The Quart application instance.
+        event_listeners (Optional[list]): Extra command listeners, normally those of
+            the sync application so both clients are monitored alike.
+    """
+    app.async_mongo_client = None
+    app.async_mongo_pool_stats = None
+    app.mongo_event_listeners = list(event_listeners or [])
+
+    @app.after_serving
+    async def close_async_mongo():
+        if app.async_mongo_client is not None:
+            await app.async_mongo_client.close()
+            app.async_mongo_client = None
+
+
+def get_async_mongo_client(app: Optional[Quart] = None):
+    """
+    Get the AsyncMongoClient of this worker, creating it on first use.
+
+    Args:
+        app (Optional[Quart]): Quart application instance. If not provided, uses `current_app`.
+
+    Returns:
+        AsyncMongoClient: The pooled async MongoDB client.
+    """
+    quart_app = app or current_app
+    # The event loop is single-threaded, so no lock is needed around creation.
+    if quart_app.async_mongo_client is None:
+        listener = PoolStatsListener()
+        quart_app.async_mongo_client = AsyncMongoClient(quart_app.config["MONGO_URI"], **client_options(quart_app, listener))
+        quart_app.async_mongo_pool_stats = listener
+    return quart_app.async_mongo_client
+
+
+def get_async_mongo_db(app: Optional[Quart] = None) -> AsyncDatabase:
+    """
+    Get the async MongoDB database instance.
+
+    Args:
+        app (Optional[Quart]): Quart application instance. If not provided, uses `current_app`.
+
+    Returns:
+        AsyncDatabase: The MongoDB database instance.
+    """
+    quart_app = app or current_app
+    return get_async_mongo_client(quart_app)[quart_app.config["MONGO_DB"]]
+
+
+async def insert_across_collections_async(db: AsyncDatabase, inserts: list[tuple[str, dict[str, any]]]):
+    """
+    `insert_across_collections` on the async client.
+
+    Args:
+        db (AsyncDatabase): The target database.
+        inserts (list[tuple[str, dict[str, any]]]): `(collection name, document)` pairs.
+    """
+    for _, document in inserts:
+        document.setdefault("_id", ObjectId())
+
+    client = db.client
+    supported = _client_bulk_write_support.get(client) if isinstance(client, AsyncMongoClient) else False
+    if supported is None or supported:
+        try:
+            await client.bulk_write([InsertOne(document, namespace=f"{db.name}.{name}") for name, document in inserts], ordered=True)
+            _client_bulk_write_support[client] = True
+            return
+        except InvalidOperation as e:
+            if "requires MongoDB server version" not in str(e):
+                raise
+            _client_bulk_write_support[client] = False
+
+    for name, document in inserts:
+        await db[name].insert_one(document)
@@ -1,28 +1,175 @@
+import os
+import threading
+import weakref
 from typing import Optional
 
-from flask import Flask, current_app, g
-from pymongo import MongoClient
+from bson import ObjectId
+from flask import Flask, current_app
+from pymongo import InsertOne, MongoClient, monitoring
+from pymongo.database import Database
+from pymongo.errors import InvalidOperation
+
+_client_lock = threading.Lock()
+
+# Whether each client's server accepted a client-level `bulk_write`; absent until first tried.
+# Shared by `MongoClient` and `AsyncMongoClient`.
+_client_bulk_write_support: "weakref.WeakKeyDictionary[MongoClient, bool]" = weakref.WeakKeyDictionary()
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Track connection pool activity for the process-wide MongoClient."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stats = {
+            "connections_open": 0,
+            "connections_created": 0,
+            "connections_closed": 0,
+            "checked_out": 0,
+            "checkouts": 0,
+            "checkout_failures": 0,
+            "pools_cleared": 0,
+        }
+
+    def _incr(self, key: str, amount: int = 1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.stats)
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._incr("pools_cleared")
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._incr("connections_created")
+        self._incr("connections_open")
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._incr("connections_closed")
+        self._incr("connections_open", -1)
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        self._incr("checkout_failures")
+
+    def connection_checked_out(self, event):
+        self._incr("checkouts")
+        self._incr("checked_out")
+
+    def connection_checked_in(self, event):
+        self._incr("checked_out", -1)
+
 
 def init_mongo(app: Flask):
     """
     Initialize MongoDB support for a Flask application.
 
-    Registers a teardown function to close the MongoClient when the app context ends.
+    The MongoClient itself is created lazily on first use so that each worker process
+    builds its own pool after the server has forked.
 
     Args:
         app (Flask): The Flask application instance.
     """
+    app.mongo_client = None
+    app.mongo_client_pid = None
+    app.mongo_pool_stats = None
+    app.mongo_event_listeners = []
+    app.slow_query_recorder = None
+
+    if app.config.get("MONGO_VERIFY_QUERY_PLANS"):
+        from .plans import init_plan_verification
+
+        init_plan_verification(app)
+
+    if app.config.get("SLOW_QUERY_LOG_ENABLED"):
+        from .slow_queries import init_slow_query_log
+
+        init_slow_query_log(app)
+
+
+def _build_client(app: Flask):
+    """
+    Build a pooled MongoClient from the application configuration.
+
+    Args:
+        app (Flask): The Flask application instance.
+
+    Returns:
+        tuple[MongoClient, PoolStatsListener]: The client and its pool listener.
+    """
+    listener = PoolStatsListener()
+    client = MongoClient(app.config["MONGO_URI"], **client_options(app, listener))
+    return client, listener
+
+
+def client_options(app: Flask, pool_listener: PoolStatsListener):
+    """
+    Pool and timeout options shared by the sync and async MongoDB clients.
+
+    Args:
+        app (Flask): The application whose configuration to read.
+        pool_listener (PoolStatsListener): Listener collecting pool counters.
+
+    Returns:
+        dict[str, any]: Keyword arguments for `MongoClient` / `AsyncMongoClient`.
+    """
+    return {
+        "maxPoolSize": app.config.get("MONGO_MAX_POOL_SIZE", 100),
+        "minPoolSize": app.config.get("MONGO_MIN_POOL_SIZE", 0),
+        "maxIdleTimeMS": app.config.get("MONGO_MAX_IDLE_TIME_MS") or None,
+        "connectTimeoutMS": app.config.get("MONGO_CONNECT_TIMEOUT_MS", 20000),
+        "serverSelectionTimeoutMS": app.config.get("MONGO_SERVER_SELECTION_TIMEOUT_MS", 30000),
+        "socketTimeoutMS": app.config.get("MONGO_SOCKET_TIMEOUT_MS") or None,
+        "waitQueueTimeoutMS": app.config.get("MONGO_WAIT_QUEUE_TIMEOUT_MS") or None,
+        "event_listeners": [pool_listener, *app.mongo_event_listeners],
+        "connect": False,
+    }
+
+
+def get_mongo_client(app: Optional[Flask] = None):
+    """
+    Get the process-wide MongoClient, creating it on first use in this process.
+
+    A client inherited from a parent process across `fork()` is discarded and rebuilt,
+    since MongoClient instances are not fork-safe.
+
+    Args:
+        app (Optional[Flask]): Flask application instance. If not provided, uses `current_app`.
+
+    Returns:
+        MongoClient: The pooled MongoDB client.
+    """
+    flask_app = app or current_app
+    pid = os.getpid()
 
-    @app.teardown_appcontext
-    def close_connection(_: Optional[BaseException] = None):
-        client: Optional[MongoClient] = g.pop("mongo_client", None)
-        if client is not None:
-            client.close()
+    if flask_app.mongo_client is None or flask_app.mongo_client_pid != pid:
+        with _client_lock:
+            if flask_app.mongo_client is None or flask_app.mongo_client_pid != pid:
+                flask_app.mongo_client, flask_app.mongo_pool_stats = _build_client(flask_app)
+                flask_app.mongo_client_pid = pid
+
+    return flask_app.mongo_client
 
 
 def get_mongo_db(app: Optional[Flask] = None):
     """
-    Get the MongoDB database instance for the current request context.
+    Get the MongoDB database instance backed by the process-wide client.
 
     Args:
         app (Optional[Flask]): Flask application instance. If not provided, uses `current_app`.
@@ -31,11 +178,57 @@ def get_mongo_db(app: Optional[Flask] = None):
         Database: The MongoDB database instance.
     """
     flask_app = app or current_app
+    return get_mongo_client(flask_app)[flask_app.config["MONGO_DB"]]
+
 
-    if g.get("mongo_client") is None:
-        g.mongo_client = MongoClient(flask_app.config["MONGO_URI"])
+def get_mongo_pool_stats(app: Optional[Flask] = None):
+    """
+    Get connection pool statistics for the current process.
+
+    Args:
+        app (Optional[Flask]): Flask application instance. If not provided, uses `current_app`.
+
+    Returns:
+        dict[str, any]: Pool counters and configured limits.
+    """
+    flask_app = app or current_app
+    listener: Optional[PoolStatsListener] = flask_app.mongo_pool_stats
+    stats = listener.snapshot() if listener else {}
+    stats.update({
+        "pid": flask_app.mongo_client_pid,
+        "max_pool_size": flask_app.config.get("MONGO_MAX_POOL_SIZE", 100),
+        "min_pool_size": flask_app.config.get("MONGO_MIN_POOL_SIZE", 0),
+    })
+    return stats
+
+
+def insert_across_collections(db: Database, inserts: list[tuple[str, dict[str, any]]]):
+    """
+    Insert documents into several collections, in one round trip where the server allows.
+
+    Uses `MongoClient.bulk_write` (MongoDB 8.0+) and falls back to one `insert_one` per
+    document on older servers, or for clients that are not a pymongo `MongoClient`. Each
+    document is given an `_id` up front, so callers can return it without re-reading.
+
+    Args:
+        db (Database): The target database.
+        inserts (list[tuple[str, dict[str, any]]]): `(collection name, document)` pairs.
+    """
+    for _, document in inserts:
+        document.setdefault("_id", ObjectId())
 
-    if g.get("mongo_db") is None:
-        g.mongo_db = g.mongo_client[flask_app.config["MONGO_DB"]]
+    client = db.client
+    supported = _client_bulk_write_support.get(client) if isinstance(client, MongoClient) else False
+    if supported is None or supported:
+        try:
+            client.bulk_write([InsertOne(document, namespace=f"{db.name}.{name}") for name, document in inserts], ordered=True)
+            _client_bulk_write_support[client] = True
+            return
+        except InvalidOperation as e:
+            # Raised by the driver before anything is sent when the server predates 8.0.
+            if "requires MongoDB server version" not in str(e):
+                raise
+            _client_bulk_write_support[client] = False
 
-    return g.mongo_db
\ No newline at end of file
+    for name, document in inserts:
+        db[name].insert_one(document)
@@ -0,0 +1,157 @@
+import click
+from flask.cli import AppGroup
+from pymongo import IndexModel
+from pymongo.database import Database
+from pymongo.errors import OperationFailure
+
+db_cli = AppGroup("db", help="MongoDB maintenance commands.")
+
+# Index options that change an index's behaviour and therefore require a rebuild when they differ.
+_COMPARED_OPTIONS = ("unique", "sparse", "expireAfterSeconds", "partialFilterExpression")
+
+# Text index options, with the server defaults used when an index does not set them.
+_TEXT_OPTION_DEFAULTS = {"default_language": "english", "language_override": "language"}
+
+# Options carried over when an index has to be recreated from `index_information()`.
+_RESTORED_OPTIONS = _COMPARED_OPTIONS + ("weights", "default_language", "language_override", "collation")
+
+
+def collect_index_models(repositories: list[type]):
+    """
+    Merge the `INDEXES` declarations of repository classes.
+
+    Args:
+        repositories (list[type]): Repository classes with an `INDEXES` mapping of
+            collection name to a list of `IndexModel`.
+
+    Returns:
+        dict[str, list[IndexModel]]: Index models per collection.
+    """
+    models: dict[str, list[IndexModel]] = {}
+    for repository in repositories:
+        for collection, indexes in getattr(repository, "INDEXES", {}).items():
+            models.setdefault(collection, []).extend(indexes)
+    return models
+
+
+def _is_text_index(spec: dict[str, any]):
+    return any(direction == "text" for direction in spec["key"].values())
+
+
+def _matches(declared: dict[str, any], existing: dict[str, any]):
+    if _is_text_index(declared):
+        # Text indexes are stored under internal `_fts` keys; compare weights instead,
+        # along with the language options that decide how terms are stemmed.
+        if declared.get("weights") != existing.get("weights"):
+            return False
+        return all(
+            declared.get(option, default) == existing.get(option, default)
+            for option, default in _TEXT_OPTION_DEFAULTS.items()
+        )
+    if list(declared["key"].items()) != [(field, direction) for field, direction in existing["key"]]:
+        return False
+    return all(declared.get(option) == existing.get(option) for option in _COMPARED_OPTIONS)
+
+
+def _existing_model(name: str, info: dict[str, any]):
+    """Rebuild an `IndexModel` from an `index_information()` entry, to restore a dropped index."""
+    keys = []
+    for field, direction in info["key"]:
+        if field == "_fts":
+            keys.extend((text_field, "text") for text_field in info.get("weights", {}))
+        elif field != "_ftsx":
+            keys.append((field, direction))
+    options = {option: info[option] for option in _RESTORED_OPTIONS if option in info}
+    return IndexModel(keys, name=name, **options)
+
+
+def _rebuild_index(collection, model: IndexModel, previous: dict[str, any]):
+    """
+    Replace an index whose definition changed, restoring the old one if the new one fails.
+
+    MongoDB refuses a second index on the same keys, so the old index has to be dropped
+    first. If the replacement cannot be built (e.g. duplicates under a new unique
+    constraint), the previous definition is recreated before the error is raised.
+    """
+    name = model.document["name"]
+    collection.drop_index(name)
+    try:
+        collection.create_indexes([model])
+    except OperationFailure:
+        collection.create_indexes([_existing_model(name, previous)])
+        raise
+
+
+def ensure_indexes(db: Database, repositories: list[type], drop_unmanaged: bool = False, rebuild: bool = False):
+    """
+    Reconcile declared indexes with the database, idempotently.
+
+    Missing indexes are created and matching indexes are left alone. Indexes whose
+    definition changed are only reported as mismatched, unless `rebuild` is set; a
+    rebuild that fails restores the previous index. Indexes not declared by any
+    repository are only dropped when `drop_unmanaged` is set.
+
+    Args:
+        db (Database): The MongoDB database.
+        repositories (list[type]): Repository classes declaring `INDEXES`.
+        drop_unmanaged (bool): Drop indexes that no repository declares.
+        rebuild (bool): Drop and recreate indexes whose definition changed.
+
+    Returns:
+        dict[str, dict[str, list[str]]]: Index names created, rebuilt, mismatched,
+            unchanged and dropped per collection.
+
+    Raises:
+        OperationFailure: If an index cannot be built.
+    """
+    report = {}
+    for collection_name, models in collect_index_models(repositories).items():
+        collection = db[collection_name]
+        existing = collection.index_information()
+        result = {"created": [], "rebuilt": [], "mismatched": [], "unchanged": [], "dropped": []}
+
+        to_create, to_rebuild = [], []
+        for model in models:
+            declared = model.document
+            name = declared["name"]
+            if name not in existing:
+                to_create.append(model)
+                result["created"].append(name)
+            elif _matches(declared, existing[name]):
+                result["unchanged"].append(name)
+            elif rebuild:
+                to_rebuild.append(model)
+            else:
+                result["mismatched"].append(name)
+
+        if to_create:
+            collection.create_indexes(to_create)
+        for model in to_rebuild:
+            _rebuild_index(collection, model, existing[model.document["name"]])
+            result["rebuilt"].append(model.document["name"])
+
+        if drop_unmanaged:
+            declared_names = {model.document["name"] for model in models}
+            for name in existing:
+                if name != "_id_" and name not in declared_names:
+                    collection.drop_index(name)
+                    result["dropped"].append(name)
+
+        report[collection_name] = result
+    return report
+
+
+@db_cli.command("ensure-indexes")
+@click.option("--drop-unmanaged", is_flag=True, help="Drop indexes that no repository declares.")
+@click.option("--rebuild", is_flag=True, help="Drop and recreate indexes whose definition changed.")
+def ensure_indexes_command(drop_unmanaged: bool, rebuild: bool):
+    """Create the indexes declared by every repository, and rebuild changed ones with --rebuild."""
+    from app import INDEXED_REPOSITORIES
+    from app.extensions.mongo import get_mongo_db
+
+    report = ensure_indexes(get_mongo_db(), INDEXED_REPOSITORIES, drop_unmanaged=drop_unmanaged, rebuild=rebuild)
+    for collection_name, result in report.items():
+        changes = ", ".join(f"{action}: {', '.join(names)}" for action, names in result.items() if names)
+        click.echo(f"{collection_name}: {changes or 'no indexes declared'}")
+    if any(result["mismatched"] for result in report.values()):
+        click.echo("Mismatched indexes were left as they are; rerun with --rebuild to replace them.")
@@ -0,0 +1,208 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import Optional
+
+from bson import ObjectId, json_util
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.collection import Collection
+
+from app.config import Config
+
+KEYSET_SORT = [("created_at", -1), ("_id", -1)]
+
+# Types a decoded cursor value may have, by sort field. Other sort fields accept any
+# scalar. Containers are never accepted: a value such as `{"$ne": null}` would be
+# spliced into the seek filter as a query operator. None is allowed because
+# `encode_cursor` writes it for a document missing the field.
+CURSOR_FIELD_TYPES: dict[str, tuple[type, ...]] = {
+    "_id": (ObjectId,),
+    "created_at": (datetime,),
+    "updated_at": (datetime,),
+}
+CURSOR_SCALAR_TYPES = (int, float, str)
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(document: dict[str, any], sort: list[tuple[str, int]] = KEYSET_SORT):
+    """
+    Encode the sort key of the last document on a page as an opaque cursor.
+
+    Args:
+        document (dict[str, any]): The last document of the current page.
+        sort (list[tuple[str, int]]): The sort the page was read with.
+
+    Returns:
+        str: URL-safe cursor token.
+    """
+    raw = json_util.dumps([document.get(field) for field, _ in sort], json_options=json_util.RELAXED_JSON_OPTIONS)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str, sort: list[tuple[str, int]] = KEYSET_SORT):
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    Args:
+        cursor (str): The cursor token.
+        sort (list[tuple[str, int]]): The sort the cursor was created for.
+
+    Returns:
+        list[any]: The seek position, one value per sort field.
+
+    Raises:
+        InvalidCursor: If the token is malformed, was created for another sort, or holds
+            a value of the wrong type for its sort field.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json_util.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError, TypeError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+    if not isinstance(values, list) or len(values) != len(sort):
+        raise InvalidCursor("Invalid cursor")
+    for (field, _), value in zip(sort, values):
+        if value is not None and not isinstance(value, CURSOR_FIELD_TYPES.get(field, CURSOR_SCALAR_TYPES)):
+            raise InvalidCursor("Invalid cursor")
+    return values
+
+
+def seek_filter(sort: list[tuple[str, int]], values: list[any]):
+    """
+    Build the filter matching documents that sort strictly after `values`.
+
+    For a sort on `(a, b, c)` this is `a past A, or a = A and b past B, or a = A and
+    b = B and c past C`, where "past" is `$lt` for descending keys and `$gt` for
+    ascending ones.
+
+    Args:
+        sort (list[tuple[str, int]]): The sort fields and directions.
+        values (list[any]): The sort key of the last document already returned.
+
+    Returns:
+        dict[str, any]: A MongoDB filter.
+    """
+    branches = []
+    for i, (field, direction) in enumerate(sort):
+        branch = {prefix_field: value for (prefix_field, _), value in zip(sort[:i], values[:i])}
+        branch[field] = {"$lt" if direction < 0 else "$gt": values[i]}
+        branches.append(branch)
+    return {"$or": branches}
+
+
+def parse_page_params(args):
+    """
+    Read `limit` and `cursor` from request query arguments.
+
+    The limit is clamped to `Config.MAX_PAGE_SIZE`.
+
+    Args:
+        args (MultiDict): Request query arguments.
+
+    Returns:
+        tuple[int, Optional[str]]: The page size and cursor token.
+
+    Raises:
+        ValueError: If `limit` is not a positive integer.
+    """
+    limit = int(args.get("limit", Config.DEFAULT_PAGE_SIZE))
+    if limit < 1:
+        raise ValueError("limit must be positive")
+    return min(limit, Config.MAX_PAGE_SIZE), args.get("cursor") or None
+
+
+def keyset_page(
+    collection: Collection,
+    query: dict[str, any],
+    limit: int,
+    cursor: Optional[str] = None,
+    projection: Optional[dict[str, any]] = None,
+    sort: list[tuple[str, int]] = KEYSET_SORT,
+):
+    """
+    Fetch one page of documents in `sort` order, seeking past `cursor`.
+
+    Uses a range predicate on the sort key instead of `skip()`, so every page costs
+    the same index seek regardless of depth. The last sort field must be unique
+    (normally `_id`) so that ties are broken deterministically.
+
+    Args:
+        collection (Collection): The collection to query.
+        query (dict[str, any]): Base filter.
+        limit (int): Page size.
+        cursor (Optional[str]): Cursor returned with the previous page.
+        projection (Optional[dict[str, any]]): Fields to return; the sort fields are
+            always included since the next cursor is built from them.
+        sort (list[tuple[str, int]]): Sort fields and directions. Defaults to newest first.
+
+    Returns:
+        tuple[list[dict[str, any]], Optional[str]]: The page and the cursor for the next one.
+
+    Raises:
+        InvalidCursor: If `cursor` is malformed.
+    """
+    query, projection = _keyset_query(query, cursor, projection, sort)
+    documents = list(collection.find(query, projection).sort(sort).limit(limit + 1))
+    return _keyset_result(documents, limit, sort)
+
+
+async def keyset_page_async(
+    collection: AsyncCollection,
+    query: dict[str, any],
+    limit: int,
+    cursor: Optional[str] = None,
+    projection: Optional[dict[str, any]] = None,
+    sort: list[tuple[str, int]] = KEYSET_SORT,
+):
+    """`keyset_page` for an `AsyncCollection`; same arguments and result."""
+    query, projection = _keyset_query(query, cursor, projection, sort)
+    documents = await collection.find(query, projection).sort(sort).limit(limit + 1).to_list()
+    return _keyset_result(documents, limit, sort)
+
+
+def _keyset_query(query: dict[str, any], cursor: Optional[str], projection: Optional[dict[str, any]], sort: list[tuple[str, int]]):
+    if projection and all(value != 0 for field, value in projection.items() if field != "_id"):
+        projection = {**projection, **{field: 1 for field, _ in sort if field != "_id"}}
+
+    if cursor:
+        query = {"$and": [query, seek_filter(sort, decode_cursor(cursor, sort))]}
+    return query, projection
+
+
+def _keyset_result(documents: list[dict[str, any]], limit: int, sort: list[tuple[str, int]]):
+    if len(documents) > limit:
+        documents = documents[:limit]
+        return documents, encode_cursor(documents[-1], sort)
+    return documents, None
+
+
+def iter_by_id(
+    collection: Collection,
+    query: dict[str, any],
+    projection: Optional[dict[str, any]] = None,
+    after: Optional[ObjectId] = None,
+    batch_size: int = 1000,
+):
+    """
+    Iterate over every matching document in `_id` order without loading them all.
+
+    The driver fetches `batch_size` documents per round trip and discards each batch
+    once it has been consumed. Because the order is by `_id`, passing the last id seen
+    as `after` resumes an interrupted scan where it stopped.
+
+    Args:
+        collection (Collection): The collection to scan.
+        query (dict[str, any]): Base filter.
+        projection (Optional[dict[str, any]]): Fields to return.
+        after (Optional[ObjectId]): Only return documents with a greater `_id`.
+        batch_size (int): Documents per server round trip.
+
+    Returns:
+        Cursor: A lazily evaluated cursor.
+    """
+    if after is not None:
+        query = {"$and": [query, {"_id": {"$gt": after}}]} if query else {"_id": {"$gt": after}}
+    return collection.find(query, projection, sort=[("_id", 1)], batch_size=batch_size)
@@ -0,0 +1,122 @@
+import threading
+
+from flask import Flask
+from pymongo import monitoring
+
+# Commands whose execution plan can be explained.
+EXPLAINABLE_COMMANDS = {"find", "aggregate", "count", "distinct", "update", "delete", "findAndModify"}
+
+# Command fields added by the driver that are not accepted inside `explain`.
+_DRIVER_FIELDS = {"lsid", "txnNumber", "$db", "$clusterTime", "$readPreference", "readConcern", "writeConcern", "cursor"}
+
+
+def command_collection(command_name: str, command: dict):
+    """The collection a MongoDB command targets, or "" for database-level commands."""
+    if command_name == "getMore":
+        return command.get("collection", "")
+    if command_name == "bulkWrite":  # client-level bulk write across namespaces
+        return "*"
+    target = command.get(command_name)
+    return target if isinstance(target, str) else ""
+
+
+def explainable_command(command_name: str, command: dict):
+    """
+    Strip a monitored command down to what `explain` accepts.
+
+    Args:
+        command_name (str): The command name from the monitoring event.
+        command (dict): The command document as sent by the driver.
+
+    Returns:
+        Optional[dict]: The command to wrap in `explain`, or None if it cannot be explained.
+    """
+    if command_name not in EXPLAINABLE_COMMANDS:
+        return None
+    explainable = {key: value for key, value in command.items() if key not in _DRIVER_FIELDS}
+    if command_name == "aggregate":
+        explainable["cursor"] = {}
+    return explainable
+
+
+class CollectionScanError(AssertionError):
+    """Raised in plan verification mode when a query is executed with a COLLSCAN."""
+
+
+class QueryPlanRecorder(monitoring.CommandListener):
+    """Record explainable commands issued by the current thread."""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    @property
+    def commands(self) -> list[tuple[str, dict]]:
+        if not hasattr(self._local, "commands"):
+            self._local.commands = []
+        return self._local.commands
+
+    def reset(self):
+        self._local.commands = []
+
+    def started(self, event):
+        command = explainable_command(event.command_name, event.command)
+        if command is not None:
+            self.commands.append((event.database_name, command))
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+    def verify(self, client):
+        """
+        Explain every recorded command and fail if any plan scans a whole collection.
+
+        Args:
+            client (MongoClient): The client used to run `explain`.
+
+        Raises:
+            CollectionScanError: If any recorded command was planned as a COLLSCAN.
+        """
+        commands, self._local.commands = self.commands, []
+        for database_name, command in commands:
+            explain = client[database_name].command("explain", command, verbosity="queryPlanner")
+            if _has_stage(explain.get("queryPlanner", explain), "COLLSCAN"):
+                raise CollectionScanError(f"COLLSCAN in {database_name}: {command}")
+
+
+def _has_stage(plan: any, stage: str):
+    if isinstance(plan, dict):
+        if plan.get("stage") == stage:
+            return True
+        return any(_has_stage(value, stage) for value in plan.values())
+    if isinstance(plan, list):
+        return any(_has_stage(item, stage) for item in plan)
+    return False
+
+
+def init_plan_verification(app: Flask):
+    """
+    Fail any request whose MongoDB queries are planned as collection scans.
+
+    Intended for test runs: every explainable command issued while handling a request
+    is re-run through `explain` after the response is built, and a COLLSCAN raises
+    `CollectionScanError`.
+
+    Args:
+        app (Flask): The Flask application instance.
+    """
+    from .client import get_mongo_client
+
+    recorder = QueryPlanRecorder()
+    app.mongo_event_listeners.append(recorder)
+
+    @app.before_request
+    def reset_recorded_queries():
+        recorder.reset()
+
+    @app.after_request
+    def verify_recorded_queries(response):
+        recorder.verify(get_mongo_client(app))
+        return response
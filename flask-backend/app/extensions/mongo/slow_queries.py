@@ -0,0 +1,269 @@
+import json
+import logging
+import os
+import random
+import sys
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Optional
+
+from flask import Flask, has_request_context, request
+from pymongo import monitoring
+
+from .plans import _DRIVER_FIELDS, command_collection, explainable_command
+
+logger = logging.getLogger(__name__)
+
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_EXTENSIONS_DIR = os.path.join(_APP_DIR, "extensions")
+
+# Explains waiting for the background thread; slow commands beyond this are logged unexplained.
+MAX_PENDING_EXPLAINS = 4
+# Items of a list shown in a command shape before the rest is summarised.
+MAX_SHAPE_ITEMS = 10
+
+
+class SlowQueryRecorder(monitoring.CommandListener):
+    """
+    Record MongoDB commands slower than a threshold, with the route and code that issued them.
+
+    Each slow command is kept in a bounded in-memory buffer and logged as one JSON line
+    on the `app.extensions.mongo.slow_queries` logger. Commands are stored by shape, with every
+    value replaced by "?", so neither holds user data. A sample of explainable commands
+    is re-run through `explain("executionStats")` on a background thread and the plan
+    summary is attached to the entry before it is logged.
+
+    The driver calls the listener on the thread (or task) that issued the command, so
+    the Flask request and the calling frame are still current when it completes.
+    """
+
+    def __init__(self, app: Flask, threshold_ms: float, explain_sample_rate: float, size: int):
+        self.app = app
+        self.threshold_micros = threshold_ms * 1000
+        self.explain_sample_rate = explain_sample_rate
+        self._lock = threading.Lock()
+        self._entries: deque[dict] = deque(maxlen=size)
+        self._started: dict[int, tuple[str, dict]] = {}
+        self._local = threading.local()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_pid: Optional[int] = None
+        self._pending_explains = 0
+
+    def started(self, event):
+        if getattr(self._local, "explaining", False):
+            return
+        with self._lock:
+            self._started[event.request_id] = (event.database_name, event.command)
+
+    def succeeded(self, event):
+        self._finish(event, failed=False)
+
+    def failed(self, event):
+        self._finish(event, failed=True)
+
+    def entries(self, limit: Optional[int] = None):
+        """
+        The recorded slow commands, newest first.
+
+        Args:
+            limit (Optional[int]): Maximum number of entries to return.
+
+        Returns:
+            list[dict[str, any]]: Copies of the recorded entries.
+        """
+        with self._lock:
+            entries = [dict(entry) for entry in reversed(self._entries)]
+        return entries[:limit] if limit else entries
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _finish(self, event, failed: bool):
+        if getattr(self._local, "explaining", False):
+            return
+        with self._lock:
+            database_name, command = self._started.pop(event.request_id, (event.database_name, {}))
+        if event.duration_micros < self.threshold_micros:
+            return
+
+        endpoint, method = _current_route()
+        entry = {
+            "at": datetime.now(timezone.utc).isoformat(),
+            "duration_ms": round(event.duration_micros / 1000, 1),
+            "command": event.command_name,
+            "database": database_name,
+            "collection": command_collection(event.command_name, command),
+            "shape": command_shape(command),
+            "failed": failed,
+            "endpoint": endpoint,
+            "method": method,
+            "source": calling_source(),
+            "pid": os.getpid(),
+            "explain": None,
+        }
+
+        with self._lock:
+            self._entries.append(entry)
+
+        explainable = explainable_command(event.command_name, command) if not failed else None
+        if explainable is not None and random.random() < self.explain_sample_rate and self._submit_explain(entry, database_name, explainable):
+            return
+        _log(entry)
+
+    def _submit_explain(self, entry: dict, database_name: str, command: dict):
+        with self._lock:
+            if self._pending_explains >= MAX_PENDING_EXPLAINS:
+                return False
+            self._pending_explains += 1
+            # Threads do not survive fork(); each worker starts its own explain thread.
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+                self._executor_pid = os.getpid()
+            executor = self._executor
+        executor.submit(self._explain, entry, database_name, command)
+        return True
+
+    def _explain(self, entry: dict, database_name: str, command: dict):
+        from .client import get_mongo_client
+
+        self._local.explaining = True
+        try:
+            explain = get_mongo_client(self.app)[database_name].command("explain", command, verbosity="executionStats")
+            summary = summarize_explain(explain)
+        except Exception as e:
+            summary = {"error": str(e)}
+        finally:
+            self._local.explaining = False
+            with self._lock:
+                self._pending_explains -= 1
+
+        with self._lock:
+            entry["explain"] = summary
+        _log(entry)
+
+
+def _current_route():
+    if has_request_context():
+        return request.endpoint, request.method
+    quart = sys.modules.get("quart")
+    if quart is not None and quart.has_request_context():
+        return quart.request.endpoint, quart.request.method
+    return None, None
+
+
+def calling_source():
+    """
+    The innermost application function on the current stack, outside `app.extensions`.
+
+    For commands issued through a repository this is the repository method; commands run
+    while a route iterates a returned cursor are attributed to the route.
+
+    Returns:
+        Optional[str]: e.g. `app.products.repository.ProductsRepository.list_products:87`.
+    """
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_APP_DIR) and not filename.startswith(_EXTENSIONS_DIR):
+            return f"{frame.f_globals.get('__name__')}.{frame.f_code.co_qualname}:{frame.f_lineno}"
+        frame = frame.f_back
+    return None
+
+
+def command_shape(value: any):
+    """
+    Replace every value in a command with "?", keeping field names and operators.
+
+    Args:
+        value (any): A command document, or part of one.
+
+    Returns:
+        any: The command's shape, safe to log.
+    """
+    if isinstance(value, dict):
+        return {key: command_shape(item) for key, item in value.items() if key not in _DRIVER_FIELDS}
+    if isinstance(value, (list, tuple)):
+        if not any(isinstance(item, (dict, list, tuple)) for item in value):
+            return "?"
+        shape = [command_shape(item) for item in value[:MAX_SHAPE_ITEMS]]
+        if len(value) > MAX_SHAPE_ITEMS:
+            shape.append(f"... {len(value) - MAX_SHAPE_ITEMS} more")
+        return shape
+    return "?"
+
+
+def summarize_explain(explain: dict):
+    """
+    Reduce `explain("executionStats")` output to the fields that explain a slow command.
+
+    Args:
+        explain (dict): The server's explain output, for any explainable command.
+
+    Returns:
+        dict[str, any]: Execution time, documents and keys examined, documents returned, and
+        the winning plan's stages and indexes from the root down.
+    """
+    stats = _find(explain, "executionStats") or {}
+    plan = _find(explain, "winningPlan") or {}
+    return {
+        "execution_ms": stats.get("executionTimeMillis"),
+        "docs_examined": stats.get("totalDocsExamined"),
+        "keys_examined": stats.get("totalKeysExamined"),
+        "returned": stats.get("nReturned"),
+        "stages": _collect(plan, "stage"),
+        "indexes": _collect(plan, "indexName"),
+    }
+
+
+def _find(document: any, key: str):
+    if isinstance(document, dict):
+        if key in document:
+            return document[key]
+        values = document.values()
+    elif isinstance(document, list):
+        values = document
+    else:
+        return None
+    for value in values:
+        found = _find(value, key)
+        if found is not None:
+            return found
+    return None
+
+
+def _collect(plan: any, key: str):
+    found = []
+    if isinstance(plan, dict):
+        if key in plan:
+            found.append(plan[key])
+        for value in plan.values():
+            found.extend(_collect(value, key))
+    elif isinstance(plan, list):
+        for item in plan:
+            found.extend(_collect(item, key))
+    return found
+
+
+def _log(entry: dict):
+    logger.warning("slow_mongo_command %s", json.dumps(entry, default=str))
+
+
+def init_slow_query_log(app: Flask):
+    """
+    Record MongoDB commands slower than `SLOW_QUERY_THRESHOLD_MS`.
+
+    The recorder is kept on `app.slow_query_recorder`, one per worker process.
+
+    Args:
+        app (Flask): The Flask application instance.
+    """
+    app.slow_query_recorder = SlowQueryRecorder(
+        app,
+        threshold_ms=app.config.get("SLOW_QUERY_THRESHOLD_MS", 100),
+        explain_sample_rate=app.config.get("SLOW_QUERY_EXPLAIN_SAMPLE_RATE", 0.1),
+        size=app.config.get("SLOW_QUERY_LOG_SIZE", 200),
+    )
+    app.mongo_event_listeners.append(app.slow_query_recorder)
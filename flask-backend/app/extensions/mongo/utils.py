@@ -1,5 +1,5 @@
 from datetime import date, datetime
-from typing import Union
+from typing import Optional, Union
 
 from bson import ObjectId
 from bson.errors import InvalidId
@@ -36,23 +36,30 @@ def serialize_id(value: Union[ObjectId, str, None]):
     return value
 
 
-def serialize_document(document: dict[str, any]):
-    """Serialize a MongoDB document for JSON responses.
+def serialize_document(document: dict[str, any] | list[dict[str, any]]):
+    """Prepare a MongoDB document (or list of documents) for a JSON response.
+
+    Renames the top-level `_id` to `id` in place, without copying the document.
+    `ObjectId` and `datetime` values are left as-is for the application's JSON
+    provider to encode.
 
     Args:
-        document (dict[str, any]): The MongoDB document to serialize.
+        document (dict[str, any] | list[dict[str, any]]): The MongoDB document(s) to serialize.
 
     Returns:
-        dict[str, any]: Serialized document.
+        dict[str, any] | list[dict[str, any]]: The same document(s), ready for `jsonify`.
     """
-    serialized = _serialize_recursive(document)
-    if "_id" in serialized:
-        serialized["id"] = serialize_id(serialized.pop("_id"))
-    return serialized
+    if isinstance(document, list):
+        for item in document:
+            serialize_document(item)
+        return document
+    if "_id" in document:
+        document["id"] = document.pop("_id")
+    return document
 
 
 def _serialize_recursive(value: any):
-    """Recursively serialize values in a document.
+    """Recursively serialize values in a document for encoders without BSON support.
 
     Args:
         value (any): The value to serialize.
@@ -69,3 +76,32 @@ def _serialize_recursive(value: any):
     if isinstance(value, dict):
         return {key: _serialize_recursive(item) for key, item in value.items()}
     return value
+
+
+def build_projection(fields: Optional[str], allowed: frozenset[str], presets: Optional[dict[str, dict[str, any]]] = None):
+    """Build a MongoDB projection from a comma-separated `fields` query parameter.
+
+    Args:
+        fields (Optional[str]): Requested fields, e.g. "name,price", or the name of a preset.
+        allowed (frozenset[str]): Fields clients may request.
+        presets (Optional[dict[str, dict[str, any]]]): Named projections, e.g. a compact card view.
+
+    Returns:
+        Optional[dict[str, any]]: Inclusion projection, or None to return full documents.
+
+    Raises:
+        ValueError: If any requested field is not allowed.
+    """
+    if not fields:
+        return None
+    if presets and fields in presets:
+        return dict(presets[fields])
+
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in allowed and field != "id"]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    if not requested:
+        return None
+    # `_id` is always returned; an empty projection would read as "no projection".
+    return {field: 1 for field in requested if field != "id"} or {"_id": 1}
@@ -0,0 +1 @@
+from .limiter import RateLimit, parse_limit, parse_limits, parse_route_limits, rate_limited, rate_limiter
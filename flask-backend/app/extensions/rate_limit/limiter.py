@@ -0,0 +1,384 @@
+import logging
+import math
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import Callable, Optional
+
+from flask import Blueprint, current_app, request
+from jwt import InvalidTokenError
+from redis.exceptions import RedisError
+
+from app.auth.jwt import decode_token
+from app.config import Config
+from app.extensions.redis import get_redis_client
+from app.utils import error_response
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# Refills every bucket of one request to the current Redis time, then takes a token
+# from all of them only if each has one, so a request is never charged against one
+# limit while being rejected by another. Returns {allowed, remaining, retry_after_ms}.
+TOKEN_BUCKET_SCRIPT = """
+local now = redis.call('TIME')
+local now_ms = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+local tokens = {}
+local wait_ms = 0
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[2 * i - 1])
+    local rate = tonumber(ARGV[2 * i])
+    local bucket = redis.call('HMGET', key, 'tokens', 'ts')
+    local available = tonumber(bucket[1]) or capacity
+    local elapsed = math.max(0, now_ms - (tonumber(bucket[2]) or now_ms))
+    available = math.min(capacity, available + elapsed * rate)
+    tokens[i] = available
+    if available < 1 then
+        wait_ms = math.max(wait_ms, math.ceil((1 - available) / rate))
+    end
+end
+local remaining = -1
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[2 * i - 1])
+    local rate = tonumber(ARGV[2 * i])
+    local available = tokens[i]
+    if wait_ms == 0 then
+        available = available - 1
+    end
+    redis.call('HSET', key, 'tokens', tostring(available), 'ts', now_ms)
+    redis.call('PEXPIRE', key, math.ceil(capacity / rate))
+    if remaining < 0 or available < remaining then
+        remaining = available
+    end
+end
+return {wait_ms == 0 and 1 or 0, math.floor(remaining), wait_ms}
+"""
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """`limit` requests per `period` seconds for each value of the `key` function."""
+
+    limit: int
+    period: float
+    key: str = "ip"
+
+    @property
+    def rate_per_ms(self):
+        return self.limit / (self.period * 1000)
+
+    def __str__(self):
+        return f"{self.limit}/{self.period:g}s@{self.key}"
+
+
+def parse_limit(spec: str):
+    """
+    Parse a limit such as `5/minute`, `100/hour@user` or `10/30s@email`.
+
+    The key after `@` selects what the bucket is shared by; see `KEY_FUNCTIONS`.
+    It defaults to the client IP.
+
+    Args:
+        spec (str): Limit specification.
+
+    Returns:
+        RateLimit: The parsed limit.
+
+    Raises:
+        ValueError: If the specification is malformed or names an unknown key.
+    """
+    rule, _, key = spec.strip().partition("@")
+    key = key.strip() or "ip"
+    if key not in KEY_FUNCTIONS:
+        raise ValueError(f"Unknown rate limit key {key!r} in {spec!r}")
+    count, _, period = rule.partition("/")
+    period = period.strip()
+    try:
+        if period in PERIODS:
+            seconds = PERIODS[period]
+        elif period.endswith("s"):
+            seconds = float(period[:-1])
+        else:
+            raise ValueError
+        limit = int(count)
+    except ValueError:
+        raise ValueError(f"Invalid rate limit {spec!r}") from None
+    if limit < 1 or seconds <= 0:
+        raise ValueError(f"Invalid rate limit {spec!r}")
+    return RateLimit(limit=limit, period=seconds, key=key)
+
+
+def parse_limits(specs: str):
+    """Parse comma-separated limits; an empty string means no limits."""
+    return tuple(parse_limit(spec) for spec in specs.split(",") if spec.strip())
+
+
+def parse_route_limits(specs: str):
+    """
+    Parse per-endpoint limits such as `auth.login=20/minute,5/minute@email;auth.register=5/minute`.
+
+    Args:
+        specs (str): `;`-separated `endpoint=limits` entries.
+
+    Returns:
+        dict[str, tuple[RateLimit, ...]]: Limits by Flask endpoint name.
+    """
+    routes = {}
+    for entry in specs.split(";"):
+        if not entry.strip():
+            continue
+        endpoint, _, limits = entry.partition("=")
+        routes[endpoint.strip()] = parse_limits(limits)
+    return routes
+
+
+# Key functions receive the Flask or Quart request, and the body validated by
+# `validate_body` for keys listed in `BODY_KEYS` (None otherwise).
+def _client_ip(req):
+    # Behind proxies, `PROXY_FIX_TRUSTED_HOPS` makes `remote_addr` the real client.
+    return req.remote_addr or "unknown"
+
+
+def _user_key(req, payload: any):
+    token = req.cookies.get(Config.JWT_COOKIE_NAME)
+    if token:
+        try:
+            subject = decode_token(token).get("sub")
+        except InvalidTokenError:
+            subject = None
+        if subject:
+            return f"user:{subject}"
+    return f"ip:{_client_ip(req)}"
+
+
+def _email_key(req, payload: any):
+    # Spreads a credential-stuffing burst for one account across IPs into one bucket.
+    email = getattr(payload, "email", None)
+    if isinstance(email, str) and email.strip():
+        return f"email:{email.strip().lower()}"
+    return f"ip:{_client_ip(req)}"
+
+
+KEY_FUNCTIONS: dict[str, Callable[[any, any], str]] = {
+    "ip": lambda req, payload: f"ip:{_client_ip(req)}",
+    "user": _user_key,
+    "email": _email_key,
+}
+BODY_KEYS = frozenset({"email"})
+
+
+class LocalTokenBuckets:
+    """Bounded in-process token buckets used while Redis is unreachable.
+
+    Limits are then enforced per worker process rather than globally, which keeps the
+    expensive endpoints protected without making Redis a hard dependency of every request.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, keys: list[str], limits: list[RateLimit]):
+        """Same contract as the Redis script: (allowed, remaining, retry_after_ms)."""
+        now_ms = time.monotonic() * 1000
+        with self._lock:
+            available, wait_ms = [], 0
+            for key, limit in zip(keys, limits):
+                tokens, ts = self._buckets.get(key, (limit.limit, now_ms))
+                tokens = min(limit.limit, tokens + (now_ms - ts) * limit.rate_per_ms)
+                available.append(tokens)
+                if tokens < 1:
+                    wait_ms = max(wait_ms, math.ceil((1 - tokens) / limit.rate_per_ms))
+
+            allowed = wait_ms == 0
+            for key, tokens in zip(keys, available):
+                self._buckets[key] = (tokens - 1 if allowed else tokens, now_ms)
+                self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_entries:
+                self._buckets.popitem(last=False)
+        remaining = min(available) - (1 if allowed else 0)
+        return allowed, math.floor(remaining), wait_ms
+
+
+class RateLimiter:
+    """Token-bucket rate limiter shared by every worker through one Redis Lua script.
+
+    A bucket holds up to `limit` tokens and refills continuously at `limit / period`,
+    so the allowance slides with time instead of resetting at fixed window edges.
+    """
+
+    def __init__(self, prefix: str, route_limits: dict, default_limits: tuple, fallback_seconds: float, local_max_entries: int):
+        self.prefix = prefix
+        self.route_limits = route_limits
+        self.default_limits = default_limits
+        self.fallback_seconds = fallback_seconds
+        self.local = LocalTokenBuckets(max_entries=local_max_entries)
+        self.redis_failures = 0
+        self._redis_down_until = 0.0
+        self._script = None
+        self._script_client = None
+        self._async_script = None
+        self._async_script_client = None
+
+    def limits_for(self, endpoint: Optional[str]):
+        return self.route_limits.get(endpoint, self.default_limits)
+
+    def request_limits(self, endpoint: Optional[str]):
+        """The limits of `endpoint` keyed on the request alone, charged before the view runs."""
+        return tuple(limit for limit in self.limits_for(endpoint) if limit.key not in BODY_KEYS)
+
+    def body_limits(self, endpoint: Optional[str]):
+        """The limits of `endpoint` keyed on its body, charged by `validate_body` once the body is valid."""
+        return tuple(limit for limit in self.limits_for(endpoint) if limit.key in BODY_KEYS)
+
+    def _bucket_keys(self, scope: str, limits: tuple[RateLimit, ...], req, payload: any):
+        return [f"{self.prefix}:{scope}:{limit}:{KEY_FUNCTIONS[limit.key](req, payload)}" for limit in limits]
+
+    @staticmethod
+    def _script_args(limits: tuple[RateLimit, ...]):
+        args = []
+        for limit in limits:
+            args.extend((limit.limit, repr(limit.rate_per_ms)))
+        return args
+
+    def _redis_failed(self, error: RedisError):
+        self.redis_failures += 1
+        self._redis_down_until = time.monotonic() + self.fallback_seconds
+        logger.warning("Rate limiter falling back to local buckets for %ss: %s", self.fallback_seconds, error)
+
+    def hit(self, scope: str, limits: tuple[RateLimit, ...], keys: list[str]):
+        """
+        Take one token from every bucket of `limits`.
+
+        Args:
+            scope (str): What the buckets belong to, usually the endpoint name.
+            limits (tuple[RateLimit, ...]): Limits that must all allow the request.
+            keys (list[str]): The bucket key of each limit, from `_bucket_keys`.
+
+        Returns:
+            tuple[bool, int, int]: Whether the request is allowed, the tokens left in the
+                tightest bucket and the milliseconds until a token is available.
+        """
+        if time.monotonic() >= self._redis_down_until:
+            try:
+                allowed, remaining, wait_ms = self._get_script()(keys=keys, args=self._script_args(limits))
+                return bool(allowed), remaining, wait_ms
+            except RedisError as e:
+                self._redis_failed(e)
+        return self.local.hit(keys, list(limits))
+
+    async def hit_async(self, scope: str, limits: tuple[RateLimit, ...], keys: list[str]):
+        """`hit` on the `redis.asyncio` client of the Quart app."""
+        if time.monotonic() >= self._redis_down_until:
+            try:
+                allowed, remaining, wait_ms = await self._get_async_script()(keys=keys, args=self._script_args(limits))
+                return bool(allowed), remaining, wait_ms
+            except RedisError as e:
+                self._redis_failed(e)
+        return self.local.hit(keys, list(limits))
+
+    def _get_script(self):
+        redis_client = get_redis_client()
+        if self._script_client is not redis_client:
+            self._script = redis_client.register_script(TOKEN_BUCKET_SCRIPT)
+            self._script_client = redis_client
+        return self._script
+
+    def _get_async_script(self):
+        # The async client needs Quart, which the WSGI app may run without.
+        from app.extensions.redis.async_client import get_async_redis_client
+
+        redis_client = get_async_redis_client()
+        if self._async_script_client is not redis_client:
+            self._async_script = redis_client.register_script(TOKEN_BUCKET_SCRIPT)
+            self._async_script_client = redis_client
+        return self._async_script
+
+    def check(self, scope: str, limits: tuple[RateLimit, ...], payload: any = None):
+        """
+        Enforce `limits` for the current request.
+
+        Args:
+            scope (str): What the buckets belong to, usually the endpoint name.
+            limits (tuple[RateLimit, ...]): Limits that must all allow the request.
+            payload (any): The validated body, for limits keyed on it.
+
+        Returns:
+            Optional[tuple[Response, int]]: A 429 response if any limit is exhausted, otherwise None.
+        """
+        if not limits or not current_app.config.get("RATE_LIMIT_ENABLED", True):
+            return None
+        allowed, _, wait_ms = self.hit(scope, limits, self._bucket_keys(scope, limits, request, payload))
+        return None if allowed else _rate_limited(wait_ms)
+
+    async def check_async(self, scope: str, limits: tuple[RateLimit, ...], payload: any = None):
+        """`check` for the current Quart request."""
+        import quart
+
+        if not limits or not quart.current_app.config.get("RATE_LIMIT_ENABLED", True):
+            return None
+        keys = self._bucket_keys(scope, limits, quart.request, payload)
+        allowed, _, wait_ms = await self.hit_async(scope, limits, keys)
+        return None if allowed else _rate_limited(wait_ms)
+
+
+def _rate_limited(wait_ms: int):
+    retry_after = max(1, math.ceil(wait_ms / 1000))
+    response, status = error_response("rate_limited", HTTPStatus.TOO_MANY_REQUESTS, details={"retry_after": retry_after})
+    response.headers["Retry-After"] = str(retry_after)
+    return response, status
+
+
+rate_limiter = RateLimiter(
+    prefix=Config.RATE_LIMIT_KEY_PREFIX,
+    route_limits=parse_route_limits(Config.RATE_LIMITS),
+    default_limits=parse_limits(Config.RATE_LIMIT_DEFAULT),
+    fallback_seconds=Config.RATE_LIMIT_FALLBACK_SECONDS,
+    local_max_entries=Config.RATE_LIMIT_LOCAL_MAX_ENTRIES,
+)
+
+
+def rate_limited(bp):
+    """
+    Enforce the configured per-endpoint limits on every route of a blueprint.
+
+    Endpoints listed in `RATE_LIMITS` use those limits; the others use
+    `RATE_LIMIT_DEFAULT`. The check runs before the view, so rejected requests never
+    reach authentication, validation or password hashing. Limits keyed on the body are
+    left to `validate_body`, which charges them once the body is size-checked and
+    validated, so the limiter never parses an unchecked body. Quart blueprints are checked
+    on the async Redis client; their endpoints have the same names as the sync ones, so
+    both apps draw from the same buckets.
+
+    Args:
+        bp (Blueprint | quart.Blueprint): The blueprint to protect.
+
+    Returns:
+        Blueprint: The same blueprint, for use inline in `register_routes`.
+    """
+
+    # Blueprints are module-level, so a second `create_app` must not hook them again.
+    if getattr(bp, "rate_limited", False):
+        return bp
+    bp.rate_limited = True
+
+    # Quart is optional: if it was never imported, `bp` cannot be a Quart blueprint.
+    quart = sys.modules.get("quart")
+    if quart is not None and isinstance(bp, quart.Blueprint):
+        @bp.before_request
+        async def enforce_rate_limits_async():
+            return await rate_limiter.check_async(quart.request.endpoint, rate_limiter.request_limits(quart.request.endpoint))
+
+        return bp
+
+    @bp.before_request
+    def enforce_rate_limits():
+        return rate_limiter.check(request.endpoint, rate_limiter.request_limits(request.endpoint))
+
+    return bp
+
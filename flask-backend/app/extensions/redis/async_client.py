@@ -0,0 +1,48 @@
+from typing import Optional
+
+import redis.asyncio
+from quart import Quart, current_app
+
+
+def init_async_redis(app: Quart):
+    """
+    Initialize the `redis.asyncio` client for the ASGI application.
+
+    Connections are opened lazily on the worker's event loop and released when the
+    application stops serving. A checkout long poll holds its connection for the whole
+    wait, so the pool is sized by `ASGI_REDIS_MAX_CONNECTIONS` and, once exhausted,
+    callers wait up to `ASGI_REDIS_POOL_TIMEOUT_SECONDS` for a free connection instead
+    of failing immediately. The client is built from `app.redis_client_class` when
+    `init_async_metrics` has set one.
+
+    Args:
+        app (Quart): The Quart application instance.
+    """
+    pool = redis.asyncio.BlockingConnectionPool(
+        host=app.config.get("REDIS_HOST", "localhost"),
+        port=app.config.get("REDIS_PORT", 6379),
+        db=app.config.get("REDIS_DB", 0),
+        decode_responses=True,
+        max_connections=app.config.get("ASGI_REDIS_MAX_CONNECTIONS", 1000),
+        timeout=app.config.get("ASGI_REDIS_POOL_TIMEOUT_SECONDS", 2),
+    )
+    client_class = getattr(app, "redis_client_class", redis.asyncio.Redis)
+    app.async_redis_client = client_class(connection_pool=pool)
+
+    @app.after_serving
+    async def close_async_redis():
+        await app.async_redis_client.aclose(close_connection_pool=True)
+
+
+def get_async_redis_client(app: Optional[Quart] = None):
+    """
+    Get the async Redis client for the current app context.
+
+    Args:
+        app (Optional[Quart]): Quart application instance. If not provided, uses `current_app`.
+
+    Returns:
+        redis.asyncio.Redis: The async Redis client instance.
+    """
+    quart_app = app or current_app
+    return quart_app.async_redis_client
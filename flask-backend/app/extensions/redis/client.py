@@ -8,10 +8,14 @@ def init_redis(app: Flask):
     """
     Initialize Redis client for a Flask application and store in app context.
 
+    The client is built from `app.redis_client_class` when an extension such as
+    `init_metrics` has set one, and from `redis.Redis` otherwise.
+
     Args:
         app (Flask): The Flask application instance.
     """
-    app.redis_client = redis.Redis(
+    client_class = getattr(app, "redis_client_class", redis.Redis)
+    app.redis_client = client_class(
         host=app.config.get("REDIS_HOST", "localhost"),
         port=app.config.get("REDIS_PORT", 6379),
         db=app.config.get("REDIS_DB", 0),
@@ -0,0 +1 @@
+from .body import InvalidBody, body_adapter, check_json_request, parse_json_body, validate_body
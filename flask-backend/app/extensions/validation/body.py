@@ -0,0 +1,150 @@
+import inspect
+from functools import lru_cache, wraps
+from http import HTTPStatus
+from typing import Optional
+
+from flask import current_app, request
+from pydantic import TypeAdapter, ValidationError
+from werkzeug.exceptions import RequestEntityTooLarge
+
+from app.extensions.metrics.timing import timed
+from app.extensions.rate_limit import rate_limiter
+from app.utils import error_response
+
+
+class InvalidBody(Exception):
+    """A request body that was rejected, with the `error_response` to send for it."""
+
+    def __init__(self, error: str, status: HTTPStatus = HTTPStatus.BAD_REQUEST, details: any = None):
+        super().__init__(error)
+        self.error = error
+        self.status = status
+        self.details = details
+
+
+@lru_cache(maxsize=None)
+def body_adapter(schema: type):
+    """The validator for `schema`, built once per schema and shared by the sync and async routes."""
+    return TypeAdapter(schema)
+
+
+def parse_json_body(adapter: TypeAdapter, raw: bytes):
+    """
+    Parse and validate a raw JSON body in one pass, without building an intermediate dict.
+
+    Args:
+        adapter (TypeAdapter): Validator from `body_adapter`.
+        raw (bytes): The request body.
+
+    Returns:
+        any: The validated schema instance.
+
+    Raises:
+        InvalidBody: `invalid_json` for malformed JSON, `invalid_payload` with Pydantic's
+            errors for a body that does not match the schema.
+    """
+    try:
+        with timed("validate"):
+            return adapter.validate_json(raw)
+    except ValidationError as e:
+        errors = e.errors()
+        if any(error["type"] == "json_invalid" for error in errors):
+            raise InvalidBody("invalid_json", details=e.errors(include_input=False)) from e
+        raise InvalidBody("invalid_payload", details=errors) from e
+
+
+def check_json_request(content_type_is_json: bool, content_length: Optional[int], max_bytes: int):
+    """
+    Reject a body by its headers, before any of it is read.
+
+    Raises:
+        InvalidBody: `unsupported_media_type` for a non-JSON body, `payload_too_large`
+            when `Content-Length` exceeds `max_bytes`.
+    """
+    if not content_type_is_json:
+        raise InvalidBody("unsupported_media_type", HTTPStatus.UNSUPPORTED_MEDIA_TYPE)
+    if content_length is not None and content_length > max_bytes:
+        raise InvalidBody("payload_too_large", HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+
+
+def _read_body(max_bytes: int):
+    # A streamed body has no Content-Length to check up front. Werkzeug stops reading it
+    # at `max_content_length`, so allow one byte more and treat a longer read as too large.
+    request.max_content_length = max_bytes + 1
+    try:
+        raw = request.get_data()
+    except RequestEntityTooLarge:
+        raw = None
+    if raw is None or len(raw) > max_bytes:
+        raise InvalidBody("payload_too_large", HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+    return raw
+
+
+async def _read_body_async(max_bytes: int):
+    import quart
+
+    # Quart enforces its own `MAX_CONTENT_LENGTH` while receiving; the body is checked
+    # against this route's limit once it is in.
+    raw = await quart.request.get_data()
+    if len(raw) > max_bytes:
+        raise InvalidBody("payload_too_large", HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+    return raw
+
+
+def validate_body(schema: type, max_bytes: Optional[int] = None):
+    """
+    Validate the JSON request body against `schema` and pass it to the view as `data`.
+
+    The schema's validator is built when the route is declared, and Pydantic parses the
+    raw body directly, instead of `request.get_json()` building a dict that is then
+    validated a second time. Bodies over the size limit are refused from their
+    `Content-Length` (or, when streamed, once the limit is read) before any parsing.
+    Rate limits keyed on the body (e.g. `@email`) are charged here, on the validated
+    body. Coroutine views are served from the Quart request.
+
+    Args:
+        schema (type): Pydantic model the body must match.
+        max_bytes (Optional[int]): Body size limit. Defaults to `MAX_JSON_BODY_BYTES`.
+
+    Returns:
+        Callable: Decorator for a view taking a `data` keyword argument.
+    """
+    adapter = body_adapter(schema)
+
+    def decorator(f):
+        if inspect.iscoroutinefunction(f):
+            # Only coroutine views need Quart, so the WSGI app runs without it installed.
+            import quart
+
+            @wraps(f)
+            async def decorated_async(*args, **kwargs):
+                limit = max_bytes or quart.current_app.config.get("MAX_JSON_BODY_BYTES", 1024 * 1024)
+                try:
+                    check_json_request(quart.request.is_json, quart.request.content_length, limit)
+                    data = parse_json_body(adapter, await _read_body_async(limit))
+                except InvalidBody as e:
+                    return error_response(e.error, e.status, details=e.details)
+                endpoint = quart.request.endpoint
+                limited = await rate_limiter.check_async(endpoint, rate_limiter.body_limits(endpoint), payload=data)
+                if limited:
+                    return limited
+                return await f(*args, data=data, **kwargs)
+
+            return decorated_async
+
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            limit = max_bytes or current_app.config.get("MAX_JSON_BODY_BYTES", 1024 * 1024)
+            try:
+                check_json_request(request.is_json, request.content_length, limit)
+                data = parse_json_body(adapter, _read_body(limit))
+            except InvalidBody as e:
+                return error_response(e.error, e.status, details=e.details)
+            limited = rate_limiter.check(request.endpoint, rate_limiter.body_limits(request.endpoint), payload=data)
+            if limited:
+                return limited
+            return f(*args, data=data, **kwargs)
+
+        return decorated
+
+    return decorator
@@ -0,0 +1,66 @@
+from datetime import datetime
+
+from pymongo import ReturnDocument
+
+from app.extensions.mongo import keyset_page_async, parse_object_id
+from app.extensions.mongo.async_client import get_async_mongo_db
+from app.lists.repository import ListsRepository
+
+
+class AsyncListsRepository:
+    """`ListsRepository` on the async MongoDB client."""
+
+    def __init__(self):
+        pass
+
+    @property
+    def db(self):
+        return get_async_mongo_db()
+
+    @property
+    def lists(self):
+        return self.db.lists
+
+    async def get_lists_for_user(self, user_id: str, limit: int = 50, cursor: str = None, projection: dict = None):
+        return await keyset_page_async(self.lists, {"user_id": parse_object_id(user_id)}, limit=limit, cursor=cursor, projection=projection)
+
+    async def get_list_by_id(self, user_id: str, list_id: str):
+        return await self.lists.find_one({"_id": parse_object_id(list_id), "user_id": parse_object_id(user_id)})
+
+    async def get_list_version(self, user_id: str, list_id: str):
+        return await self.lists.find_one({"_id": parse_object_id(list_id), "user_id": parse_object_id(user_id)}, {"updated_at": 1})
+
+    async def create_list(self, user_id: str, name: str, product_ids: list[str] = None):
+        list_data = ListsRepository.build_list(user_id=user_id, name=name, product_ids=product_ids)
+        await self.lists.insert_one(list_data)
+        return list_data
+
+    async def update_list(self, user_id: str, list_id: str, updates: dict):
+        updates["updated_at"] = datetime.now()
+        return await self.lists.find_one_and_update(
+            {"_id": parse_object_id(list_id), "user_id": parse_object_id(user_id)},
+            {"$set": updates},
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def add_product(self, user_id: str, list_id: str, product_id: str):
+        return await self.lists.find_one_and_update(
+            {"_id": parse_object_id(list_id), "user_id": parse_object_id(user_id)},
+            {"$addToSet": {"product_ids": parse_object_id(product_id)}, "$set": {"updated_at": datetime.now()}},
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def remove_product(self, user_id: str, list_id: str, product_id: str):
+        product_object_id = parse_object_id(product_id)
+        updated_list = await self.lists.find_one_and_update(
+            {"_id": parse_object_id(list_id), "user_id": parse_object_id(user_id), "product_ids": product_object_id},
+            {"$pull": {"product_ids": product_object_id}, "$set": {"updated_at": datetime.now()}},
+            return_document=ReturnDocument.AFTER,
+        )
+        if updated_list:
+            return updated_list, True
+        return await self.get_list_by_id(user_id=user_id, list_id=list_id), False
+
+    async def delete_list(self, user_id: str, list_id: str):
+        result = await self.lists.delete_one({"_id": parse_object_id(list_id), "user_id": parse_object_id(user_id)})
+        return result.deleted_count > 0
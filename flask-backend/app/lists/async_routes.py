@@ -0,0 +1,147 @@
+from http import HTTPStatus
+
+from quart import Blueprint, current_app, jsonify, request
+
+from app.asgi.auth import auth_required
+from app.config import Config
+from app.extensions.http_cache import cache_control, check_not_modified_async, conditional_response_async, document_response_async
+from app.extensions.mongo import InvalidCursor, build_projection, parse_object_id, parse_page_params, serialize_document, serialize_id
+from app.extensions.validation import validate_body
+from app.lists import ListsRepository
+from app.lists.async_repository import AsyncListsRepository
+from app.lists.routes import ListCreateSchema, ListUpdateSchema
+from app.products.async_repository import AsyncProductsRepository
+from app.utils import error_response
+
+# Same name as the sync blueprint, so endpoints line up with `lists_bp`.
+lists_bp = Blueprint("lists", __name__)
+
+lists_repo = AsyncListsRepository()
+products_repo = AsyncProductsRepository()
+
+
+async def _expand_products(lists: list[dict]):
+    """Attach the product documents of every list in list order, fetched in one `$in` query."""
+    keys = dict.fromkeys(str(pid) for lst in lists for pid in lst.get("product_ids", []))
+    object_ids = [oid for oid in (parse_object_id(key) for key in keys) if oid]
+    products = {str(p["_id"]): p for p in await products_repo.get_products_by_ids(object_ids)} if object_ids else {}
+    for lst in lists:
+        lst["products"] = [
+            serialize_document(products[str(pid)]) for pid in lst.get("product_ids", []) if str(pid) in products
+        ]
+    return lists
+
+
+@lists_bp.get("/", strict_slashes=False)
+@cache_control(Config.CACHE_CONTROL_PRIVATE)
+@auth_required
+async def list_lists(user):
+    try:
+        limit, cursor = parse_page_params(request.args)
+    except ValueError:
+        return error_response("invalid_limit", HTTPStatus.BAD_REQUEST)
+    try:
+        projection = build_projection(request.args.get("fields"), ListsRepository.FIELDS)
+    except ValueError as e:
+        return error_response("invalid_fields", details=str(e))
+
+    try:
+        lists, next_cursor = await lists_repo.get_lists_for_user(user_id=user["id"], limit=limit, cursor=cursor, projection=projection)
+        if request.args.get("expand") == "products":
+            await _expand_products(lists)
+        return await conditional_response_async(jsonify({"items": [serialize_document(l) for l in lists], "next_cursor": next_cursor}))
+    except InvalidCursor:
+        return error_response("invalid_cursor", HTTPStatus.BAD_REQUEST)
+    except Exception as e:
+        return error_response("Database error", details=str(e), status=HTTPStatus.INTERNAL_SERVER_ERROR)
+
+
+@lists_bp.post("/")
+@auth_required
+@validate_body(ListCreateSchema)
+async def create_list(user, data: ListCreateSchema):
+    if data.name == "Wishlist":
+        return error_response("cannot_create_wishlist", HTTPStatus.FORBIDDEN)
+
+    try:
+        new_list = await lists_repo.create_list(user_id=user["id"], name=data.name, product_ids=data.product_ids)
+        return jsonify(serialize_document(new_list)), HTTPStatus.CREATED
+    except Exception as e:
+        return error_response("Database error", details=str(e), status=HTTPStatus.INTERNAL_SERVER_ERROR)
+
+
+@lists_bp.get("/<list_id>")
+@cache_control(Config.CACHE_CONTROL_PRIVATE)
+@auth_required
+async def get_list(user, list_id: str):
+    expand = request.args.get("expand") == "products"
+    if not expand:
+        response = await check_not_modified_async(lambda: lists_repo.get_list_version(user_id=user["id"], list_id=list_id))
+        if response:
+            return response
+
+    lst = await lists_repo.get_list_by_id(user_id=user["id"], list_id=list_id)
+    if not lst:
+        return error_response("list_not_found", HTTPStatus.NOT_FOUND)
+    if expand:
+        await _expand_products([lst])
+        return await conditional_response_async(current_app.json.response(serialize_document(lst)))
+    return await document_response_async(lst)
+
+
+@lists_bp.put("/<list_id>")
+@auth_required
+@validate_body(ListUpdateSchema)
+async def update_list(user, list_id: str, data: ListUpdateSchema):
+    lst = await lists_repo.get_list_by_id(user_id=user["id"], list_id=list_id)
+    if not lst:
+        return error_response("list_not_found", HTTPStatus.NOT_FOUND)
+    if lst["name"] == "Wishlist":
+        return error_response("cannot_modify_wishlist", HTTPStatus.FORBIDDEN)
+
+    if data.name == "Wishlist":
+        return error_response("cannot_update_list", HTTPStatus.FORBIDDEN)
+
+    updates = {k: v for k, v in data.model_dump(exclude_unset=True).items()}
+    if not updates:
+        return error_response("no_updates_provided")
+
+    updated_list = await lists_repo.update_list(user_id=user["id"], list_id=list_id, updates=updates)
+    if not updated_list:
+        return error_response("list_not_found", HTTPStatus.NOT_FOUND)
+    return jsonify(serialize_document(updated_list)), HTTPStatus.OK
+
+
+@lists_bp.post("/<list_id>/product/<product_id>")
+@auth_required
+async def add_product_to_list(user, list_id: str, product_id: str):
+    updated_list = await lists_repo.add_product(user_id=user["id"], list_id=list_id, product_id=product_id)
+    if not updated_list:
+        return error_response("list_not_found", HTTPStatus.NOT_FOUND)
+    return jsonify(serialize_document(updated_list)), HTTPStatus.OK
+
+
+@lists_bp.delete("/<list_id>/product/<product_id>")
+@auth_required
+async def remove_product_from_list(user, list_id: str, product_id: str):
+    updated_list, removed = await lists_repo.remove_product(user_id=user["id"], list_id=list_id, product_id=product_id)
+    if not updated_list:
+        return error_response("list_not_found", HTTPStatus.NOT_FOUND)
+    if not removed:
+        return error_response("product_not_in_list", HTTPStatus.BAD_REQUEST)
+    return jsonify(serialize_document(updated_list)), HTTPStatus.OK
+
+
+@lists_bp.delete("/<list_id>")
+@auth_required
+async def delete_list(user, list_id: str):
+    lst = await lists_repo.get_list_by_id(user_id=user["id"], list_id=list_id)
+    if not lst:
+        return error_response("list_not_found", HTTPStatus.NOT_FOUND)
+    if lst["name"] == "Wishlist":
+        return error_response("cannot_delete_wishlist", HTTPStatus.FORBIDDEN)
+
+    deleted = await lists_repo.delete_list(user_id=user["id"], list_id=list_id)
+    if not deleted:
+        return error_response("list_not_found", HTTPStatus.NOT_FOUND)
+    return jsonify({"deleted": True, "list_id": serialize_id(list_id)}), HTTPStatus.OK
@@ -1,9 +1,20 @@
 from datetime import datetime
 
-from app.extensions.mongo import get_mongo_db, parse_object_id
+from pymongo import ASCENDING, DESCENDING, IndexModel, ReturnDocument
+
+from app.extensions.mongo import get_mongo_db, keyset_page, parse_object_id
 
 
 class ListsRepository:
+    INDEXES = {
+        "lists": [
+            IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="lists_user_created_at"),
+        ],
+    }
+
+    # Fields clients may request through `?fields=`.
+    FIELDS = frozenset({"user_id", "name", "product_ids", "created_at", "updated_at"})
+
     def __init__(self):
         pass
 
@@ -15,48 +26,58 @@ class ListsRepository:
     def lists(self):
         return self.db.lists
 
-    def get_lists_for_user(self, user_id: str):
-        return list(self.lists.find({"user_id": parse_object_id(user_id)}).sort("created_at", -1))
+    def get_lists_for_user(self, user_id: str, limit: int = 50, cursor: str = None, projection: dict = None):
+        return keyset_page(self.lists, {"user_id": parse_object_id(user_id)}, limit=limit, cursor=cursor, projection=projection)
 
     def get_list_by_id(self, user_id: str, list_id: str):
         return self.lists.find_one({"_id": parse_object_id(list_id), "user_id": parse_object_id(user_id)})
 
-    def create_list(self, user_id: str, name: str, product_ids: list[str] = None):
+    def get_list_version(self, user_id: str, list_id: str):
+        return self.lists.find_one({"_id": parse_object_id(list_id), "user_id": parse_object_id(user_id)}, {"updated_at": 1})
+
+    @staticmethod
+    def build_list(user_id: str, name: str, product_ids: list[str] = None):
         product_ids = product_ids or []
-        list_data = {
+        now = datetime.now()
+        return {
             "user_id": parse_object_id(user_id),
             "name": name,
             "product_ids": [parse_object_id(pid) for pid in product_ids],
-            "created_at": datetime.now(),
-            "updated_at": datetime.now()
+            "created_at": now,
+            "updated_at": now
         }
-        inserted_id = self.lists.insert_one(list_data).inserted_id
-        return self.lists.find_one({"_id": inserted_id})
+
+    def create_list(self, user_id: str, name: str, product_ids: list[str] = None):
+        list_data = self.build_list(user_id=user_id, name=name, product_ids=product_ids)
+        self.lists.insert_one(list_data)
+        return list_data
 
     def update_list(self, user_id: str, list_id: str, updates: dict):
         updates["updated_at"] = datetime.now()
-        result = self.lists.update_one({"_id": parse_object_id(list_id), "user_id": parse_object_id(user_id)}, {"$set": updates})
-        if result.matched_count == 0:
-            return None
-        return self.lists.find_one({"_id": parse_object_id(list_id)})
+        return self.lists.find_one_and_update(
+            {"_id": parse_object_id(list_id), "user_id": parse_object_id(user_id)},
+            {"$set": updates},
+            return_document=ReturnDocument.AFTER,
+        )
 
     def add_product(self, user_id: str, list_id: str, product_id: str):
-        result = self.lists.update_one(
+        return self.lists.find_one_and_update(
             {"_id": parse_object_id(list_id), "user_id": parse_object_id(user_id)},
-            {"$addToSet": {"product_ids": parse_object_id(product_id)}, "$set": {"updated_at": datetime.now()}}
+            {"$addToSet": {"product_ids": parse_object_id(product_id)}, "$set": {"updated_at": datetime.now()}},
+            return_document=ReturnDocument.AFTER,
         )
-        if result.matched_count == 0:
-            return None
-        return self.lists.find_one({"_id": parse_object_id(list_id)})
 
     def remove_product(self, user_id: str, list_id: str, product_id: str):
-        result = self.lists.update_one(
-            {"_id": parse_object_id(list_id), "user_id": parse_object_id(user_id)},
-            {"$pull": {"product_ids": parse_object_id(product_id)}, "$set": {"updated_at": datetime.now()}}
+        product_object_id = parse_object_id(product_id)
+        updated_list = self.lists.find_one_and_update(
+            {"_id": parse_object_id(list_id), "user_id": parse_object_id(user_id), "product_ids": product_object_id},
+            {"$pull": {"product_ids": product_object_id}, "$set": {"updated_at": datetime.now()}},
+            return_document=ReturnDocument.AFTER,
         )
-        if result.matched_count == 0:
-            return None, False
-        return self.lists.find_one({"_id": parse_object_id(list_id)}), result.modified_count > 0
+        if updated_list:
+            return updated_list, True
+        # Nothing was pulled: tell "list not found" apart from "product not in list".
+        return self.get_list_by_id(user_id=user_id, list_id=list_id), False
 
     def delete_list(self, user_id: str, list_id: str):
         result = self.lists.delete_one({"_id": parse_object_id(list_id), "user_id": parse_object_id(user_id)})
@@ -1,10 +1,14 @@
 from http import HTTPStatus
-from flask import Blueprint, jsonify, request
-from pydantic import BaseModel, constr, ValidationError, Field
+from flask import Blueprint, current_app, jsonify, request
+from pydantic import BaseModel, constr, Field
 
-from app.extensions.mongo import serialize_id, serialize_document
+from app.config import Config
+from app.extensions.http_cache import cache_control, check_not_modified, conditional_response, document_response
+from app.extensions.mongo import InvalidCursor, build_projection, parse_page_params, serialize_id, serialize_document
+from app.extensions.validation import validate_body
 from app.auth import auth_required
 from app.lists import ListsRepository
+from app.products import get_product_loader
 from app.utils import error_response
 
 lists_bp = Blueprint("lists", __name__)
@@ -12,6 +16,17 @@ lists_bp = Blueprint("lists", __name__)
 lists_repo = ListsRepository()
 
 
+def _expand_products(lists: list[dict]):
+    """Attach the product documents of every list in list order, fetched in one batch."""
+    product_ids = [pid for lst in lists for pid in lst.get("product_ids", [])]
+    products = get_product_loader().load_many(product_ids)
+    for lst in lists:
+        lst["products"] = [
+            serialize_document(products[str(pid)]) for pid in lst.get("product_ids", []) if str(pid) in products
+        ]
+    return lists
+
+
 class ListCreateSchema(BaseModel):
     name: constr(min_length=1)
     product_ids: list[str] = Field(default=[])
@@ -23,27 +38,33 @@ class ListUpdateSchema(BaseModel):
 
 
 @lists_bp.get("/", strict_slashes=False)
+@cache_control(Config.CACHE_CONTROL_PRIVATE)
 @auth_required
 def list_lists(user):
     try:
-        lists_cursor = lists_repo.get_lists_for_user(user_id=user["id"])
-        return jsonify([serialize_document(l) for l in lists_cursor]), HTTPStatus.OK
+        limit, cursor = parse_page_params(request.args)
+    except ValueError:
+        return error_response("invalid_limit", HTTPStatus.BAD_REQUEST)
+    try:
+        projection = build_projection(request.args.get("fields"), ListsRepository.FIELDS)
+    except ValueError as e:
+        return error_response("invalid_fields", details=str(e))
+
+    try:
+        lists, next_cursor = lists_repo.get_lists_for_user(user_id=user["id"], limit=limit, cursor=cursor, projection=projection)
+        if request.args.get("expand") == "products":
+            _expand_products(lists)
+        return conditional_response(jsonify({"items": [serialize_document(l) for l in lists], "next_cursor": next_cursor}))
+    except InvalidCursor:
+        return error_response("invalid_cursor", HTTPStatus.BAD_REQUEST)
     except Exception as e:
         return error_response("Database error", details=str(e), status=HTTPStatus.INTERNAL_SERVER_ERROR)
 
 
 @lists_bp.post("/")
 @auth_required
-def create_list(user):
-    payload = request.get_json()
-    if payload is None:
-        return error_response("invalid_json")
-
-    try:
-        data = ListCreateSchema(**payload)
-    except ValidationError as e:
-        return error_response("invalid_payload", details=e.errors(), status=HTTPStatus.BAD_REQUEST)
-
+@validate_body(ListCreateSchema)
+def create_list(user, data: ListCreateSchema):
     if data.name == "Wishlist":
         return error_response("cannot_create_wishlist", HTTPStatus.FORBIDDEN)
 
@@ -55,31 +76,36 @@ def create_list(user):
 
 
 @lists_bp.get("/<list_id>")
+@cache_control(Config.CACHE_CONTROL_PRIVATE)
 @auth_required
 def get_list(user, list_id: str):
+    expand = request.args.get("expand") == "products"
+    if not expand:
+        # Expanded lists also change when their products do, so only plain lists can be
+        # validated from the list's own version.
+        response = check_not_modified(lambda: lists_repo.get_list_version(user_id=user["id"], list_id=list_id))
+        if response:
+            return response
+
     lst = lists_repo.get_list_by_id(user_id=user["id"], list_id=list_id)
     if not lst:
         return error_response("list_not_found", HTTPStatus.NOT_FOUND)
-    return jsonify(serialize_document(lst)), HTTPStatus.OK
+    if expand:
+        _expand_products([lst])
+        return conditional_response(current_app.json.response(serialize_document(lst)))
+    return document_response(lst)
 
 
 @lists_bp.put("/<list_id>")
 @auth_required
-def update_list(user, list_id: str):
+@validate_body(ListUpdateSchema)
+def update_list(user, list_id: str, data: ListUpdateSchema):
     lst = lists_repo.get_list_by_id(user_id=user["id"], list_id=list_id)
     if not lst:
         return error_response("list_not_found", HTTPStatus.NOT_FOUND)
     if lst["name"] == "Wishlist":
         return error_response("cannot_modify_wishlist", HTTPStatus.FORBIDDEN)
 
-    payload = request.get_json()
-    if payload is None:
-        return error_response("invalid_json")
-    try:
-        data = ListUpdateSchema(**payload)
-    except ValidationError as e:
-        return error_response("invalid_payload", details=e.errors(), status=HTTPStatus.BAD_REQUEST)
-
     if data.name == "Wishlist":
         return error_response("cannot_update_list", HTTPStatus.FORBIDDEN)
 
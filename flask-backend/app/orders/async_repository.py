@@ -0,0 +1,71 @@
+import json
+
+from app.config import Config
+from app.extensions.mongo import keyset_page_async, parse_object_id
+from app.extensions.mongo.async_client import get_async_mongo_db
+from app.orders.respository import OrdersRepository
+from app.orders.worker import done_key
+
+
+class AsyncOrdersRepository:
+    """`OrdersRepository` on the async MongoDB client.
+
+    Checkout intents are still resolved by the sync worker pool; this side only
+    creates orders, queues their intents and waits for the result.
+    """
+
+    def __init__(self):
+        pass
+
+    @property
+    def db(self):
+        return get_async_mongo_db()
+
+    @property
+    def orders(self):
+        return self.db.orders
+
+    async def get_orders_for_user(self, user_id: str, limit: int = 50, cursor: str = None, projection: dict = None):
+        return await keyset_page_async(self.orders, {"user_id": parse_object_id(user_id)}, limit=limit, cursor=cursor, projection=projection)
+
+    async def get_order_by_id(self, user_id: str, order_id: str):
+        return await self.orders.find_one({"_id": parse_object_id(order_id), "user_id": parse_object_id(user_id)})
+
+    async def create_order(self, user_id: str, product_ids: list[str], name: str, address: str):
+        order = OrdersRepository.build_order(user_id=user_id, product_ids=product_ids, name=name, address=address)
+        await self.orders.insert_one(order)
+        return order
+
+    async def get_payment_status(self, user_id: str, order_id: str):
+        order = await self.orders.find_one(
+            {"_id": parse_object_id(order_id), "user_id": parse_object_id(user_id)},
+            {"payment": 1},
+        )
+        return order.get("payment", {}) if order else None
+
+    async def delete_order(self, user_id: str, order_id: str):
+        result = await self.orders.delete_one({"_id": parse_object_id(order_id), "user_id": parse_object_id(user_id)})
+        return result.deleted_count > 0
+
+
+async def enqueue_checkout_async(redis_client, order_id: str, user_id: str, items: list[dict]):
+    """`enqueue_checkout` for a `redis.asyncio` client."""
+    intent = json.dumps({"order_id": order_id, "user_id": user_id, "items": items}, separators=(",", ":"))
+    await redis_client.lpush(Config.CHECKOUT_QUEUE, intent)
+
+
+async def wait_for_checkout_async(redis_client, order_id: str, timeout: int):
+    """
+    `wait_for_checkout` for a `redis.asyncio` client.
+
+    The BLPOP suspends only this request; each waiting poller holds one Redis
+    connection but no thread.
+    """
+    key = done_key(order_id)
+    signal = await redis_client.blpop([key], timeout=timeout)
+    if signal:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.rpush(key, signal[1])
+            pipe.expire(key, Config.CHECKOUT_RESULT_TTL_SECONDS)
+            await pipe.execute()
+    return signal is not None
@@ -0,0 +1,101 @@
+from http import HTTPStatus
+
+from quart import Blueprint, jsonify, request, url_for
+from redis.exceptions import RedisError
+
+from app.asgi.auth import auth_required
+from app.config import Config
+from app.extensions.mongo import InvalidCursor, build_projection, parse_page_params, serialize_document
+from app.extensions.redis.async_client import get_async_redis_client
+from app.extensions.validation import validate_body
+from app.orders import OrdersRepository
+from app.orders.async_repository import AsyncOrdersRepository, enqueue_checkout_async, wait_for_checkout_async
+from app.orders.routes import OrderWithPaymentSchema
+from app.utils import error_response
+
+# Same name as the sync blueprint, so endpoints line up with `orders_bp`.
+orders_bp = Blueprint("orders", __name__)
+
+orders_repo = AsyncOrdersRepository()
+
+
+@orders_bp.get("/", strict_slashes=False)
+@auth_required
+async def list_orders(user):
+    try:
+        limit, cursor = parse_page_params(request.args)
+    except ValueError:
+        return error_response("invalid_limit", HTTPStatus.BAD_REQUEST)
+    try:
+        projection = build_projection(request.args.get("fields"), OrdersRepository.FIELDS)
+    except ValueError as e:
+        return error_response("invalid_fields", details=str(e))
+
+    try:
+        orders, next_cursor = await orders_repo.get_orders_for_user(user_id=user["id"], limit=limit, cursor=cursor, projection=projection)
+        return jsonify({"items": [serialize_document(o) for o in orders], "next_cursor": next_cursor}), HTTPStatus.OK
+    except InvalidCursor:
+        return error_response("invalid_cursor", HTTPStatus.BAD_REQUEST)
+    except Exception as e:
+        return error_response("Database error", details=str(e), status=HTTPStatus.INTERNAL_SERVER_ERROR)
+
+
+@orders_bp.post("/")
+@auth_required
+@validate_body(OrderWithPaymentSchema)
+async def create_order_with_payment(user, data: OrderWithPaymentSchema):
+    try:
+        new_order = await orders_repo.create_order(
+            user_id=user["id"],
+            product_ids=[item.product_id for item in data.items],
+            name=data.name,
+            address=data.address,
+        )
+        order_id = str(new_order["_id"])
+    except Exception as e:
+        return error_response("Database error", details=str(e), status=HTTPStatus.INTERNAL_SERVER_ERROR)
+
+    try:
+        await enqueue_checkout_async(
+            get_async_redis_client(),
+            order_id=order_id,
+            user_id=str(user["id"]),
+            items=[item.model_dump() for item in data.items],
+        )
+    except Exception as e:
+        # No worker would ever resolve the order, so roll it back instead of leaving it pending.
+        await orders_repo.delete_order(user_id=user["id"], order_id=order_id)
+        return error_response("Database error", details=str(e), status=HTTPStatus.INTERNAL_SERVER_ERROR)
+
+    return jsonify({
+        "order_id": order_id,
+        "status": "pending",
+        "status_url": url_for("orders.get_checkout_status", order_id=order_id),
+    }), HTTPStatus.ACCEPTED
+
+
+@orders_bp.get("/<order_id>/checkout")
+@auth_required
+async def get_checkout_status(user, order_id: str):
+    try:
+        wait = min(int(request.args.get("wait", 0)), Config.CHECKOUT_POLL_MAX_WAIT_SECONDS)
+    except ValueError:
+        return error_response("invalid_wait", HTTPStatus.BAD_REQUEST)
+
+    payment = await orders_repo.get_payment_status(user_id=user["id"], order_id=order_id)
+    if payment is None:
+        return error_response("order_not_found", HTTPStatus.NOT_FOUND)
+
+    if payment.get("status") == "pending" and wait > 0:
+        try:
+            finished = await wait_for_checkout_async(get_async_redis_client(), order_id, timeout=wait)
+        except RedisError:
+            # No free connection for the wait; answer with the current status and let
+            # the client poll again rather than failing the request.
+            finished = False
+        if finished:
+            payment = await orders_repo.get_payment_status(user_id=user["id"], order_id=order_id)
+
+    status = payment.get("status", "unknown")
+    body = {"order_id": order_id, "status": status, "url": payment.get("checkout_url"), "error": payment.get("error")}
+    return jsonify(body), HTTPStatus.ACCEPTED if status == "pending" else HTTPStatus.OK
@@ -0,0 +1,85 @@
+import time
+
+import stripe
+
+from app.config import Config
+
+
+class PaymentError(Exception):
+    """Raised when a checkout session cannot be created.
+
+    Attributes:
+        retryable (bool): Whether the failure is transient and the call may be retried.
+    """
+
+    def __init__(self, message: str, retryable: bool = False):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class StripePaymentProvider:
+    """Create hosted checkout sessions with Stripe."""
+
+    # Failures worth retrying: network problems, rate limits and Stripe-side 5xx errors.
+    RETRYABLE_ERRORS = (stripe.error.APIConnectionError, stripe.error.RateLimitError, stripe.error.APIError)
+
+    def __init__(self, api_key: str, frontend_url: str):
+        self.api_key = api_key
+        self.frontend_url = frontend_url
+
+    def create_checkout_session(self, order_id: str, items: list[dict]):
+        try:
+            session = stripe.checkout.Session.create(
+                api_key=self.api_key,
+                payment_method_types=["card"],
+                line_items=[
+                    {
+                        "price_data": {
+                            "currency": item["currency"].lower(),
+                            "product_data": {"name": item["product_name"]},
+                            "unit_amount": int(item["amount"] * 100),
+                        },
+                        "quantity": item["quantity"],
+                    }
+                    for item in items
+                ],
+                mode="payment",
+                client_reference_id=order_id,
+                success_url=f"{self.frontend_url}/?checkout_complete=true",
+                cancel_url=f"{self.frontend_url}/cart",
+                locale="en",
+                idempotency_key=f"checkout-{order_id}",
+            )
+        except self.RETRYABLE_ERRORS as e:
+            raise PaymentError(f"Stripe error: {str(e)}", retryable=True) from e
+        except stripe.error.StripeError as e:
+            raise PaymentError(f"Stripe error: {str(e)}") from e
+
+        if not session.url:
+            raise PaymentError("Stripe session creation failed: no URL returned.")
+        return session.url
+
+
+class StubPaymentProvider:
+    """Local stand-in for tests and development that never leaves the process."""
+
+    def __init__(self, frontend_url: str, delay_ms: int = 0):
+        self.frontend_url = frontend_url
+        self.delay_ms = delay_ms
+
+    def create_checkout_session(self, order_id: str, items: list[dict]):
+        if self.delay_ms:
+            time.sleep(self.delay_ms / 1000)
+        return f"{self.frontend_url}/?checkout_complete=true&stub_order={order_id}"
+
+
+def get_payment_provider():
+    """
+    Build the payment provider selected by `Config.PAYMENT_PROVIDER`.
+
+    Returns:
+        StripePaymentProvider | StubPaymentProvider: The configured provider.
+    """
+    if Config.PAYMENT_PROVIDER == "stub":
+        return StubPaymentProvider(frontend_url=Config.FRONTEND_URL, delay_ms=Config.PAYMENT_STUB_DELAY_MS)
+    return StripePaymentProvider(api_key=Config.STRIPE_SECRET_KEY, frontend_url=Config.FRONTEND_URL)
@@ -1,9 +1,20 @@
 from datetime import datetime
 
-from app.extensions.mongo import get_mongo_db, parse_object_id
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+from app.extensions.mongo import get_mongo_db, iter_by_id, keyset_page, parse_object_id
 
 
 class OrdersRepository:
+    INDEXES = {
+        "orders": [
+            IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="orders_user_created_at"),
+        ],
+    }
+
+    # Fields clients may request through `?fields=`.
+    FIELDS = frozenset({"user_id", "product_ids", "name", "address", "payment", "created_at", "updated_at"})
+
     def __init__(self):
         pass
 
@@ -15,24 +26,50 @@ class OrdersRepository:
     def orders(self):
         return self.db.orders
 
-    def get_orders_for_user(self, user_id: str):
-        return list(self.orders.find({"user_id": parse_object_id(user_id)}).sort("created_at", -1))
+    def get_orders_for_user(self, user_id: str, limit: int = 50, cursor: str = None, projection: dict = None):
+        return keyset_page(self.orders, {"user_id": parse_object_id(user_id)}, limit=limit, cursor=cursor, projection=projection)
+
+    def iter_orders(self, projection: dict = None, after=None, batch_size: int = 1000):
+        return iter_by_id(self.orders, {}, projection, after=after, batch_size=batch_size)
 
     def get_order_by_id(self, user_id: str, order_id: str):
         return self.orders.find_one({"_id": parse_object_id(order_id), "user_id": parse_object_id(user_id)})
 
-    def create_order(self, user_id: str, product_ids: list[str], name: str, address: str):
+    @staticmethod
+    def build_order(user_id: str, product_ids: list[str], name: str, address: str):
         product_ids = product_ids or []
-        list_data = {
+        return {
             "user_id": parse_object_id(user_id),
             "product_ids": [parse_object_id(pid) for pid in product_ids],
             "name": name,
             "address": address,
+            "payment": {"status": "pending", "checkout_url": None, "error": None},
             "created_at": datetime.now(),
             "updated_at": datetime.now()
         }
-        inserted_id = self.orders.insert_one(list_data).inserted_id
-        return self.orders.find_one({"_id": inserted_id})
+
+    def create_order(self, user_id: str, product_ids: list[str], name: str, address: str):
+        order = self.build_order(user_id=user_id, product_ids=product_ids, name=name, address=address)
+        self.orders.insert_one(order)
+        return order
+
+    def get_payment_status(self, user_id: str, order_id: str):
+        order = self.orders.find_one(
+            {"_id": parse_object_id(order_id), "user_id": parse_object_id(user_id)},
+            {"payment": 1},
+        )
+        return order.get("payment", {}) if order else None
+
+    def set_payment_status(self, order_id: str, status: str, checkout_url: str = None, error: str = None):
+        # Only a pending order can be resolved, so a redelivered intent never overwrites a result.
+        result = self.orders.update_one(
+            {"_id": parse_object_id(order_id), "payment.status": "pending"},
+            {"$set": {
+                "payment": {"status": status, "checkout_url": checkout_url, "error": error},
+                "updated_at": datetime.now(),
+            }},
+        )
+        return result.modified_count > 0
 
     def delete_order(self, user_id: str, order_id: str):
         result = self.orders.delete_one({"_id": parse_object_id(order_id), "user_id": parse_object_id(user_id)})
@@ -1,21 +1,25 @@
-import stripe
+import time
 from http import HTTPStatus
-from flask import Blueprint, jsonify, request
-from pydantic import BaseModel, constr, confloat, conint, ValidationError, Field
+
+import click
+from flask import Blueprint, current_app, jsonify, request, url_for
+from pydantic import BaseModel, constr, confloat, conint, Field
+from redis.exceptions import RedisError
 
 from app.config import Config
-from app.extensions.mongo import serialize_document
-from app.auth import auth_required
+from app.extensions.mongo import InvalidCursor, build_projection, parse_page_params, serialize_document
+from app.extensions.export import EXPORT_FORMATS, DocumentExport, export_response, parse_export_args, write_export
+from app.extensions.redis import get_redis_client
+from app.extensions.validation import validate_body
+from app.auth import admin_required, auth_required
 from app.orders import OrdersRepository
+from app.orders.worker import CheckoutWorkerPool, enqueue_checkout, recover_checkouts, wait_for_checkout
 from app.utils import error_response
 
 orders_bp = Blueprint("orders", __name__)
 
 orders_repo = OrdersRepository()
 
-stripe.api_key = Config.STRIPE_SECRET_KEY
-FRONTEND_URL = Config.FRONTEND_URL
-
 
 class OrderCreateSchema(BaseModel):
     product_ids: list[str] = Field(default=[])
@@ -41,24 +45,49 @@ class OrderWithPaymentSchema(BaseModel):
 @auth_required
 def list_orders(user):
     try:
-        orders_cursor = orders_repo.get_orders_for_user(user_id=user["id"])
-        return jsonify([serialize_document(o) for o in orders_cursor]), HTTPStatus.OK
+        limit, cursor = parse_page_params(request.args)
+    except ValueError:
+        return error_response("invalid_limit", HTTPStatus.BAD_REQUEST)
+    try:
+        projection = build_projection(request.args.get("fields"), OrdersRepository.FIELDS)
+    except ValueError as e:
+        return error_response("invalid_fields", details=str(e))
+
+    try:
+        orders, next_cursor = orders_repo.get_orders_for_user(user_id=user["id"], limit=limit, cursor=cursor, projection=projection)
+        return jsonify({"items": [serialize_document(o) for o in orders], "next_cursor": next_cursor}), HTTPStatus.OK
+    except InvalidCursor:
+        return error_response("invalid_cursor", HTTPStatus.BAD_REQUEST)
     except Exception as e:
         return error_response("Database error", details=str(e), status=HTTPStatus.INTERNAL_SERVER_ERROR)
 
 
-@orders_bp.post("/")
-@auth_required
-def create_order_with_payment(user):
-    payload = request.get_json()
-    if payload is None:
-        return error_response("invalid_json")
+def _build_export(export_format: str, projection: dict, columns: list[str], after, gzip_level: int):
+    documents = orders_repo.iter_orders(projection=projection, after=after, batch_size=Config.EXPORT_BATCH_SIZE)
+    return DocumentExport(
+        documents,
+        export_format,
+        dumps=current_app.json.dumps_bytes,
+        columns=columns,
+        gzip_level=gzip_level,
+        chunk_bytes=Config.EXPORT_CHUNK_BYTES,
+    )
+
 
+@orders_bp.get("/export")
+@admin_required
+def export_orders(user):
     try:
-        data = OrderWithPaymentSchema(**payload)
-    except ValidationError as e:
-        return error_response("invalid_payload", details=e.errors(), status=HTTPStatus.BAD_REQUEST)
+        export_args = parse_export_args(request.args, OrdersRepository.FIELDS, Config.EXPORT_GZIP_LEVEL)
+    except ValueError as e:
+        return error_response(str(e), HTTPStatus.BAD_REQUEST)
+    return export_response(_build_export(*export_args), "orders")
+
 
+@orders_bp.post("/")
+@auth_required
+@validate_body(OrderWithPaymentSchema)
+def create_order_with_payment(user, data: OrderWithPaymentSchema):
     try:
         new_order = orders_repo.create_order(
             user_id=user["id"],
@@ -66,8 +95,84 @@ def create_order_with_payment(user):
             name=data.name,
             address=data.address,
         )
-        from app.orders.utils import create_stripe_session_with_rollback
-        session_url = create_stripe_session_with_rollback(user_id=user["id"], order_id=new_order["_id"], items=data.items)
-        return jsonify({"order_id": str(new_order["_id"]), "url": session_url}), HTTPStatus.CREATED
+        order_id = str(new_order["_id"])
     except Exception as e:
-        return error_response("Database error", details=str(e), status=HTTPStatus.INTERNAL_SERVER_ERROR)
\ No newline at end of file
+        return error_response("Database error", details=str(e), status=HTTPStatus.INTERNAL_SERVER_ERROR)
+
+    try:
+        enqueue_checkout(get_redis_client(), order_id=order_id, user_id=str(user["id"]), items=[item.model_dump() for item in data.items])
+    except Exception as e:
+        # No worker would ever resolve the order, so roll it back instead of leaving it pending.
+        orders_repo.delete_order(user_id=user["id"], order_id=order_id)
+        return error_response("Database error", details=str(e), status=HTTPStatus.INTERNAL_SERVER_ERROR)
+
+    return jsonify({
+        "order_id": order_id,
+        "status": "pending",
+        "status_url": url_for("orders.get_checkout_status", order_id=order_id),
+    }), HTTPStatus.ACCEPTED
+
+
+@orders_bp.get("/<order_id>/checkout")
+@auth_required
+def get_checkout_status(user, order_id: str):
+    try:
+        # A blocked wait holds a WSGI thread, so long polls are only served by the ASGI
+        # handler; here the wait is capped to a second or so and clients poll again.
+        wait = min(int(request.args.get("wait", 0)), Config.CHECKOUT_WSGI_POLL_MAX_WAIT_SECONDS)
+    except ValueError:
+        return error_response("invalid_wait", HTTPStatus.BAD_REQUEST)
+
+    payment = orders_repo.get_payment_status(user_id=user["id"], order_id=order_id)
+    if payment is None:
+        return error_response("order_not_found", HTTPStatus.NOT_FOUND)
+
+    if payment.get("status") == "pending" and wait > 0:
+        try:
+            finished = wait_for_checkout(get_redis_client(), order_id, timeout=wait)
+        except RedisError:
+            # Answer with the current status and let the client poll again.
+            finished = False
+        if finished:
+            payment = orders_repo.get_payment_status(user_id=user["id"], order_id=order_id)
+
+    status = payment.get("status", "unknown")
+    body = {"order_id": order_id, "status": status, "url": payment.get("checkout_url"), "error": payment.get("error")}
+    return jsonify(body), HTTPStatus.ACCEPTED if status == "pending" else HTTPStatus.OK
+
+
+@orders_bp.cli.command("checkout-worker")
+@click.option("--concurrency", type=int, default=None, help="Worker threads; defaults to CHECKOUT_WORKERS.")
+def checkout_worker(concurrency):
+    """Drain the checkout queue until interrupted."""
+    pool = CheckoutWorkerPool(current_app._get_current_object(), concurrency=concurrency)
+    recovered = pool.start()
+    print(f"Checkout worker running with {pool.concurrency} threads on {pool.queue} ({recovered} intents recovered).")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pool.stop()
+
+
+@orders_bp.cli.command("recover-checkouts")
+def recover_checkouts_command():
+    """Requeue every intent still being processed. Run while no workers are active."""
+    moved = recover_checkouts(get_redis_client())
+    print(f"{moved} checkout intents requeued.")
+
+
+@orders_bp.cli.command("export")
+@click.option("--format", "export_format", type=click.Choice(sorted(EXPORT_FORMATS)), default="ndjson")
+@click.option("--fields", default=None, help="Comma-separated fields to export; defaults to all.")
+@click.option("--after", default=None, help="Resume after this order id.")
+@click.option("--gzip", is_flag=True, help="Compress the output with gzip.")
+@click.option("--output", "-o", default="-", help="Output file, or - for stdout.")
+def export_orders_command(export_format, fields, after, gzip, output):
+    """Stream every order to NDJSON or CSV in `_id` order."""
+    args = {"format": export_format, "fields": fields, "after": after, "gzip": "1" if gzip else "0"}
+    try:
+        export_args = parse_export_args(args, OrdersRepository.FIELDS, Config.EXPORT_GZIP_LEVEL)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+    write_export(_build_export(*export_args), output)
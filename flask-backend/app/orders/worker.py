@@ -0,0 +1,274 @@
+import json
+import os
+import random
+import secrets
+import socket
+import threading
+import time
+from typing import Optional
+
+from flask import Flask
+from redis.exceptions import RedisError
+
+from app.config import Config
+from app.extensions.redis import get_redis_client
+from app.orders.payments import PaymentError, get_payment_provider
+from app.orders.respository import OrdersRepository
+
+
+def processing_key(queue: str, worker_id: Optional[str] = None):
+    # Without a worker id: the list shared by workers of earlier releases.
+    return f"{queue}:processing:{worker_id}" if worker_id else f"{queue}:processing"
+
+
+def workers_key(queue: str):
+    return f"{queue}:workers"
+
+
+def heartbeat_key(queue: str, worker_id: str):
+    return f"{queue}:heartbeat:{worker_id}"
+
+
+def done_key(order_id: str):
+    return f"checkout:done:{order_id}"
+
+
+def enqueue_checkout(redis_client, order_id: str, user_id: str, items: list[dict]):
+    """
+    Queue a checkout intent for the worker pool.
+
+    Args:
+        redis_client (redis.Redis): Redis client.
+        order_id (str): The pending order.
+        user_id (str): Owner of the order.
+        items (list[dict]): Line items as plain dicts.
+    """
+    intent = json.dumps({"order_id": order_id, "user_id": user_id, "items": items}, separators=(",", ":"))
+    redis_client.lpush(Config.CHECKOUT_QUEUE, intent)
+
+
+def wait_for_checkout(redis_client, order_id: str, timeout: int):
+    """
+    Block until a worker signals that `order_id` was resolved or `timeout` elapses.
+
+    Args:
+        redis_client (redis.Redis): Redis client.
+        order_id (str): The order to wait for.
+        timeout (int): Maximum seconds to block.
+
+    Returns:
+        bool: True if a completion signal arrived.
+    """
+    key = done_key(order_id)
+    signal = redis_client.blpop([key], timeout=timeout)
+    if signal:
+        # Put the signal back so concurrent pollers of the same order are woken too.
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.rpush(key, signal[1])
+        pipe.expire(key, Config.CHECKOUT_RESULT_TTL_SECONDS)
+        pipe.execute()
+    return signal is not None
+
+
+def process_checkout_intent(intent: dict, provider, orders_repo: OrdersRepository, redis_client=None, sleep=time.sleep):
+    """
+    Create the payment session for one intent, retrying transient provider failures.
+
+    Args:
+        intent (dict): Decoded intent with `order_id`, `user_id` and `items`.
+        provider: Payment provider exposing `create_checkout_session`.
+        orders_repo (OrdersRepository): Repository used to record the outcome.
+        redis_client (redis.Redis, optional): If given, pollers are signalled on completion.
+        sleep (callable): Sleep function, replaceable in tests.
+
+    Returns:
+        dict[str, any]: The recorded payment status.
+    """
+    order_id = intent["order_id"]
+    status = {"status": "failed", "checkout_url": None, "error": None}
+    for attempt in range(1, Config.CHECKOUT_MAX_ATTEMPTS + 1):
+        try:
+            status = {"status": "ready", "checkout_url": provider.create_checkout_session(order_id, intent["items"]), "error": None}
+            break
+        except PaymentError as e:
+            status["error"] = str(e)
+            if not e.retryable or attempt == Config.CHECKOUT_MAX_ATTEMPTS:
+                break
+            backoff = Config.CHECKOUT_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1)
+            sleep(backoff + random.uniform(0, backoff))
+
+    orders_repo.set_payment_status(order_id, **status)
+    if redis_client is not None:
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.rpush(done_key(order_id), status["status"])
+        pipe.expire(done_key(order_id), Config.CHECKOUT_RESULT_TTL_SECONDS)
+        pipe.execute()
+    return status
+
+
+def recover_checkouts(redis_client, queue: str = None, stale_only: bool = False):
+    """
+    Move intents left in processing lists by crashed workers back onto the queue.
+
+    Every worker process has its own processing list and keeps a heartbeat key alive
+    while it runs. With `stale_only`, only the lists of workers whose heartbeat has
+    expired are recovered, which is safe while other workers are running; every
+    `CheckoutWorkerPool` does this when it starts. Otherwise all lists are recovered,
+    which is only safe while no workers are consuming `queue`.
+
+    Args:
+        redis_client (redis.Redis): Redis client.
+        queue (str, optional): Queue name. Defaults to `Config.CHECKOUT_QUEUE`.
+        stale_only (bool): Skip the lists of workers that are still alive.
+
+    Returns:
+        int: Number of intents requeued.
+    """
+    queue = queue or Config.CHECKOUT_QUEUE
+    worker_ids = sorted(redis_client.smembers(workers_key(queue)))
+    if stale_only:
+        beats = redis_client.mget([heartbeat_key(queue, worker_id) for worker_id in worker_ids]) if worker_ids else []
+        worker_ids = [worker_id for worker_id, beat in zip(worker_ids, beats) if beat is None]
+        lists = [processing_key(queue, worker_id) for worker_id in worker_ids]
+    else:
+        lists = [processing_key(queue)] + [processing_key(queue, worker_id) for worker_id in worker_ids]
+
+    moved = 0
+    for key in lists:
+        while redis_client.lmove(key, queue, "RIGHT", "RIGHT"):
+            moved += 1
+    if worker_ids:
+        redis_client.srem(workers_key(queue), *worker_ids)
+    return moved
+
+
+class CheckoutWorkerPool:
+    """Fixed-size pool of threads draining the checkout queue.
+
+    Each worker atomically moves an intent to the pool's own processing list with
+    `BLMOVE`, and removes it once the outcome is recorded. An intent whose processing
+    raises is requeued, and after `CHECKOUT_MAX_ATTEMPTS` such failures its order is
+    marked failed. If the process dies mid-call, its heartbeat expires and the next
+    pool to start requeues whatever its list still holds. The pool size bounds
+    concurrent calls to the provider.
+    """
+
+    def __init__(self, app: Flask, concurrency: int = None, provider=None, queue: str = None):
+        self.app = app
+        self.concurrency = concurrency or Config.CHECKOUT_WORKERS
+        self.provider = provider or get_payment_provider()
+        self.queue = queue or Config.CHECKOUT_QUEUE
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{secrets.token_hex(4)}"
+        self.processing = processing_key(self.queue, self.worker_id)
+        self.heartbeat_seconds = Config.CHECKOUT_WORKER_HEARTBEAT_SECONDS
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def start(self):
+        """
+        Register the pool, requeue intents of crashed workers and start the threads.
+
+        Returns:
+            int: Number of intents recovered from crashed workers.
+        """
+        with self.app.app_context():
+            redis_client = get_redis_client()
+            # Registered with a live heartbeat, so a pool starting concurrently cannot
+            # mistake this one for a crashed worker.
+            self._beat(redis_client)
+            recovered = recover_checkouts(redis_client, self.queue, stale_only=True)
+
+        targets = [(f"checkout-worker-{i}", self._run) for i in range(self.concurrency)]
+        targets.append(("checkout-heartbeat", self._heartbeat))
+        for name, target in targets:
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return recovered
+
+    def stop(self, timeout: float = None):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        # Anything still in the processing list is picked up by the next pool to start.
+        with self.app.app_context():
+            try:
+                get_redis_client().delete(heartbeat_key(self.queue, self.worker_id))
+            except RedisError:
+                pass
+
+    def _beat(self, redis_client):
+        pipe = redis_client.pipeline(transaction=True)
+        pipe.set(heartbeat_key(self.queue, self.worker_id), "1", ex=3 * self.heartbeat_seconds)
+        pipe.sadd(workers_key(self.queue), self.worker_id)
+        pipe.execute()
+
+    def _heartbeat(self):
+        with self.app.app_context():
+            redis_client = get_redis_client()
+            while not self._stop.wait(self.heartbeat_seconds):
+                try:
+                    self._beat(redis_client)
+                except RedisError as e:
+                    self.app.logger.warning("Checkout worker heartbeat failed: %s", e)
+
+    def _run(self):
+        with self.app.app_context():
+            redis_client = get_redis_client()
+            orders_repo = OrdersRepository()
+            while not self._stop.is_set():
+                try:
+                    raw = redis_client.blmove(self.queue, self.processing, timeout=1, src="RIGHT", dest="LEFT")
+                except RedisError:
+                    self._stop.wait(1.0)
+                    continue
+                if raw is None:
+                    continue
+
+                done = False
+                try:
+                    process_checkout_intent(json.loads(raw), self.provider, orders_repo, redis_client)
+                    done = True
+                except Exception as e:
+                    self.app.logger.exception("Checkout intent failed: %s", e)
+                finally:
+                    self._settle(redis_client, orders_repo, raw, done)
+
+    def _settle(self, redis_client, orders_repo: OrdersRepository, raw: str, done: bool):
+        """Take an intent off the processing list, requeueing it if it did not complete."""
+        retry = None if done else self._retry(redis_client, orders_repo, raw)
+        try:
+            pipe = redis_client.pipeline(transaction=True)
+            pipe.lrem(self.processing, 1, raw)
+            if retry is not None:
+                pipe.lpush(self.queue, retry)
+            pipe.execute()
+        except RedisError as e:
+            # Still in the processing list, so it is recovered once this worker is gone.
+            self.app.logger.warning("Could not settle checkout intent: %s", e)
+
+    def _retry(self, redis_client, orders_repo: OrdersRepository, raw: str):
+        """The intent to requeue after a failure, or None once it should be given up."""
+        try:
+            intent = json.loads(raw)
+            order_id = intent["order_id"]
+        except (ValueError, TypeError, KeyError):
+            self.app.logger.error("Dropping malformed checkout intent: %r", raw)
+            return None
+
+        intent["failures"] = intent.get("failures", 0) + 1
+        if intent["failures"] < Config.CHECKOUT_MAX_ATTEMPTS:
+            backoff = Config.CHECKOUT_RETRY_BACKOFF_SECONDS * 2 ** (intent["failures"] - 1)
+            self._stop.wait(backoff + random.uniform(0, backoff))
+            return json.dumps(intent, separators=(",", ":"))
+
+        try:
+            orders_repo.set_payment_status(order_id, status="failed", checkout_url=None, error="checkout_error")
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.rpush(done_key(order_id), "failed")
+            pipe.expire(done_key(order_id), Config.CHECKOUT_RESULT_TTL_SECONDS)
+            pipe.execute()
+        except Exception as e:
+            self.app.logger.exception("Could not mark order %s failed: %s", order_id, e)
+        return None
@@ -1 +1,2 @@
 from .repository import ProductsRepository
+from .loader import ProductBatchLoader, get_product_loader
@@ -0,0 +1,159 @@
+from datetime import datetime
+
+from pymongo import ReturnDocument
+from pymongo.errors import OperationFailure
+from quart import current_app
+
+from app.extensions.mongo import keyset_page_async, parse_object_id, serialize_document
+from app.extensions.mongo.async_client import get_async_mongo_db
+from app.extensions.redis.async_client import get_async_redis_client
+from app.products.cache import pack_entry, product_cache, unpack_entry
+from app.products.repository import PRIVATE_FIELDS_PROJECTION, ProductsRepository
+from app.products.reviews import REVIEW_SORTS, review_stats_update
+from app.products.search import fallback_search_filter, is_missing_text_index
+
+
+class AsyncProductsRepository:
+    """`ProductsRepository` on the async MongoDB client.
+
+    Reads and writes share the product cache entries of the sync repository, and
+    writes invalidate them through the async Redis client. Exports, bulk imports and
+    the review rebuild are batch jobs and stay on the sync repository.
+    """
+
+    def __init__(self):
+        pass
+
+    @property
+    def db(self):
+        return get_async_mongo_db()
+
+    @property
+    def products(self):
+        return self.db.products
+
+    @property
+    def product_reviews(self):
+        return self.db.reviews
+
+    async def list_products(self, query: str = "", ids: list[str] = None, limit: int = 50, cursor: str = None, projection: dict = None):
+        """Same contract as `ProductsRepository.list_products`."""
+        projection = projection or PRIVATE_FIELDS_PROJECTION
+        if ids:
+            ids_list = [parse_object_id(pid) for pid in ids]
+            ids_list = [i for i in ids_list if i]
+            if not ids_list:
+                return [], None
+            products = self.products.find({"_id": {"$in": ids_list}}, projection).sort("created_at", -1)
+            return await products.limit(limit).to_list(), None
+
+        if query:
+            scored = {**projection, "score": {"$meta": "textScore"}}
+            products = self.products.find({"$text": {"$search": query}}, scored).sort([("score", {"$meta": "textScore"}), ("created_at", -1)])
+            try:
+                return await products.limit(limit).to_list(), None
+            except OperationFailure as e:
+                if not is_missing_text_index(e):
+                    raise
+            products = self.products.find(fallback_search_filter(query), projection).sort("created_at", -1)
+            return await products.limit(limit).to_list(), None
+
+        return await keyset_page_async(self.products, {}, limit=limit, cursor=cursor, projection=projection)
+
+    async def get_product_by_id(self, product_id: str, projection: dict = None):
+        return await self.products.find_one({"_id": parse_object_id(product_id)}, projection or PRIVATE_FIELDS_PROJECTION)
+
+    async def get_product_version(self, product_id: str):
+        return await self.products.find_one({"_id": parse_object_id(product_id)}, {"updated_at": 1})
+
+    async def get_products_by_ids(self, product_ids: list, projection: dict = None):
+        """Fetch products matching any of the given ObjectIds with a single `$in` query, in no particular order."""
+        return await self.products.find({"_id": {"$in": product_ids}}, projection or PRIVATE_FIELDS_PROJECTION).to_list()
+
+    async def get_product_json(self, product_id: str):
+        """`ProductsRepository.get_product_json`: the JSON body and `updated_at`, or None."""
+        object_id = parse_object_id(product_id)
+        if not object_id:
+            return None
+
+        async def load():
+            product = await self.products.find_one({"_id": object_id}, PRIVATE_FIELDS_PROJECTION)
+            if not product:
+                return None
+            return pack_entry(current_app.json.dumps(serialize_document(product)), product.get("updated_at"))
+
+        entry = await product_cache.get_async(get_async_redis_client(), str(object_id), load)
+        return unpack_entry(entry) if entry is not None else None
+
+    async def get_product_reviews(self, product_id: str, sort: str = "recent", limit: int = 10, cursor: str = None):
+        query = {"product_id": parse_object_id(product_id)}
+        return await keyset_page_async(self.product_reviews, query, limit=limit, cursor=cursor, sort=REVIEW_SORTS[sort])
+
+    async def _shift_review_stats(self, product_id, count: int = 0, total: int = 0, histogram: dict[int, int] = None):
+        result = await self.products.update_one({"_id": product_id}, review_stats_update(count, total, histogram))
+        await product_cache.invalidate_async(get_async_redis_client(), str(product_id))
+        return result.matched_count > 0
+
+    async def create_review(self, user_id: str, product_id: str, review_data: dict):
+        """Same contract as `ProductsRepository.create_review`."""
+        review = {
+            **review_data,
+            "product_id": parse_object_id(product_id),
+            "user_id": parse_object_id(user_id),
+            "created_at": datetime.now(),
+            "updated_at": datetime.now(),
+        }
+        await self.product_reviews.insert_one(review)
+        rating = review["rating"]
+        if not await self._shift_review_stats(review["product_id"], count=1, total=rating, histogram={rating: 1}):
+            await self.product_reviews.delete_one({"_id": review["_id"]})
+            return None
+        return review
+
+    async def update_review(self, user_id: str, product_id: str, review_id: str, updates: dict):
+        updates["updated_at"] = datetime.now()
+        previous = await self.product_reviews.find_one_and_update(
+            {"_id": parse_object_id(review_id), "product_id": parse_object_id(product_id), "user_id": parse_object_id(user_id)},
+            {"$set": updates},
+            return_document=ReturnDocument.BEFORE,
+        )
+        if not previous:
+            return None
+        old_rating, new_rating = previous["rating"], updates.get("rating", previous["rating"])
+        if new_rating != old_rating:
+            await self._shift_review_stats(previous["product_id"], total=new_rating - old_rating, histogram={old_rating: -1, new_rating: 1})
+        return {**previous, **updates}
+
+    async def delete_review(self, user_id: str, product_id: str, review_id: str):
+        review = await self.product_reviews.find_one_and_delete(
+            {"_id": parse_object_id(review_id), "product_id": parse_object_id(product_id), "user_id": parse_object_id(user_id)},
+        )
+        if not review:
+            return False
+        rating = review["rating"]
+        await self._shift_review_stats(review["product_id"], count=-1, total=-rating, histogram={rating: -1})
+        return True
+
+    async def create_product(self, user_id: str, product_data: dict):
+        product_data = ProductsRepository.build_product(user_id, product_data)
+        inserted_id = (await self.products.insert_one(product_data)).inserted_id
+        await product_cache.invalidate_async(get_async_redis_client(), str(inserted_id))
+        return {k: v for k, v in product_data.items() if k not in PRIVATE_FIELDS_PROJECTION}
+
+    async def update_product(self, user_id: str, product_id: str, updates: dict):
+        updates = ProductsRepository.build_updates(updates)
+        product = await self.products.find_one_and_update(
+            {"_id": parse_object_id(product_id), "user_id": parse_object_id(user_id)},
+            {"$set": updates},
+            projection=PRIVATE_FIELDS_PROJECTION,
+            return_document=ReturnDocument.AFTER,
+        )
+        if product:
+            await product_cache.invalidate_async(get_async_redis_client(), str(product["_id"]))
+        return product
+
+    async def delete_product(self, user_id: str, product_id: str):
+        result = await self.products.delete_one({"_id": parse_object_id(product_id), "user_id": parse_object_id(user_id)})
+        if result.deleted_count:
+            await product_cache.invalidate_async(get_async_redis_client(), str(parse_object_id(product_id)))
+        return result.deleted_count > 0
@@ -0,0 +1,168 @@
+from http import HTTPStatus
+
+from pymongo.errors import DuplicateKeyError
+from quart import Blueprint, current_app, jsonify, request
+
+from app.asgi.auth import auth_required
+from app.config import Config
+from app.extensions.http_cache import (
+    cache_control,
+    check_not_modified_async,
+    conditional_response_async,
+    document_response_async,
+    version_etag,
+    with_updated_at,
+)
+from app.extensions.mongo import InvalidCursor, build_projection, parse_page_params, serialize_document, serialize_id
+from app.extensions.validation import validate_body
+from app.products import ProductsRepository
+from app.products.async_repository import AsyncProductsRepository
+from app.products.reviews import REVIEW_SORTS
+from app.products.routes import ProductCreateSchema, ProductUpdateSchema, ReviewCreateSchema, ReviewUpdateSchema
+from app.utils import error_response
+
+# Same name as the sync blueprint, so endpoints line up with `products_bp`.
+products_bp = Blueprint("products", __name__)
+
+products_repo = AsyncProductsRepository()
+
+
+@products_bp.get("/", strict_slashes=False)
+@cache_control(Config.CACHE_CONTROL_CATALOG)
+async def list_products():
+    query_param = request.args.get("query", "").strip()
+    ids_param = request.args.get("ids", "").strip()
+    try:
+        limit, cursor = parse_page_params(request.args)
+    except ValueError:
+        return error_response("invalid_limit", HTTPStatus.BAD_REQUEST)
+    try:
+        projection = build_projection(request.args.get("fields"), ProductsRepository.FIELDS, ProductsRepository.FIELD_PRESETS)
+    except ValueError as e:
+        return error_response("invalid_fields", details=str(e))
+
+    ids_list = ids_param.split(",") if ids_param else None
+    try:
+        products, next_cursor = await products_repo.list_products(query=query_param, ids=ids_list, limit=limit, cursor=cursor, projection=projection)
+        return await conditional_response_async(jsonify({"items": [serialize_document(p) for p in products], "next_cursor": next_cursor}))
+    except InvalidCursor:
+        return error_response("invalid_cursor", HTTPStatus.BAD_REQUEST)
+    except Exception as e:
+        return error_response("Database error", details=str(e), status=HTTPStatus.INTERNAL_SERVER_ERROR)
+
+
+@products_bp.get("/<product_id>")
+@cache_control(Config.CACHE_CONTROL_CATALOG)
+async def get_product(product_id: str):
+    try:
+        projection = build_projection(request.args.get("fields"), ProductsRepository.FIELDS, ProductsRepository.FIELD_PRESETS)
+    except ValueError as e:
+        return error_response("invalid_fields", details=str(e))
+
+    if projection:
+        response = await check_not_modified_async(lambda: products_repo.get_product_version(product_id=product_id))
+        if response:
+            return response
+        projection, strip_updated_at = with_updated_at(projection)
+        product = await products_repo.get_product_by_id(product_id=product_id, projection=projection)
+        if not product:
+            return error_response("product_not_found", HTTPStatus.NOT_FOUND)
+        return await document_response_async(product, strip_updated_at=strip_updated_at)
+
+    cached = await products_repo.get_product_json(product_id=product_id)
+    if cached is None:
+        return error_response("product_not_found", HTTPStatus.NOT_FOUND)
+    # The cache entry carries `updated_at` next to the body, so conditional requests are
+    # answered without parsing it; a product without one gets a strong ETag of the body.
+    product_json, updated_at = cached
+    etag = version_etag(product_id, updated_at, request.query_string) if updated_at else None
+    response = current_app.response_class(product_json, status=HTTPStatus.OK, mimetype="application/json")
+    return await conditional_response_async(response, etag, updated_at)
+
+
+@products_bp.get("/<product_id>/reviews")
+@cache_control(Config.CACHE_CONTROL_CATALOG)
+async def get_product_reviews(product_id: str):
+    sort = request.args.get("sort", "recent")
+    if sort not in REVIEW_SORTS:
+        return error_response("invalid_sort", HTTPStatus.BAD_REQUEST)
+    try:
+        limit, cursor = parse_page_params(request.args)
+    except ValueError:
+        return error_response("invalid_limit", HTTPStatus.BAD_REQUEST)
+
+    try:
+        reviews, next_cursor = await products_repo.get_product_reviews(product_id=product_id, sort=sort, limit=limit, cursor=cursor)
+    except InvalidCursor:
+        return error_response("invalid_cursor", HTTPStatus.BAD_REQUEST)
+    return await conditional_response_async(jsonify({"items": serialize_document(reviews), "next_cursor": next_cursor}))
+
+
+@products_bp.post("/<product_id>/reviews")
+@auth_required
+@validate_body(ReviewCreateSchema)
+async def create_product_review(user, product_id: str, data: ReviewCreateSchema):
+    try:
+        review = await products_repo.create_review(user_id=user["id"], product_id=product_id, review_data=data.model_dump())
+    except DuplicateKeyError:
+        return error_response("review_exists", HTTPStatus.CONFLICT)
+    if not review:
+        return error_response("product_not_found", HTTPStatus.NOT_FOUND)
+    return jsonify(serialize_document(review)), HTTPStatus.CREATED
+
+
+@products_bp.put("/<product_id>/reviews/<review_id>")
+@auth_required
+@validate_body(ReviewUpdateSchema)
+async def update_product_review(user, product_id: str, review_id: str, data: ReviewUpdateSchema):
+    updates = data.model_dump(exclude_none=True)
+    if not updates:
+        return error_response("no_updates_provided")
+
+    review = await products_repo.update_review(user_id=user["id"], product_id=product_id, review_id=review_id, updates=updates)
+    if not review:
+        return error_response("review_not_found", HTTPStatus.NOT_FOUND)
+    return jsonify(serialize_document(review)), HTTPStatus.OK
+
+
+@products_bp.delete("/<product_id>/reviews/<review_id>")
+@auth_required
+async def delete_product_review(user, product_id: str, review_id: str):
+    deleted = await products_repo.delete_review(user_id=user["id"], product_id=product_id, review_id=review_id)
+    if not deleted:
+        return error_response("review_not_found", HTTPStatus.NOT_FOUND)
+    return jsonify({"deleted": True, "review_id": serialize_id(review_id)}), HTTPStatus.OK
+
+
+@products_bp.post("/")
+@auth_required
+@validate_body(ProductCreateSchema)
+async def create_product(user, data: ProductCreateSchema):
+    try:
+        product = await products_repo.create_product(user_id=user["id"], product_data=data.model_dump())
+        return jsonify(serialize_document(product)), HTTPStatus.CREATED
+    except Exception as e:
+        return error_response("Database error", details=str(e), status=HTTPStatus.INTERNAL_SERVER_ERROR)
+
+
+@products_bp.put("/<product_id>")
+@auth_required
+@validate_body(ProductUpdateSchema)
+async def update_product(user, product_id: str, data: ProductUpdateSchema):
+    updates = {k: v for k, v in data.model_dump(exclude_unset=True).items()}
+    if not updates:
+        return error_response("no_updates_provided")
+
+    product = await products_repo.update_product(user_id=user["id"], product_id=product_id, updates=updates)
+    if not product:
+        return error_response("product_not_found", HTTPStatus.NOT_FOUND)
+    return jsonify(serialize_document(product)), HTTPStatus.OK
+
+
+@products_bp.delete("/<product_id>")
+@auth_required
+async def delete_product(user, product_id: str):
+    deleted = await products_repo.delete_product(user_id=user["id"], product_id=product_id)
+    if not deleted:
+        return error_response("product_not_found", HTTPStatus.NOT_FOUND)
+    return jsonify({"deleted": True, "product_id": serialize_id(product_id)}), HTTPStatus.OK
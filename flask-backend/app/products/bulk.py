@@ -0,0 +1,154 @@
+import time
+from itertools import islice
+from typing import Iterable
+
+import orjson
+from pydantic import BaseModel, ValidationError
+from pymongo import InsertOne, UpdateOne
+
+from app.config import Config
+from app.extensions.mongo import parse_object_id
+from app.products.cache import product_cache
+from app.products.repository import ProductsRepository
+
+
+class BulkImportReport:
+    """Running totals and per-row errors of one bulk import."""
+
+    def __init__(self, max_errors: int = None):
+        self.max_errors = max_errors or Config.PRODUCT_BULK_MAX_ERRORS
+        self.rows = 0
+        self.inserted = 0
+        self.updated = 0
+        self.failed = 0
+        self.errors: list[dict] = []
+        self._started = time.perf_counter()
+
+    def add_error(self, line: int, error: str, details: any = None):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            entry = {"line": line, "error": error}
+            if details:
+                entry["details"] = details
+            self.errors.append(entry)
+
+    def to_dict(self):
+        elapsed = time.perf_counter() - self._started
+        return {
+            "rows": self.rows,
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+            "elapsed_ms": round(elapsed * 1000, 1),
+            "rows_per_second": round(self.rows / elapsed) if elapsed else None,
+        }
+
+
+def iter_ndjson_lines(stream):
+    """
+    Yield `(line_number, raw_line)` for every non-blank line of an NDJSON stream.
+
+    Args:
+        stream: A binary file-like object, read incrementally.
+    """
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if line:
+            yield line_number, line
+
+
+def import_products(
+    repository: ProductsRepository,
+    user_id: str,
+    lines: Iterable[tuple[int, bytes]],
+    create_schema: type[BaseModel],
+    update_schema: type[BaseModel],
+    batch_size: int = None,
+):
+    """
+    Validate and write a stream of product rows in batches.
+
+    Rows without an `id` are created with `create_schema`; rows with an `id` update
+    that product with `update_schema`, and only products owned by `user_id` can be
+    updated. Every batch costs one ownership lookup (if it contains updates), one
+    unordered `bulk_write` and one cache invalidation pipeline.
+
+    Args:
+        repository (ProductsRepository): The products repository.
+        user_id (str): The importing user.
+        lines (Iterable[tuple[int, bytes]]): `(line_number, raw_json)` pairs.
+        create_schema (type[BaseModel]): Schema for new products.
+        update_schema (type[BaseModel]): Schema for updates.
+        batch_size (int, optional): Rows per write. Defaults to `Config.PRODUCT_BULK_BATCH_SIZE`.
+
+    Returns:
+        BulkImportReport: Counts and per-row errors.
+    """
+    batch_size = batch_size or Config.PRODUCT_BULK_BATCH_SIZE
+    report = BulkImportReport()
+    lines = iter(lines)
+    while batch := list(islice(lines, batch_size)):
+        report.rows += len(batch)
+        _import_batch(repository, user_id, batch, create_schema, update_schema, report)
+    return report
+
+
+def _import_batch(repository, user_id, batch, create_schema, update_schema, report):
+    operations, operation_lines, updates, updated_ids = [], [], [], []
+
+    for line_number, raw in batch:
+        try:
+            row = orjson.loads(raw)
+        except orjson.JSONDecodeError as e:
+            report.add_error(line_number, "invalid_json", str(e))
+            continue
+        if not isinstance(row, dict):
+            report.add_error(line_number, "invalid_json", "row must be a JSON object")
+            continue
+
+        product_id = row.pop("id", None)
+        try:
+            if product_id is None:
+                data = create_schema.model_validate(row).model_dump()
+            else:
+                data = update_schema.model_validate(row).model_dump(exclude_unset=True)
+        except ValidationError as e:
+            report.add_error(line_number, "invalid_payload", e.errors(include_url=False, include_context=False, include_input=False))
+            continue
+
+        if product_id is None:
+            operations.append(InsertOne(repository.build_product(user_id, data)))
+            operation_lines.append(line_number)
+            continue
+
+        object_id = parse_object_id(product_id)
+        if not object_id:
+            report.add_error(line_number, "invalid_product_id")
+        elif not data:
+            report.add_error(line_number, "no_updates_provided")
+        else:
+            updates.append((line_number, object_id, data))
+
+    if updates:
+        owned = repository.get_owned_product_ids(user_id, [object_id for _, object_id, _ in updates])
+        for line_number, object_id, data in updates:
+            if object_id not in owned:
+                report.add_error(line_number, "product_not_found")
+                continue
+            operations.append(UpdateOne({"_id": object_id}, {"$set": repository.build_updates(data)}))
+            operation_lines.append(line_number)
+            updated_ids.append(str(object_id))
+
+    if not operations:
+        return
+
+    inserted, matched, write_errors = repository.bulk_write_products(operations)
+    report.inserted += inserted
+    report.updated += matched
+    for error in write_errors:
+        report.add_error(operation_lines[error["index"]], "write_error", error.get("errmsg"))
+
+    # Inserted ids are freshly generated, so only updated products can be cached.
+    product_cache.invalidate(*updated_ids)
@@ -0,0 +1,318 @@
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Awaitable, Callable, Optional
+
+from redis.exceptions import RedisError
+
+from app.config import Config
+from app.extensions.redis import get_redis_client
+
+NOT_FOUND = ""
+
+
+def pack_entry(body: str, updated_at: Optional[datetime]):
+    """
+    Prefix a product's JSON body with its `updated_at`, so conditional requests can be
+    answered from the cache entry without parsing the body.
+
+    Args:
+        body (str): The serialized product.
+        updated_at (Optional[datetime]): The product's modification time, if it has one.
+
+    Returns:
+        str: The cache entry.
+    """
+    return f"{updated_at.isoformat() if updated_at else ''}\n{body}"
+
+
+def unpack_entry(entry: str):
+    """
+    Split a cache entry from `pack_entry` into the body and its `updated_at`.
+
+    Args:
+        entry (str): The cache entry.
+
+    Returns:
+        tuple[str, Optional[datetime]]: The JSON body, and its `updated_at` or None when
+            the product has none.
+    """
+    stamp, separator, body = entry.partition("\n")
+    if not separator:
+        # Entries written before the timestamp was stored hold only the (single-line) body.
+        return entry, None
+    return body, datetime.fromisoformat(stamp) if stamp else None
+
+# Only populate the cache if no writer has bumped the version since the reader
+# sampled it, so a slow reader can never overwrite the result of a newer write.
+SET_IF_VERSION_LUA = """
+local current = redis.call('GET', KEYS[1]) or '0'
+if current == ARGV[1] then
+    redis.call('SET', KEYS[2], ARGV[2], 'EX', ARGV[3])
+    return 1
+end
+return 0
+"""
+
+# Release the fill lock only if it still holds this loader's token: a loader that ran
+# past the lock timeout must not delete a lock another process has since taken.
+RELEASE_LOCK_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class ProductCache:
+    """Two-level read-through cache of serialized product documents.
+
+    L1 is a small in-process LRU with a short TTL; L2 is Redis, holding the entry from
+    `pack_entry` under `product:<id>` next to a `product_version:<id>` generation counter that every
+    write increments. Concurrent misses for the same product are coalesced per process,
+    and across processes through a short-lived Redis lock.
+
+    Writes drop L1 only in the process that made them. Other workers keep serving their
+    L1 copy until it expires, so reads may be up to `l1_ttl_seconds` (2s by default)
+    stale after a write.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int,
+        not_found_ttl_seconds: int,
+        l1_ttl_seconds: float,
+        l1_max_entries: int,
+        lock_timeout_ms: int,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.not_found_ttl_seconds = not_found_ttl_seconds
+        self.l1_ttl_seconds = l1_ttl_seconds
+        self.l1_max_entries = l1_max_entries
+        self.lock_timeout_ms = lock_timeout_ms
+        self._l1: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._l1_lock = threading.Lock()
+        self._inflight: dict[str, list] = {}
+        self._inflight_lock = threading.Lock()
+        self._set_if_version = None
+        self._release_lock = None
+        self._set_if_version_async = None
+        self._async_client = None
+
+    @staticmethod
+    def _data_key(product_id: str):
+        return f"product:{product_id}"
+
+    @staticmethod
+    def _version_key(product_id: str):
+        return f"product_version:{product_id}"
+
+    @staticmethod
+    def _lock_key(product_id: str):
+        return f"product_lock:{product_id}"
+
+    def _l1_get(self, product_id: str):
+        with self._l1_lock:
+            entry = self._l1.get(product_id)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._l1[product_id]
+                return None
+            self._l1.move_to_end(product_id)
+            return entry[1]
+
+    def _l1_set(self, product_id: str, body: str):
+        with self._l1_lock:
+            self._l1[product_id] = (time.monotonic() + self.l1_ttl_seconds, body)
+            self._l1.move_to_end(product_id)
+            while len(self._l1) > self.l1_max_entries:
+                self._l1.popitem(last=False)
+
+    def _l1_discard(self, product_id: str):
+        with self._l1_lock:
+            self._l1.pop(product_id, None)
+
+    def get(self, product_id: str, loader: Callable[[], Optional[str]]):
+        """
+        Return the serialized product, loading it through `loader` on a miss.
+
+        Args:
+            product_id (str): The product id.
+            loader (Callable[[], Optional[str]]): Returns the JSON body from the database,
+                or None if the product does not exist.
+
+        Returns:
+            Optional[str]: The JSON body, or None if the product does not exist.
+        """
+        body = self._l1_get(product_id)
+        if body is None:
+            with self._inflight_lock:
+                inflight = self._inflight.setdefault(product_id, [threading.Lock(), 0])
+                inflight[1] += 1
+            try:
+                with inflight[0]:
+                    # Another thread may have filled L1 while we waited.
+                    body = self._l1_get(product_id)
+                    if body is None:
+                        body = self._load_from_redis(product_id, loader)
+                        self._l1_set(product_id, body)
+            finally:
+                with self._inflight_lock:
+                    inflight[1] -= 1
+                    if inflight[1] == 0:
+                        self._inflight.pop(product_id, None)
+        return body if body != NOT_FOUND else None
+
+    def _load_from_redis(self, product_id: str, loader: Callable[[], Optional[str]]):
+        version = token = None
+        try:
+            redis_client = get_redis_client()
+            body = redis_client.get(self._data_key(product_id))
+            if body is not None:
+                return body
+
+            token = secrets.token_hex(16)
+            if not redis_client.set(self._lock_key(product_id), token, nx=True, px=self.lock_timeout_ms):
+                token = None
+                body = self._wait_for_fill(redis_client, product_id)
+                if body is not None:
+                    return body
+
+            version = redis_client.get(self._version_key(product_id)) or "0"
+        except RedisError:
+            pass
+
+        try:
+            body = loader()
+            body = body if body is not None else NOT_FOUND
+            if version is not None:
+                self._fill(redis_client, product_id, version, body)
+            return body
+        finally:
+            # Released even when the loader raises, so other processes do not wait out the timeout.
+            if token is not None:
+                self._unlock(redis_client, product_id, token)
+
+    def _fill(self, redis_client, product_id: str, version: str, body: str):
+        try:
+            if self._set_if_version is None:
+                self._set_if_version = redis_client.register_script(SET_IF_VERSION_LUA)
+            self._set_if_version(
+                keys=[self._version_key(product_id), self._data_key(product_id)],
+                args=[version, body, self.ttl_seconds if body != NOT_FOUND else self.not_found_ttl_seconds],
+                client=redis_client,
+            )
+        except RedisError:
+            pass
+
+    def _unlock(self, redis_client, product_id: str, token: str):
+        try:
+            if self._release_lock is None:
+                self._release_lock = redis_client.register_script(RELEASE_LOCK_LUA)
+            self._release_lock(keys=[self._lock_key(product_id)], args=[token], client=redis_client)
+        except RedisError:
+            pass
+
+    def _wait_for_fill(self, redis_client, product_id: str):
+        deadline = time.monotonic() + self.lock_timeout_ms / 1000
+        delay = 0.005
+        while time.monotonic() < deadline:
+            time.sleep(delay)
+            body = redis_client.get(self._data_key(product_id))
+            if body is not None:
+                return body
+            delay = min(delay * 2, 0.1)
+        return None
+
+    async def get_async(self, redis_client, product_id: str, loader: Callable[[], Awaitable[Optional[str]]]):
+        """
+        `get` for async handlers, sharing L1 and the Redis keys with the sync path.
+
+        Misses are not coalesced: no thread is blocked while they load, and the version
+        check still keeps a slow reader from overwriting the result of a newer write.
+
+        Args:
+            redis_client (redis.asyncio.Redis): Async Redis client.
+            product_id (str): The product id.
+            loader (Callable[[], Awaitable[Optional[str]]]): Coroutine function returning
+                the JSON body from the database, or None if the product does not exist.
+
+        Returns:
+            Optional[str]: The JSON body, or None if the product does not exist.
+        """
+        body = self._l1_get(product_id)
+        if body is None:
+            body = await self._load_from_redis_async(redis_client, product_id, loader)
+            self._l1_set(product_id, body)
+        return body if body != NOT_FOUND else None
+
+    async def _load_from_redis_async(self, redis_client, product_id: str, loader: Callable[[], Awaitable[Optional[str]]]):
+        try:
+            # The version is read with the body so a miss costs no extra round trip.
+            body, version = await redis_client.mget([self._data_key(product_id), self._version_key(product_id)])
+        except RedisError:
+            body = await loader()
+            return body if body is not None else NOT_FOUND
+        if body is not None:
+            return body
+
+        body = await loader()
+        body = body if body is not None else NOT_FOUND
+        try:
+            if self._async_client is not redis_client:
+                self._set_if_version_async = redis_client.register_script(SET_IF_VERSION_LUA)
+                self._async_client = redis_client
+            await self._set_if_version_async(
+                keys=[self._version_key(product_id), self._data_key(product_id)],
+                args=[version or "0", body, self.ttl_seconds if body != NOT_FOUND else self.not_found_ttl_seconds],
+            )
+        except RedisError:
+            pass
+        return body
+
+    def invalidate(self, *product_ids: str):
+        """
+        Bump the products' generations and drop their cached bodies in one round trip.
+
+        Args:
+            *product_ids (str): The product ids.
+        """
+        if not product_ids:
+            return
+        for product_id in product_ids:
+            self._l1_discard(product_id)
+        try:
+            pipe = get_redis_client().pipeline(transaction=True)
+            for product_id in product_ids:
+                pipe.incr(self._version_key(product_id))
+                pipe.delete(self._data_key(product_id))
+            pipe.execute()
+        except RedisError:
+            pass
+
+    async def invalidate_async(self, redis_client, *product_ids: str):
+        """`invalidate` on a `redis.asyncio` client."""
+        if not product_ids:
+            return
+        for product_id in product_ids:
+            self._l1_discard(product_id)
+        try:
+            async with redis_client.pipeline(transaction=True) as pipe:
+                for product_id in product_ids:
+                    pipe.incr(self._version_key(product_id))
+                    pipe.delete(self._data_key(product_id))
+                await pipe.execute()
+        except RedisError:
+            pass
+
+
+product_cache = ProductCache(
+    ttl_seconds=Config.PRODUCT_CACHE_TTL_SECONDS,
+    not_found_ttl_seconds=Config.PRODUCT_CACHE_NOT_FOUND_TTL_SECONDS,
+    l1_ttl_seconds=Config.PRODUCT_CACHE_L1_TTL_SECONDS,
+    l1_max_entries=Config.PRODUCT_CACHE_L1_MAX_ENTRIES,
+    lock_timeout_ms=Config.PRODUCT_CACHE_LOCK_TIMEOUT_MS,
+)
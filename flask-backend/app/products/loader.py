@@ -0,0 +1,48 @@
+from flask import g
+
+from app.extensions.mongo import parse_object_id
+from app.products.repository import ProductsRepository
+
+
+class ProductBatchLoader:
+    """Request-scoped loader that fetches products by id in as few queries as possible.
+
+    Ids passed to `load_many` are de-duplicated, and products already fetched earlier in
+    the same request are served from memory, so hydrating any number of lists costs a
+    single `$in` query.
+    """
+
+    def __init__(self, repository: ProductsRepository):
+        self.repository = repository
+        self._products: dict[str, dict | None] = {}
+
+    def load_many(self, product_ids: list):
+        """
+        Fetch products by id, skipping ids that do not exist.
+
+        Args:
+            product_ids (list): Product ids as strings or ObjectIds; duplicates are allowed.
+
+        Returns:
+            dict[str, dict[str, any]]: Product documents keyed by their string id.
+        """
+        keys = dict.fromkeys(str(pid) for pid in product_ids)
+        missing = [key for key in keys if key not in self._products]
+        if missing:
+            object_ids = [oid for oid in (parse_object_id(key) for key in missing) if oid]
+            found = {str(p["_id"]): p for p in self.repository.get_products_by_ids(object_ids)} if object_ids else {}
+            for key in missing:
+                self._products[key] = found.get(key)
+        return {key: self._products[key] for key in keys if self._products[key] is not None}
+
+
+def get_product_loader():
+    """
+    Get the product batch loader for the current request, creating it on first use.
+
+    Returns:
+        ProductBatchLoader: The request-scoped loader.
+    """
+    if "product_loader" not in g:
+        g.product_loader = ProductBatchLoader(ProductsRepository())
+    return g.product_loader
@@ -1,9 +1,41 @@
 from datetime import datetime
 
-from app.extensions.mongo import get_mongo_db, parse_object_id
+from flask import current_app
+from pymongo import ASCENDING, DESCENDING, IndexModel, ReturnDocument
+from pymongo.errors import BulkWriteError, OperationFailure
+
+from app.extensions.mongo import get_mongo_db, iter_by_id, keyset_page, parse_object_id, serialize_document
+from app.products.cache import pack_entry, product_cache, unpack_entry
+from app.products.reviews import REVIEW_SORTS, empty_review_stats, rebuild_review_stats, review_stats_update
+from app.products.search import TEXT_INDEX, build_search_terms, fallback_search_filter, is_missing_text_index
+
+# Internal fields that are stored on product documents but never returned to clients.
+PRIVATE_FIELDS_PROJECTION = {"search_terms": 0, "review_sum": 0}
 
 
 class ProductsRepository:
+    INDEXES = {
+        "products": [
+            IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="products_created_at"),
+            TEXT_INDEX,
+        ],
+        "reviews": [
+            IndexModel([("product_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="reviews_product_created_at"),
+            IndexModel([("product_id", ASCENDING), ("rating", DESCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="reviews_product_rating"),
+            IndexModel([("product_id", ASCENDING), ("user_id", ASCENDING)], name="reviews_product_user", unique=True),
+        ],
+    }
+
+    # Fields clients may request through `?fields=`.
+    FIELDS = frozenset({
+        "name", "price", "currency", "description", "inventory", "category", "images", "attributes",
+        "average_review", "reviews", "review_histogram", "user_id", "created_at", "updated_at",
+    })
+    FIELD_PRESETS = {
+        # Everything the product grid card renders, with only the first image.
+        "card": {"name": 1, "price": 1, "currency": 1, "images": {"$slice": 1}, "average_review": 1, "reviews": 1},
+    }
+
     def __init__(self):
         pass
 
@@ -19,41 +51,214 @@ class ProductsRepository:
     def product_reviews(self):
         return self.db.reviews
 
-    def list_products(self, query: str = "", ids: list[str] = None, limit: int = 50):
-        mongo_query = {}
+    def list_products(self, query: str = "", ids: list[str] = None, limit: int = 50, cursor: str = None, projection: dict = None):
+        """
+        List products newest first, or by relevance when searching.
+
+        Keyset cursors apply to catalog browsing only; id lookups and text searches return
+        a single page and no next cursor.
+
+        Returns:
+            tuple[list[dict], Optional[str]]: The page and the cursor for the next one.
+        """
+        projection = projection or PRIVATE_FIELDS_PROJECTION
         if ids:
             ids_list = [parse_object_id(pid) for pid in ids]
             ids_list = [i for i in ids_list if i]
             if not ids_list:
-                return []
-            mongo_query["_id"] = {"$in": ids_list}
-        elif query:
-            mongo_query["name"] = {"$regex": query, "$options": "i"}
+                return [], None
+            products = self.products.find({"_id": {"$in": ids_list}}, projection).sort("created_at", -1)
+            return list(products.limit(limit)), None
 
-        return list(self.products.find(mongo_query).sort("created_at", -1).limit(limit))
+        if query:
+            scored = {**projection, "score": {"$meta": "textScore"}}
+            products = self.products.find({"$text": {"$search": query}}, scored).sort([("score", {"$meta": "textScore"}), ("created_at", -1)])
+            try:
+                return list(products.limit(limit)), None
+            except OperationFailure as e:
+                if not is_missing_text_index(e):
+                    raise
+            products = self.products.find(fallback_search_filter(query), projection).sort("created_at", -1)
+            return list(products.limit(limit)), None
 
-    def get_product_by_id(self, product_id: str):
-        return self.products.find_one({"_id": parse_object_id(product_id)})
+        return keyset_page(self.products, {}, limit=limit, cursor=cursor, projection=projection)
 
-    def get_product_reviews(self, product_id: str):
-        return list(self.product_reviews.find({"product_id": parse_object_id(product_id)}).sort("created_at", -1).limit(10))
+    def iter_products(self, projection: dict = None, after=None, batch_size: int = 1000):
+        """Lazily iterate over every product in `_id` order, resuming after `after` if given."""
+        return iter_by_id(self.products, {}, projection or PRIVATE_FIELDS_PROJECTION, after=after, batch_size=batch_size)
 
-    def create_product(self, user_id: str, product_data: dict):
+    def get_product_by_id(self, product_id: str, projection: dict = None):
+        return self.products.find_one({"_id": parse_object_id(product_id)}, projection or PRIVATE_FIELDS_PROJECTION)
+
+    def get_product_version(self, product_id: str):
+        return self.products.find_one({"_id": parse_object_id(product_id)}, {"updated_at": 1})
+
+    def get_products_by_ids(self, product_ids: list, projection: dict = None):
+        """Fetch products matching any of the given ObjectIds with a single `$in` query, in no particular order."""
+        return list(self.products.find({"_id": {"$in": product_ids}}, projection or PRIVATE_FIELDS_PROJECTION))
+
+    def get_product_json(self, product_id: str):
+        """
+        Return the product serialized as a JSON string, served from the product cache when possible.
+
+        Returns:
+            Optional[tuple[str, Optional[datetime]]]: The JSON body and the product's
+                `updated_at`, or None if the product does not exist.
+        """
+        object_id = parse_object_id(product_id)
+        if not object_id:
+            return None
+
+        def load():
+            product = self.products.find_one({"_id": object_id}, PRIVATE_FIELDS_PROJECTION)
+            if not product:
+                return None
+            return pack_entry(current_app.json.dumps(serialize_document(product)), product.get("updated_at"))
+
+        entry = product_cache.get(str(object_id), load)
+        return unpack_entry(entry) if entry is not None else None
+
+    def get_product_reviews(self, product_id: str, sort: str = "recent", limit: int = 10, cursor: str = None):
+        """
+        Page through a product's reviews.
+
+        Args:
+            product_id (str): The product id.
+            sort (str): One of `REVIEW_SORTS`: "recent", "highest" or "lowest".
+            limit (int): Page size.
+            cursor (str, optional): Cursor returned with the previous page.
+
+        Returns:
+            tuple[list[dict], Optional[str]]: The page and the cursor for the next one.
+        """
+        query = {"product_id": parse_object_id(product_id)}
+        return keyset_page(self.product_reviews, query, limit=limit, cursor=cursor, sort=REVIEW_SORTS[sort])
+
+    def _shift_review_stats(self, product_id, count: int = 0, total: int = 0, histogram: dict[int, int] = None):
+        result = self.products.update_one({"_id": product_id}, review_stats_update(count, total, histogram))
+        product_cache.invalidate(str(product_id))
+        return result.matched_count > 0
+
+    def create_review(self, user_id: str, product_id: str, review_data: dict):
+        """
+        Add a review and fold its rating into the product's aggregates.
+
+        Raises:
+            DuplicateKeyError: If the user already reviewed the product.
+
+        Returns:
+            Optional[dict]: The review, or None if the product does not exist.
+        """
+        review = {
+            **review_data,
+            "product_id": parse_object_id(product_id),
+            "user_id": parse_object_id(user_id),
+            "created_at": datetime.now(),
+            "updated_at": datetime.now(),
+        }
+        self.product_reviews.insert_one(review)
+        rating = review["rating"]
+        if not self._shift_review_stats(review["product_id"], count=1, total=rating, histogram={rating: 1}):
+            self.product_reviews.delete_one({"_id": review["_id"]})
+            return None
+        return review
+
+    def update_review(self, user_id: str, product_id: str, review_id: str, updates: dict):
+        updates["updated_at"] = datetime.now()
+        previous = self.product_reviews.find_one_and_update(
+            {"_id": parse_object_id(review_id), "product_id": parse_object_id(product_id), "user_id": parse_object_id(user_id)},
+            {"$set": updates},
+            return_document=ReturnDocument.BEFORE,
+        )
+        if not previous:
+            return None
+        old_rating, new_rating = previous["rating"], updates.get("rating", previous["rating"])
+        if new_rating != old_rating:
+            self._shift_review_stats(previous["product_id"], total=new_rating - old_rating, histogram={old_rating: -1, new_rating: 1})
+        return {**previous, **updates}
+
+    def delete_review(self, user_id: str, product_id: str, review_id: str):
+        review = self.product_reviews.find_one_and_delete(
+            {"_id": parse_object_id(review_id), "product_id": parse_object_id(product_id), "user_id": parse_object_id(user_id)},
+        )
+        if not review:
+            return False
+        rating = review["rating"]
+        self._shift_review_stats(review["product_id"], count=-1, total=-rating, histogram={rating: -1})
+        return True
+
+    def rebuild_review_stats(self, batch_size: int = 500):
+        """Recompute review aggregates for every product and evict corrected products from the cache."""
+        scanned, corrected = rebuild_review_stats(self.products, self.product_reviews, batch_size=batch_size)
+        for start in range(0, len(corrected), batch_size):
+            product_cache.invalidate(*corrected[start:start + batch_size])
+        return scanned, len(corrected)
+
+    @staticmethod
+    def build_product(user_id: str, product_data: dict):
         product_data.update({
             "user_id": parse_object_id(user_id),
             "created_at": datetime.now(),
             "updated_at": datetime.now(),
-            "average_review": 0,
-            "reviews": 0,
+            **empty_review_stats(),
+            "search_terms": build_search_terms(product_data.get("attributes")),
         })
+        return product_data
+
+    def create_product(self, user_id: str, product_data: dict):
+        product_data = self.build_product(user_id, product_data)
         inserted_id = self.products.insert_one(product_data).inserted_id
-        return self.products.find_one({"_id": inserted_id})
+        product_cache.invalidate(str(inserted_id))
+        return {k: v for k, v in product_data.items() if k not in PRIVATE_FIELDS_PROJECTION}
 
-    def update_product(self, user_id: str, product_id: str, updates: dict):
+    @staticmethod
+    def build_updates(updates: dict):
         updates["updated_at"] = datetime.now()
-        self.products.update_one({"_id": parse_object_id(product_id), "user_id": parse_object_id(user_id)}, {"$set": updates})
-        return self.products.find_one({"_id": parse_object_id(product_id), "user_id": parse_object_id(user_id)})
+        if "attributes" in updates:
+            updates["search_terms"] = build_search_terms(updates["attributes"])
+        return updates
+
+    def update_product(self, user_id: str, product_id: str, updates: dict):
+        updates = self.build_updates(updates)
+        product = self.products.find_one_and_update(
+            {"_id": parse_object_id(product_id), "user_id": parse_object_id(user_id)},
+            {"$set": updates},
+            projection=PRIVATE_FIELDS_PROJECTION,
+            return_document=ReturnDocument.AFTER,
+        )
+        if product:
+            product_cache.invalidate(str(product["_id"]))
+        return product
 
     def delete_product(self, user_id: str, product_id: str):
         result = self.products.delete_one({"_id": parse_object_id(product_id), "user_id": parse_object_id(user_id)})
+        if result.deleted_count:
+            product_cache.invalidate(str(parse_object_id(product_id)))
         return result.deleted_count > 0
+
+    def get_owned_product_ids(self, user_id: str, product_ids: list):
+        """Return the subset of `product_ids` (ObjectIds) that belong to `user_id`."""
+        cursor = self.products.find({"_id": {"$in": product_ids}, "user_id": parse_object_id(user_id)}, {"_id": 1})
+        return {product["_id"] for product in cursor}
+
+    def bulk_write_products(self, operations: list):
+        """
+        Apply insert/update operations in one unordered `bulk_write`.
+
+        Unordered writes let the server keep going past a failed operation, so one bad
+        row does not abort the rest of the batch.
+
+        Args:
+            operations (list): `InsertOne`/`UpdateOne` requests.
+
+        Returns:
+            tuple[int, int, list[dict]]: Inserted count, matched count, and the server's
+            `writeErrors` (each with the `index` of the failed operation).
+        """
+        try:
+            result = self.products.bulk_write(operations, ordered=False).bulk_api_result
+            write_errors = []
+        except BulkWriteError as e:
+            result = e.details
+            write_errors = e.details.get("writeErrors", [])
+        return result.get("nInserted", 0), result.get("nMatched", 0), write_errors
@@ -0,0 +1,118 @@
+from datetime import datetime
+
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.collection import Collection
+
+from app.extensions.mongo import iter_by_id
+
+RATINGS = range(1, 6)
+
+REVIEW_SORTS = {
+    "recent": [("created_at", -1), ("_id", -1)],
+    "highest": [("rating", -1), ("created_at", -1), ("_id", -1)],
+    "lowest": [("rating", 1), ("created_at", 1), ("_id", 1)],
+}
+
+
+def empty_review_stats():
+    """
+    Review aggregates of a product without reviews.
+
+    Returns:
+        dict[str, any]: Fields to store on a new product document.
+    """
+    return {
+        "reviews": 0,
+        "review_sum": 0,
+        "average_review": 0,
+        "review_histogram": {str(rating): 0 for rating in RATINGS},
+    }
+
+
+def _plus(field: str, delta: int):
+    return {"$add": [{"$ifNull": [f"${field}", 0]}, delta]}
+
+
+def review_stats_update(count: int = 0, total: int = 0, histogram: dict[int, int] = None):
+    """
+    Build an update that shifts a product's review aggregates by the given deltas.
+
+    The counters are incremented and `average_review` is recomputed from them within
+    the same single-document update, so concurrent reviews can never leave the average
+    out of step with the count and sum.
+
+    Args:
+        count (int): Change in the number of reviews.
+        total (int): Change in the sum of ratings.
+        histogram (dict[int, int], optional): Change in the count of each star rating.
+
+    Returns:
+        list[dict[str, any]]: An update pipeline.
+    """
+    # Reviews change the product's representation, so they count as a modification.
+    fields = {"reviews": _plus("reviews", count), "review_sum": _plus("review_sum", total), "updated_at": datetime.now()}
+    for rating, delta in (histogram or {}).items():
+        fields[f"review_histogram.{rating}"] = _plus(f"review_histogram.{rating}", delta)
+    average = {"$cond": [{"$gt": ["$reviews", 0]}, {"$divide": ["$review_sum", "$reviews"]}, 0]}
+    return [{"$set": fields}, {"$set": {"average_review": average}}]
+
+
+def rebuild_review_stats(products: Collection, reviews: Collection, batch_size: int = 500):
+    """
+    Recompute every product's review aggregates from the reviews collection.
+
+    Products are processed `batch_size` at a time: one grouped aggregation over their
+    reviews, one read of the stored aggregates, and one unordered `bulk_write` for the
+    products that differ, so the job never holds more than a batch in memory. Use it
+    to repair drift left by interrupted review writes.
+
+    Args:
+        products (Collection): The products collection.
+        reviews (Collection): The reviews collection.
+        batch_size (int): Products per batch.
+
+    Returns:
+        tuple[int, list[str]]: Number of products scanned and ids of corrected products.
+    """
+    scanned, corrected = 0, []
+    batch: list[ObjectId] = []
+    for product in iter_by_id(products, {}, {"_id": 1}, batch_size=batch_size):
+        batch.append(product["_id"])
+        if len(batch) == batch_size:
+            corrected.extend(_rebuild_batch(products, reviews, batch))
+            scanned, batch = scanned + len(batch), []
+    if batch:
+        corrected.extend(_rebuild_batch(products, reviews, batch))
+        scanned += len(batch)
+    return scanned, corrected
+
+
+def _rebuild_batch(products: Collection, reviews: Collection, product_ids: list[ObjectId]):
+    group = {"_id": "$product_id", "reviews": {"$sum": 1}, "review_sum": {"$sum": "$rating"}}
+    for rating in RATINGS:
+        group[f"r{rating}"] = {"$sum": {"$cond": [{"$eq": ["$rating", rating]}, 1, 0]}}
+    computed = {
+        row["_id"]: row
+        for row in reviews.aggregate([{"$match": {"product_id": {"$in": product_ids}}}, {"$group": group}])
+    }
+
+    stored = products.find({"_id": {"$in": product_ids}}, {field: 1 for field in empty_review_stats()})
+    operations, modified = [], []
+    for product in stored:
+        stats = empty_review_stats()
+        row = computed.get(product["_id"])
+        if row:
+            stats.update({
+                "reviews": row["reviews"],
+                "review_sum": row["review_sum"],
+                "average_review": row["review_sum"] / row["reviews"],
+                "review_histogram": {str(rating): row[f"r{rating}"] for rating in RATINGS},
+            })
+        if any(product.get(field) != value for field, value in stats.items()):
+            operations.append(UpdateOne({"_id": product["_id"]}, {"$set": {**stats, "updated_at": datetime.now()}}))
+            modified.append(str(product["_id"]))
+
+    if operations:
+        products.bulk_write(operations, ordered=False)
+    return modified
@@ -1,10 +1,26 @@
 from http import HTTPStatus
-from flask import Blueprint, jsonify, request
-from pydantic import BaseModel, Field, constr, confloat, conint, ValidationError
 
-from app.extensions.mongo import serialize_id, serialize_document
-from app.auth import auth_required
+import click
+from flask import Blueprint, Response, current_app, jsonify, request
+from pydantic import BaseModel, Field, constr, confloat, conint
+from pymongo.errors import DuplicateKeyError
+
+from app.config import Config
+from app.extensions.mongo import InvalidCursor, build_projection, parse_page_params, serialize_id, serialize_document
+from app.extensions.http_cache import (
+    cache_control,
+    check_not_modified,
+    conditional_response,
+    document_response,
+    version_etag,
+    with_updated_at,
+)
+from app.extensions.export import EXPORT_FORMATS, DocumentExport, export_response, parse_export_args, write_export
+from app.extensions.validation import validate_body
+from app.auth import admin_required, auth_required
 from app.products import ProductsRepository
+from app.products.bulk import import_products, iter_ndjson_lines
+from app.products.reviews import REVIEW_SORTS
 from app.utils import error_response
 
 products_bp = Blueprint("products", __name__)
@@ -34,50 +50,150 @@ class ProductUpdateSchema(BaseModel):
     attributes: dict | None = None
 
 
+class ReviewCreateSchema(BaseModel):
+    rating: conint(ge=1, le=5)
+    title: constr(min_length=1, max_length=200)
+    description: constr(max_length=5000) = ""
+
+
+class ReviewUpdateSchema(BaseModel):
+    rating: conint(ge=1, le=5) | None = None
+    title: constr(min_length=1, max_length=200) | None = None
+    description: constr(max_length=5000) | None = None
+
+
 @products_bp.get("/", strict_slashes=False)
+@cache_control(Config.CACHE_CONTROL_CATALOG)
 def list_products():
     query_param = request.args.get("query", "").strip()
     ids_param = request.args.get("ids", "").strip()
     try:
-        limit = int(request.args.get("limit", 50))
+        limit, cursor = parse_page_params(request.args)
     except ValueError:
         return error_response("invalid_limit", HTTPStatus.BAD_REQUEST)
+    try:
+        projection = build_projection(request.args.get("fields"), ProductsRepository.FIELDS, ProductsRepository.FIELD_PRESETS)
+    except ValueError as e:
+        return error_response("invalid_fields", details=str(e))
 
     ids_list = ids_param.split(",") if ids_param else None
     try:
-        products = products_repo.list_products(query=query_param, ids=ids_list, limit=limit)
-        return jsonify([serialize_document(p) for p in products]), HTTPStatus.OK
+        products, next_cursor = products_repo.list_products(query=query_param, ids=ids_list, limit=limit, cursor=cursor, projection=projection)
+        return conditional_response(jsonify({"items": [serialize_document(p) for p in products], "next_cursor": next_cursor}))
+    except InvalidCursor:
+        return error_response("invalid_cursor", HTTPStatus.BAD_REQUEST)
     except Exception as e:
         return error_response("Database error", details=str(e), status=HTTPStatus.INTERNAL_SERVER_ERROR)
 
 
+def _build_export(export_format: str, projection: dict, columns: list[str], after, gzip_level: int):
+    documents = products_repo.iter_products(projection=projection, after=after, batch_size=Config.EXPORT_BATCH_SIZE)
+    return DocumentExport(
+        documents,
+        export_format,
+        dumps=current_app.json.dumps_bytes,
+        columns=columns,
+        gzip_level=gzip_level,
+        chunk_bytes=Config.EXPORT_CHUNK_BYTES,
+    )
+
+
+@products_bp.get("/export")
+@admin_required
+def export_products(user):
+    try:
+        export_args = parse_export_args(request.args, ProductsRepository.FIELDS, Config.EXPORT_GZIP_LEVEL)
+    except ValueError as e:
+        return error_response(str(e), HTTPStatus.BAD_REQUEST)
+    return export_response(_build_export(*export_args), "products")
+
+
 @products_bp.get("/<product_id>")
+@cache_control(Config.CACHE_CONTROL_CATALOG)
 def get_product(product_id: str):
-    product = products_repo.get_product_by_id(product_id=product_id)
-    if not product:
+    try:
+        projection = build_projection(request.args.get("fields"), ProductsRepository.FIELDS, ProductsRepository.FIELD_PRESETS)
+    except ValueError as e:
+        return error_response("invalid_fields", details=str(e))
+
+    if projection:
+        response = check_not_modified(lambda: products_repo.get_product_version(product_id=product_id))
+        if response:
+            return response
+        projection, strip_updated_at = with_updated_at(projection)
+        product = products_repo.get_product_by_id(product_id=product_id, projection=projection)
+        if not product:
+            return error_response("product_not_found", HTTPStatus.NOT_FOUND)
+        return document_response(product, strip_updated_at=strip_updated_at)
+
+    cached = products_repo.get_product_json(product_id=product_id)
+    if cached is None:
         return error_response("product_not_found", HTTPStatus.NOT_FOUND)
-    return jsonify(serialize_document(product)), HTTPStatus.OK
+    # The cache entry carries `updated_at` next to the body, so conditional requests are
+    # answered without parsing it; a product without one gets a strong ETag of the body.
+    product_json, updated_at = cached
+    etag = version_etag(product_id, updated_at, request.query_string) if updated_at else None
+    return conditional_response(Response(product_json, status=HTTPStatus.OK, mimetype="application/json"), etag, updated_at)
 
 
 @products_bp.get("/<product_id>/reviews")
+@cache_control(Config.CACHE_CONTROL_CATALOG)
 def get_product_reviews(product_id: str):
-    product_reviews = products_repo.get_product_reviews(product_id=product_id)
-    if not product_reviews:
-        return error_response("product_reviews_not_found", HTTPStatus.NOT_FOUND)
-    return jsonify(serialize_document(product_reviews)), HTTPStatus.OK
+    sort = request.args.get("sort", "recent")
+    if sort not in REVIEW_SORTS:
+        return error_response("invalid_sort", HTTPStatus.BAD_REQUEST)
+    try:
+        limit, cursor = parse_page_params(request.args)
+    except ValueError:
+        return error_response("invalid_limit", HTTPStatus.BAD_REQUEST)
 
+    try:
+        reviews, next_cursor = products_repo.get_product_reviews(product_id=product_id, sort=sort, limit=limit, cursor=cursor)
+    except InvalidCursor:
+        return error_response("invalid_cursor", HTTPStatus.BAD_REQUEST)
+    return conditional_response(jsonify({"items": serialize_document(reviews), "next_cursor": next_cursor}))
 
-@products_bp.post("/")
+
+@products_bp.post("/<product_id>/reviews")
 @auth_required
-def create_product(user):
-    payload = request.get_json()
-    if payload is None:
-        return error_response("invalid_json")
+@validate_body(ReviewCreateSchema)
+def create_product_review(user, product_id: str, data: ReviewCreateSchema):
     try:
-        data = ProductCreateSchema(**payload)
-    except ValidationError as e:
-        return error_response("invalid_payload", details=e.errors(), status=HTTPStatus.BAD_REQUEST)
+        review = products_repo.create_review(user_id=user["id"], product_id=product_id, review_data=data.model_dump())
+    except DuplicateKeyError:
+        return error_response("review_exists", HTTPStatus.CONFLICT)
+    if not review:
+        return error_response("product_not_found", HTTPStatus.NOT_FOUND)
+    return jsonify(serialize_document(review)), HTTPStatus.CREATED
+
+
+@products_bp.put("/<product_id>/reviews/<review_id>")
+@auth_required
+@validate_body(ReviewUpdateSchema)
+def update_product_review(user, product_id: str, review_id: str, data: ReviewUpdateSchema):
+    updates = data.model_dump(exclude_none=True)
+    if not updates:
+        return error_response("no_updates_provided")
+
+    review = products_repo.update_review(user_id=user["id"], product_id=product_id, review_id=review_id, updates=updates)
+    if not review:
+        return error_response("review_not_found", HTTPStatus.NOT_FOUND)
+    return jsonify(serialize_document(review)), HTTPStatus.OK
+
+
+@products_bp.delete("/<product_id>/reviews/<review_id>")
+@auth_required
+def delete_product_review(user, product_id: str, review_id: str):
+    deleted = products_repo.delete_review(user_id=user["id"], product_id=product_id, review_id=review_id)
+    if not deleted:
+        return error_response("review_not_found", HTTPStatus.NOT_FOUND)
+    return jsonify({"deleted": True, "review_id": serialize_id(review_id)}), HTTPStatus.OK
+
 
+@products_bp.post("/")
+@auth_required
+@validate_body(ProductCreateSchema)
+def create_product(user, data: ProductCreateSchema):
     try:
         product = products_repo.create_product(user_id=user["id"], product_data=data.model_dump())
         return jsonify(serialize_document(product)), HTTPStatus.CREATED
@@ -85,17 +201,36 @@ def create_product(user):
         return error_response("Database error", details=str(e), status=HTTPStatus.INTERNAL_SERVER_ERROR)
 
 
-@products_bp.put("/<product_id>")
+@products_bp.post("/bulk")
 @auth_required
-def update_product(user, product_id: str):
-    payload = request.get_json()
-    if payload is None:
-        return error_response("invalid_json")
+def bulk_import_products(user):
+    """Create or update products from an NDJSON body, one product per line."""
     try:
-        data = ProductUpdateSchema(**payload)
-    except ValidationError as e:
-        return error_response("invalid_payload", details=e.errors(), status=HTTPStatus.BAD_REQUEST)
+        batch_size = int(request.args.get("batch_size", Config.PRODUCT_BULK_BATCH_SIZE))
+    except ValueError:
+        return error_response("invalid_batch_size", HTTPStatus.BAD_REQUEST)
+    if batch_size < 1:
+        return error_response("invalid_batch_size", HTTPStatus.BAD_REQUEST)
 
+    try:
+        report = import_products(
+            products_repo,
+            user_id=user["id"],
+            lines=iter_ndjson_lines(request.stream),
+            create_schema=ProductCreateSchema,
+            update_schema=ProductUpdateSchema,
+            batch_size=min(batch_size, Config.PRODUCT_BULK_MAX_BATCH_SIZE),
+        )
+    except Exception as e:
+        return error_response("Database error", details=str(e), status=HTTPStatus.INTERNAL_SERVER_ERROR)
+
+    return jsonify(report.to_dict()), HTTPStatus.OK
+
+
+@products_bp.put("/<product_id>")
+@auth_required
+@validate_body(ProductUpdateSchema)
+def update_product(user, product_id: str, data: ProductUpdateSchema):
     updates = {k: v for k, v in data.model_dump(exclude_unset=True).items()}
     if not updates:
         return error_response("no_updates_provided")
@@ -113,3 +248,37 @@ def delete_product(user, product_id: str):
     if not deleted:
         return error_response("product_not_found", HTTPStatus.NOT_FOUND)
     return jsonify({"deleted": True, "product_id": serialize_id(product_id)}), HTTPStatus.OK
+
+
+@products_bp.cli.command("rebuild-reviews")
+@click.option("--batch-size", type=int, default=500, show_default=True, help="Products per batch.")
+def rebuild_reviews(batch_size):
+    """Recompute review counts, sums, histograms and averages from the reviews collection."""
+    scanned, corrected = products_repo.rebuild_review_stats(batch_size=batch_size)
+    print(f"{scanned} products scanned, {corrected} corrected.")
+
+
+@products_bp.cli.command("reindex-search")
+def reindex_search():
+    """Create the product text index and rebuild `search_terms` for every product."""
+    from app.products.search import ensure_search_index, backfill_search_terms
+
+    ensure_search_index(products_repo.products)
+    updated = backfill_search_terms(products_repo.products)
+    print(f"Search index ready, {updated} products reindexed.")
+
+
+@products_bp.cli.command("export")
+@click.option("--format", "export_format", type=click.Choice(sorted(EXPORT_FORMATS)), default="ndjson")
+@click.option("--fields", default=None, help="Comma-separated fields to export; defaults to all.")
+@click.option("--after", default=None, help="Resume after this product id.")
+@click.option("--gzip", is_flag=True, help="Compress the output with gzip.")
+@click.option("--output", "-o", default="-", help="Output file, or - for stdout.")
+def export_products_command(export_format, fields, after, gzip, output):
+    """Stream every product to NDJSON or CSV in `_id` order."""
+    args = {"format": export_format, "fields": fields, "after": after, "gzip": "1" if gzip else "0"}
+    try:
+        export_args = parse_export_args(args, ProductsRepository.FIELDS, Config.EXPORT_GZIP_LEVEL)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+    write_export(_build_export(*export_args), output)
@@ -0,0 +1,160 @@
+import logging
+import re
+import time
+from typing import Callable, Iterable
+
+from pymongo import IndexModel, UpdateOne
+from pymongo.collection import Collection
+from pymongo.errors import OperationFailure
+
+from app.config import Config
+
+Tokenizer = Callable[[str], Iterable[str]]
+
+TEXT_INDEX_NAME = "products_text_search"
+TEXT_INDEX_KEYS = [("name", "text"), ("category", "text"), ("description", "text"), ("search_terms", "text")]
+TEXT_INDEX_WEIGHTS = {"name": 10, "category": 5, "search_terms": 3, "description": 1}
+
+TEXT_INDEX = IndexModel(
+    TEXT_INDEX_KEYS,
+    name=TEXT_INDEX_NAME,
+    weights=TEXT_INDEX_WEIGHTS,
+    default_language=Config.PRODUCT_SEARCH_LANGUAGE,
+)
+
+# Server error code for a `$text` query on a collection without a text index.
+INDEX_NOT_FOUND = 27
+
+# The missing-index warning is logged at most this often per process.
+FALLBACK_WARNING_INTERVAL_SECONDS = 60
+
+logger = logging.getLogger(__name__)
+_fallback_warned_at = None
+_fallback_searches = 0
+
+
+def is_missing_text_index(error: OperationFailure):
+    """Whether a failed `$text` query failed only because the text index does not exist yet."""
+    return error.code == INDEX_NOT_FOUND
+
+
+def fallback_search_filter(query: str):
+    """
+    The name match used before the text index existed, for deployments that have not built it.
+
+    Logs a warning, at most once a minute per process with the number of searches since
+    the last one, since every such search scans the collection until
+    `flask db ensure-indexes` or `flask products reindex-search` is run.
+
+    Args:
+        query (str): The user's search text, matched literally and case-insensitively.
+
+    Returns:
+        dict[str, any]: A products filter.
+    """
+    global _fallback_warned_at, _fallback_searches
+    _fallback_searches += 1
+    now = time.monotonic()
+    if _fallback_warned_at is None or now - _fallback_warned_at >= FALLBACK_WARNING_INTERVAL_SECONDS:
+        _fallback_warned_at = now
+        searches, _fallback_searches = _fallback_searches, 0
+        logger.warning(
+            "Text index %s is missing; product search is falling back to a regex scan (%d searches)",
+            TEXT_INDEX_NAME,
+            searches,
+        )
+    return {"name": {"$regex": re.escape(query), "$options": "i"}}
+
+
+_TOKEN_PATTERN = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+def default_tokenizer(text: str):
+    """
+    Split text into lowercase alphanumeric tokens.
+
+    Args:
+        text (str): The text to tokenize.
+
+    Returns:
+        list[str]: Tokens of at least two characters.
+    """
+    return [token for token in _TOKEN_PATTERN.findall(text.lower()) if len(token) > 1]
+
+
+_tokenizer: Tokenizer = default_tokenizer
+
+
+def set_tokenizer(tokenizer: Tokenizer):
+    """
+    Replace the tokenizer used to build `search_terms` for new and updated products.
+
+    Existing documents keep their terms until `flask products reindex-search` is run.
+
+    Args:
+        tokenizer (Tokenizer): Callable mapping a string to an iterable of tokens.
+    """
+    global _tokenizer
+    _tokenizer = tokenizer
+
+
+def _flatten(value: any):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield str(key)
+            yield from _flatten(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _flatten(item)
+    elif value is not None:
+        yield str(value)
+
+
+def build_search_terms(attributes: dict | None):
+    """
+    Build the indexed `search_terms` string from a product's attribute dict.
+
+    Attribute keys and values are flattened and run through the configured tokenizer;
+    name, category and description are indexed directly by the text index.
+
+    Args:
+        attributes (dict | None): The product attributes.
+
+    Returns:
+        str: Space separated, de-duplicated tokens.
+    """
+    tokens = dict.fromkeys(token for part in _flatten(attributes or {}) for token in _tokenizer(part))
+    return " ".join(tokens)
+
+
+def ensure_search_index(collection: Collection):
+    """
+    Create the weighted text index used by product search if it does not exist.
+
+    Args:
+        collection (Collection): The products collection.
+    """
+    collection.create_indexes([TEXT_INDEX])
+
+
+def backfill_search_terms(collection: Collection, batch_size: int = 1000):
+    """
+    Recompute `search_terms` for every product in batches.
+
+    Args:
+        collection (Collection): The products collection.
+        batch_size (int): Number of documents updated per bulk write.
+
+    Returns:
+        int: Number of documents updated.
+    """
+    updated = 0
+    batch = []
+    for product in collection.find({}, {"attributes": 1}).batch_size(batch_size):
+        batch.append(UpdateOne({"_id": product["_id"]}, {"$set": {"search_terms": build_search_terms(product.get("attributes"))}}))
+        if len(batch) >= batch_size:
+            updated += collection.bulk_write(batch, ordered=False).modified_count
+            batch = []
+    if batch:
+        updated += collection.bulk_write(batch, ordered=False).modified_count
+    return updated
@@ -0,0 +1,113 @@
+import math
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+from flask import Flask
+
+from app.extensions.redis import init_redis
+
+
+@dataclass(frozen=True)
+class WorkerPlan:
+    """How many gunicorn worker processes and threads per worker to run."""
+
+    cpus: int
+    workers: int
+    threads: int
+
+    @property
+    def concurrency(self):
+        return self.workers * self.threads
+
+
+def available_cpus():
+    """
+    Count the CPUs this process may actually use.
+
+    `os.cpu_count()` reports every CPU of the host. Inside a container the scheduler
+    affinity mask and the cgroup v2 `cpu.max` quota are usually tighter, and sizing
+    workers past them only adds context switches.
+
+    Returns:
+        int: Usable CPUs, at least 1.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS
+        cpus = os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return max(1, cpus)
+
+
+def plan_workers(io_ratio: float, workers: int = 0, threads: int = 0, max_threads: int = 64, cpus: Optional[int] = None):
+    """
+    Size gunicorn workers and threads from the CPU count and the share of time spent on I/O.
+
+    The GIL lets one process use about one core, so there is one worker per usable
+    CPU. A request that waits on MongoDB or Redis for a fraction `io_ratio` of its
+    time leaves the core idle for that long, so `1 / (1 - io_ratio)` threads keep a
+    worker's core busy: 0.5 gives 2 threads, 0.75 gives 4 and 0.9 gives 10.
+
+    Args:
+        io_ratio (float): Fraction of request time spent waiting on I/O, in [0, 1).
+        workers (int): Fixed worker count; 0 sizes it from the CPU count.
+        threads (int): Fixed threads per worker; 0 sizes them from `io_ratio`.
+        max_threads (int): Upper bound for the computed thread count.
+        cpus (Optional[int]): CPUs to plan for. Defaults to `available_cpus()`.
+
+    Returns:
+        WorkerPlan: The worker and thread counts.
+
+    Raises:
+        ValueError: If `io_ratio` is outside [0, 1).
+    """
+    if not 0 <= io_ratio < 1:
+        raise ValueError("io_ratio must be in [0, 1)")
+    cpus = cpus or available_cpus()
+    workers = workers or cpus
+    threads = threads or min(max_threads, max(1, round(1 / (1 - io_ratio))))
+    return WorkerPlan(cpus=cpus, workers=workers, threads=threads)
+
+
+def release_clients(app: Flask):
+    """
+    Close the MongoDB and Redis connections of a process that is about to fork workers.
+
+    With a preloaded app the master imports everything once and the workers share
+    its memory, but sockets opened in the master (e.g. by `MONGO_ENSURE_INDEXES`)
+    must not be shared. Closing them before the first fork means no worker inherits
+    a live connection.
+
+    Args:
+        app (Flask): The preloaded application.
+    """
+    if app.mongo_client is not None:
+        app.mongo_client.close()
+    app.mongo_client = None
+    app.mongo_client_pid = None
+    app.mongo_pool_stats = None
+    app.redis_client.close()
+
+
+def reinit_clients(app: Flask):
+    """
+    Give a freshly forked worker its own MongoDB and Redis clients.
+
+    The Redis client is rebuilt with `init_redis`, and the MongoClient is dropped so
+    `get_mongo_client` builds this worker's pool on first use. Per-process state keyed
+    on the pid (session invalidation listener, password hashing pool) restarts on its own.
+
+    Args:
+        app (Flask): The application inherited from the master.
+    """
+    app.mongo_client = None
+    app.mongo_client_pid = None
+    app.mongo_pool_stats = None
+    init_redis(app)
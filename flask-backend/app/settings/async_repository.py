@@ -0,0 +1,41 @@
+from datetime import datetime
+
+from pymongo import ReturnDocument
+
+from app.extensions.mongo import parse_object_id
+from app.extensions.mongo.async_client import get_async_mongo_db
+from app.settings.repository import SettingsRepository
+
+
+class AsyncSettingsRepository:
+    """`SettingsRepository` on the async MongoDB client."""
+
+    def __init__(self):
+        pass
+
+    @property
+    def db(self):
+        return get_async_mongo_db()
+
+    @property
+    def settings(self):
+        return self.db.settings
+
+    async def get_settings_for_user(self, user_id: str, projection: dict = None):
+        return await self.settings.find_one({"user_id": parse_object_id(user_id)}, projection)
+
+    async def get_settings_version(self, user_id: str):
+        return await self.settings.find_one({"user_id": parse_object_id(user_id)}, {"updated_at": 1})
+
+    async def create_settings(self, user_id: str):
+        settings_data = SettingsRepository.build_settings(user_id=user_id)
+        await self.settings.insert_one(settings_data)
+        return settings_data
+
+    async def update_settings_for_user(self, user_id: str, updates: dict):
+        updates["updated_at"] = datetime.now()
+        return await self.settings.find_one_and_update(
+            {"user_id": parse_object_id(user_id)},
+            {"$set": updates},
+            return_document=ReturnDocument.AFTER,
+        )
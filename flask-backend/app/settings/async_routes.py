@@ -0,0 +1,52 @@
+from http import HTTPStatus
+
+from quart import Blueprint, jsonify, request
+
+from app.asgi.auth import auth_required
+from app.config import Config
+from app.extensions.http_cache import cache_control, check_not_modified_async, document_response_async, with_updated_at
+from app.extensions.mongo import build_projection, serialize_document
+from app.extensions.validation import validate_body
+from app.settings import SettingsRepository
+from app.settings.async_repository import AsyncSettingsRepository
+from app.settings.routes import SettingsUpdateSchema
+from app.utils import error_response
+
+# Same name as the sync blueprint, so endpoints line up with `settings_bp`.
+settings_bp = Blueprint("settings", __name__)
+
+settings_repo = AsyncSettingsRepository()
+
+
+@settings_bp.get("/", strict_slashes=False)
+@cache_control(Config.CACHE_CONTROL_PRIVATE)
+@auth_required
+async def get_settings(user):
+    try:
+        projection = build_projection(request.args.get("fields"), SettingsRepository.FIELDS)
+    except ValueError as e:
+        return error_response("invalid_fields", details=str(e))
+
+    response = await check_not_modified_async(lambda: settings_repo.get_settings_version(user_id=user["id"]))
+    if response:
+        return response
+
+    projection, strip_updated_at = with_updated_at(projection)
+    settings = await settings_repo.get_settings_for_user(user_id=user["id"], projection=projection)
+    if not settings:
+        return error_response("list_not_found", HTTPStatus.NOT_FOUND)
+    return await document_response_async(settings, strip_updated_at=strip_updated_at)
+
+
+@settings_bp.put("/", strict_slashes=False)
+@auth_required
+@validate_body(SettingsUpdateSchema)
+async def update_settings(user, data: SettingsUpdateSchema):
+    updates = {k: v for k, v in data.model_dump(exclude_unset=True).items()}
+    if not updates:
+        return error_response("no_updates_provided")
+
+    updated_settings = await settings_repo.update_settings_for_user(user_id=user["id"], updates=updates)
+    if not updated_settings:
+        return error_response("settings_not_found", HTTPStatus.NOT_FOUND)
+    return jsonify(serialize_document(updated_settings)), HTTPStatus.OK
@@ -1,9 +1,23 @@
 from datetime import datetime
 
+from pymongo import ASCENDING, IndexModel, ReturnDocument
+
 from app.extensions.mongo import get_mongo_db, parse_object_id
 
 
 class SettingsRepository:
+    INDEXES = {
+        "settings": [
+            IndexModel([("user_id", ASCENDING)], name="settings_user_id_unique", unique=True),
+        ],
+    }
+
+    # Fields clients may request through `?fields=`.
+    FIELDS = frozenset({
+        "user_id", "loginAlerts", "trustedDevices", "analyticsTracking", "personalizedRecommendations",
+        "darkMode", "compactProductLayout", "created_at", "updated_at",
+    })
+
     def __init__(self):
         pass
 
@@ -15,11 +29,16 @@ class SettingsRepository:
     def settings(self):
         return self.db.settings
 
-    def get_settings_for_user(self, user_id: str):
-        return self.settings.find_one({"user_id": parse_object_id(user_id)})
+    def get_settings_for_user(self, user_id: str, projection: dict = None):
+        return self.settings.find_one({"user_id": parse_object_id(user_id)}, projection)
 
-    def create_settings(self, user_id: str):
-        settings_data = {
+    def get_settings_version(self, user_id: str):
+        return self.settings.find_one({"user_id": parse_object_id(user_id)}, {"updated_at": 1})
+
+    @staticmethod
+    def build_settings(user_id: str):
+        now = datetime.now()
+        return {
             "user_id": parse_object_id(user_id),
             "loginAlerts": True,
             "trustedDevices": True,
@@ -27,15 +46,19 @@ class SettingsRepository:
             "personalizedRecommendations": False,
             "darkMode": None,
             "compactProductLayout": False,
-            "created_at": datetime.now(),
-            "updated_at": datetime.now()
+            "created_at": now,
+            "updated_at": now
         }
-        inserted_id = self.settings.insert_one(settings_data).inserted_id
-        return self.settings.find_one({"_id": inserted_id})
+
+    def create_settings(self, user_id: str):
+        settings_data = self.build_settings(user_id=user_id)
+        self.settings.insert_one(settings_data)
+        return settings_data
 
     def update_settings_for_user(self, user_id: str, updates: dict):
         updates["updated_at"] = datetime.now()
-        result = self.settings.update_one({"user_id": parse_object_id(user_id)}, {"$set": updates})
-        if result.matched_count == 0:
-            return None
-        return self.settings.find_one({"user_id": parse_object_id(user_id)})
\ No newline at end of file
+        return self.settings.find_one_and_update(
+            {"user_id": parse_object_id(user_id)},
+            {"$set": updates},
+            return_document=ReturnDocument.AFTER,
+        )
\ No newline at end of file
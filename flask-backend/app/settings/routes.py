@@ -1,9 +1,12 @@
 from http import HTTPStatus
 from flask import Blueprint, jsonify, request
-from pydantic import BaseModel, ValidationError, Field
+from pydantic import BaseModel, Field
 from typing import Optional
 
-from app.extensions.mongo import serialize_document
+from app.config import Config
+from app.extensions.http_cache import cache_control, check_not_modified, document_response, with_updated_at
+from app.extensions.mongo import build_projection, serialize_document
+from app.extensions.validation import validate_body
 from app.auth import auth_required
 from app.settings import SettingsRepository
 from app.utils import error_response
@@ -23,25 +26,29 @@ class SettingsUpdateSchema(BaseModel):
 
 
 @settings_bp.get("/", strict_slashes = False)
+@cache_control(Config.CACHE_CONTROL_PRIVATE)
 @auth_required
 def get_settings(user):
-    settings = settings_repo.get_settings_for_user(user_id=user["id"])
+    try:
+        projection = build_projection(request.args.get("fields"), SettingsRepository.FIELDS)
+    except ValueError as e:
+        return error_response("invalid_fields", details=str(e))
+
+    response = check_not_modified(lambda: settings_repo.get_settings_version(user_id=user["id"]))
+    if response:
+        return response
+
+    projection, strip_updated_at = with_updated_at(projection)
+    settings = settings_repo.get_settings_for_user(user_id=user["id"], projection=projection)
     if not settings:
         return error_response("list_not_found", HTTPStatus.NOT_FOUND)
-    return jsonify(serialize_document(settings)), HTTPStatus.OK
+    return document_response(settings, strip_updated_at=strip_updated_at)
 
 
 @settings_bp.put("/", strict_slashes = False)
 @auth_required
-def update_settings(user):
-    payload = request.get_json()
-    if payload is None:
-        return error_response("invalid_json")
-    try:
-        data = SettingsUpdateSchema(**payload)
-    except ValidationError as e:
-        return error_response("invalid_payload", details=e.errors(), status=HTTPStatus.BAD_REQUEST)
-
+@validate_body(SettingsUpdateSchema)
+def update_settings(user, data: SettingsUpdateSchema):
     updates = {k: v for k, v in data.model_dump(exclude_unset=True).items()}
     if not updates:
         return error_response("no_updates_provided")
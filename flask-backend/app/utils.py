@@ -1,5 +1,38 @@
+import sys
 from http import HTTPStatus
-from flask import jsonify
+
+from flask import current_app, has_app_context, jsonify
+
+
+def _quart_app():
+    # Quart is optional: without it imported there cannot be a Quart app context.
+    quart = sys.modules.get("quart")
+    if quart is not None and not has_app_context() and quart.has_app_context():
+        return quart.current_app
+    return None
+
+
+def current_config():
+    """The config of the app serving the request, Flask or Quart."""
+    quart_app = _quart_app()
+    return quart_app.config if quart_app is not None else current_app.config
+
+
+def json_response(body: any):
+    """
+    Serialize `body` with the JSON provider of the app serving the request.
+
+    Under ASGI the async handlers run in a Quart app context instead of a Flask one,
+    so helpers shared by both stacks build their responses through this.
+
+    Args:
+        body (any): JSON-serializable response body.
+
+    Returns:
+        Response: A Flask or Quart JSON response.
+    """
+    quart_app = _quart_app()
+    return quart_app.json.response(body) if quart_app is not None else jsonify(body)
 
 
 def error_response(error: str, status: HTTPStatus = HTTPStatus.BAD_REQUEST, details: any = None):
@@ -12,9 +45,9 @@ def error_response(error: str, status: HTTPStatus = HTTPStatus.BAD_REQUEST, deta
         details (Any, optional): Additional details to include in the response.
 
     Returns:
-        Tuple[Response, int]: Flask JSON response and HTTP status code.
+        Tuple[Response, int]: JSON response and HTTP status code.
     """
     body = {"error": error}
     if details:
         body["details"] = details
-    return jsonify(body), status
\ No newline at end of file
+    return json_response(body), status
@@ -0,0 +1,181 @@
+"""
+Concurrent slow requests against the sync (WSGI) and async (ASGI) servers.
+
+Opens `--concurrency` keep-alive connections at once and has each send requests back
+to back for `--seconds`, then reports throughput, latency percentiles and errors. The
+scenarios are the endpoints that spend their time waiting on I/O:
+
+- `checkout`: `GET /orders/<id>/checkout?wait=N` on an order no worker picks up, so
+  every request holds its connection for the full long-poll wait.
+- `list`: `GET /lists/<id>?expand=products` on a wishlist of `--list-size` products.
+
+Start the server under test first, against the same MongoDB and Redis, e.g.
+
+    gunicorn -w 1 --threads 32 'app:create_app()' -b 127.0.0.1:5000
+    hypercorn -w 1 asgi:app -b 127.0.0.1:5000
+
+A threaded server answers at most `threads` long polls at a time and the rest queue;
+the async server holds all of them on one event loop.
+
+Usage:
+    python -m benchmarks.async_load --url http://127.0.0.1:5000 --scenario checkout --concurrency 100 500 2000
+"""
+import argparse
+import asyncio
+import json
+import resource
+import statistics
+import time
+import uuid
+from typing import Optional
+from urllib.parse import urlsplit
+
+
+class Connection:
+    """A minimal HTTP/1.1 keep-alive client; enough for JSON responses with a Content-Length."""
+
+    def __init__(self, host: str, port: int, cookie: Optional[str] = None):
+        self.host = host
+        self.port = port
+        self.cookie = cookie
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def request(self, method: str, path: str, body: Optional[dict] = None):
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        payload = json.dumps(body).encode() if body is not None else b""
+        headers = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}", f"Content-Length: {len(payload)}"]
+        if body is not None:
+            headers.append("Content-Type: application/json")
+        if self.cookie:
+            headers.append(f"Cookie: {self.cookie}")
+        self._writer.write(("\r\n".join(headers) + "\r\n\r\n").encode() + payload)
+        await self._writer.drain()
+
+        head = await self._reader.readuntil(b"\r\n\r\n")
+        status_line, *header_lines = head.decode("latin-1").split("\r\n")
+        response_headers = {}
+        for line in header_lines:
+            if line:
+                name, _, value = line.partition(":")
+                response_headers.setdefault(name.strip().lower(), []).append(value.strip())
+        length = int(response_headers.get("content-length", ["0"])[0])
+        data = await self._reader.readexactly(length)
+        if response_headers.get("connection", [""])[0].lower() == "close":
+            await self.close()
+        return int(status_line.split()[1]), response_headers, data
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except OSError:
+                pass
+        self._reader = self._writer = None
+
+
+async def _setup(host: str, port: int, scenario: str, list_size: int, wait: int):
+    conn = Connection(host, port)
+    email = f"load-{uuid.uuid4().hex[:12]}@example.com"
+    status, headers, data = await conn.request("POST", "/auth/register", {"name": "Load", "email": email, "password": "load-test-password"})
+    if status != 201:
+        raise SystemExit(f"register failed: {status} {data[:200]!r}")
+    conn.cookie = "; ".join(cookie.split(";", 1)[0] for cookie in headers.get("set-cookie", []))
+
+    if scenario == "checkout":
+        item = {"product_id": "load-test", "product_name": "Load test", "amount": 1, "quantity": 1, "currency": "USD"}
+        status, _, data = await conn.request("POST", "/orders/", {"items": [item], "name": "Load", "address": "1 Benchmark Street"})
+        if status != 202:
+            raise SystemExit(f"order failed: {status} {data[:200]!r}")
+        path = f"/orders/{json.loads(data)['order_id']}/checkout?wait={wait}"
+    else:
+        _, _, data = await conn.request("GET", f"/products/?limit={list_size}&fields=name")
+        product_ids = [product["id"] for product in json.loads(data)["items"]]
+        _, _, data = await conn.request("GET", "/lists/")
+        list_id = json.loads(data)["items"][0]["id"]
+        for product_id in product_ids:
+            await conn.request("POST", f"/lists/{list_id}/product/{product_id}")
+        path = f"/lists/{list_id}?expand=products"
+    await conn.close()
+    return conn.cookie, path
+
+
+async def _run(host: str, port: int, cookie: str, path: str, concurrency: int, seconds: float):
+    latencies: list[float] = []
+    errors: dict[str, int] = {}
+    deadline = time.perf_counter() + seconds
+
+    async def client():
+        conn = Connection(host, port, cookie)
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                status, _, _ = await conn.request("GET", path)
+            except (OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError) as e:
+                errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+                await conn.close()
+                await asyncio.sleep(0.1)
+                continue
+            if status >= 500 or status == 429:
+                errors[str(status)] = errors.get(str(status), 0) + 1
+            else:
+                latencies.append((time.perf_counter() - started) * 1000)
+        await conn.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+
+    def percentile(p: float):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] if latencies else 0.0
+
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50": statistics.median(latencies) if latencies else 0.0,
+        "p95": percentile(0.95),
+        "p99": percentile(0.99),
+        "ok": len(latencies),
+        "errors": errors,
+    }
+
+
+async def main_async(args):
+    url = urlsplit(args.url)
+    host, port = url.hostname, url.port or 80
+    cookie, path = await _setup(host, port, args.scenario, args.list_size, args.wait)
+    print(f"scenario={args.scenario} path={path} seconds={args.seconds}")
+    print(f"{'conc':>6} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'ok':>7}  errors")
+    for concurrency in args.concurrency:
+        result = await _run(host, port, cookie, path, concurrency, args.seconds)
+        errors = ", ".join(f"{name}={count}" for name, count in sorted(result["errors"].items())) or "-"
+        print(
+            f"{concurrency:>6} {result['rps']:>8.1f} {result['p50']:>9.1f} {result['p95']:>9.1f} "
+            f"{result['p99']:>9.1f} {result['ok']:>7}  {errors}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:5000")
+    parser.add_argument("--scenario", choices=["checkout", "list"], default="checkout")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--wait", type=int, default=2, help="Long-poll wait for the checkout scenario")
+    parser.add_argument("--list-size", type=int, default=50, help="Products on the list for the list scenario")
+    args = parser.parse_args()
+
+    # Every connection is a file descriptor on this side too.
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    wanted = max(args.concurrency) + 64
+    if soft < wanted:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(wanted, hard), hard))
+
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
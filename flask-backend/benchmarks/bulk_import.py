@@ -0,0 +1,78 @@
+"""
+Throughput of `POST /products/bulk` against one `POST /products` per row.
+
+Registers a throwaway user, streams a generated NDJSON catalog through the bulk
+endpoint at each batch size, then times a sample of single-product requests for
+comparison. Runs against the configured MongoDB/Redis; use a scratch database.
+
+Usage:
+    MONGO_DB=ecommerce_bench python -m benchmarks.bulk_import --rows 100000 --batch-sizes 500 1000 5000
+"""
+import argparse
+import random
+import time
+import uuid
+
+import orjson
+
+from app import create_app
+
+
+def _row(i: int):
+    return {
+        "name": f"Bulk product {i}",
+        "price": round(random.uniform(1, 500), 2),
+        "currency": "USD",
+        "description": "Imported by the bulk benchmark. " * 4,
+        "inventory": random.randint(0, 1000),
+        "category": random.choice(["electronics", "books", "garden", "toys"]),
+        "images": [f"https://cdn.example.com/bulk/{i}/0.jpg"],
+        "attributes": {"color": random.choice(["red", "blue", "black"]), "sku": f"SKU-{i:07d}"},
+    }
+
+
+def _ndjson(rows: list[dict]):
+    return b"".join(orjson.dumps(row) + b"\n" for row in rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[500, 1000, 5000])
+    parser.add_argument("--single-sample", type=int, default=1000, help="Rows sent one request at a time")
+    args = parser.parse_args()
+
+    app = create_app()
+    client = app.test_client()
+    email = f"bench-{uuid.uuid4().hex[:8]}@example.com"
+    client.post("/auth/register", json={"name": "Bench", "email": email, "password": "password123"})
+
+    rows = [_row(i) for i in range(args.rows)]
+    body = _ndjson(rows)
+    print(f"{'mode':<22} {'rows':>8} {'seconds':>8} {'rows/sec':>10}")
+
+    for batch_size in args.batch_sizes:
+        started = time.perf_counter()
+        response = client.post(
+            f"/products/bulk?batch_size={batch_size}",
+            data=body,
+            content_type="application/x-ndjson",
+        )
+        elapsed = time.perf_counter() - started
+        report = response.get_json()
+        if report.get("failed"):
+            print(f"  {report['failed']} rows failed, first errors: {report['errors'][:3]}")
+        print(f"{f'bulk batch={batch_size}':<22} {report['inserted']:>8} {elapsed:>8.2f} {report['inserted'] / elapsed:>10.0f}")
+
+    sample = rows[:args.single_sample]
+    started = time.perf_counter()
+    for row in sample:
+        client.post("/products/", json=row)
+    elapsed = time.perf_counter() - started
+    print(f"{'POST /products':<22} {len(sample):>8} {elapsed:>8.2f} {len(sample) / elapsed:>10.0f}")
+
+    client.delete("/auth/delete")
+
+
+if __name__ == "__main__":
+    main()
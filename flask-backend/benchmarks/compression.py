@@ -0,0 +1,82 @@
+"""
+CPU cost vs. bytes saved for each response codec on product list pages.
+
+Builds `GET /products` bodies of several page sizes from realistic product documents
+and reports, per codec and level, the compressed size, the compression ratio and the
+time to compress one page.
+
+Usage:
+    python -m benchmarks.compression --page-sizes 20 50 100 --levels gzip:1,6,9 br:1,4,11 zstd:1,3,10
+"""
+import argparse
+import random
+import timeit
+
+from flask import Flask
+
+from app.extensions.compression import CODECS, compress
+from app.extensions.json_provider import MongoJSONProvider
+from app.extensions.mongo import serialize_document
+from benchmarks.json_serialization import _product
+
+WORDS = (
+    "wireless ergonomic aluminium compact premium waterproof rechargeable bluetooth adjustable "
+    "lightweight durable portable stainless ceramic organic cotton leather vintage modern classic"
+).split()
+
+
+def _realistic_product(i: int, rng: random.Random):
+    product = _product(i)
+    # Vary the text so the codecs cannot simply collapse identical descriptions.
+    product["description"] = " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 120))).capitalize() + "."
+    product["attributes"] = {
+        "color": rng.choice(["black", "white", "red", "blue", "green"]),
+        "material": rng.choice(["plastic", "metal", "wood", "fabric"]),
+        "sku": f"SKU-{rng.randint(0, 10**7):07d}",
+        "dimensions": {"w": rng.randint(1, 50), "h": rng.randint(1, 50), "d": rng.randint(1, 50)},
+    }
+    return product
+
+
+def _parse_levels(specs: list[str]):
+    levels = {}
+    for spec in specs:
+        name, _, values = spec.partition(":")
+        levels[name] = [int(value) for value in values.split(",")]
+    return levels
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[20, 50, 100])
+    parser.add_argument("--levels", nargs="+", default=["gzip:1,6,9", "br:1,4,11", "zstd:1,3,10"])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    provider = MongoJSONProvider(Flask(__name__))
+    rng = random.Random(args.seed)
+    levels = _parse_levels(args.levels)
+    missing = [name for name in levels if name not in CODECS]
+    if missing:
+        print(f"Skipping codecs that are not installed: {', '.join(missing)}")
+
+    print(f"{'page':>5} {'codec':>6} {'level':>5} {'bytes':>9} {'ratio':>6} {'saved':>9} {'ms/page':>8} {'MB/s':>7}")
+    for size in args.page_sizes:
+        page = [serialize_document(_realistic_product(i, rng)) for i in range(size)]
+        body = provider.dumps_bytes({"items": page, "next_cursor": None})
+        print(f"{size:>5} {'none':>6} {'-':>5} {len(body):>9} {1.0:>6.2f} {0:>9} {0:>8.2f} {'-':>7}")
+        for name, codec_levels in levels.items():
+            if name not in CODECS:
+                continue
+            for level in codec_levels:
+                compressed = compress(name, body, level)
+                seconds = min(timeit.repeat(lambda: compress(name, body, level), number=1, repeat=args.repeat))
+                print(
+                    f"{size:>5} {name:>6} {level:>5} {len(compressed):>9} {len(body) / len(compressed):>6.2f} "
+                    f"{len(body) - len(compressed):>9} {seconds * 1000:>8.2f} {len(body) / seconds / 1e6:>7.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
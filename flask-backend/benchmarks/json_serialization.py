@@ -0,0 +1,75 @@
+"""
+Micro-benchmark of JSON response encoding for lists of product documents.
+
+Compares the previous path (recursive `_serialize_recursive` copy followed by Flask's
+stdlib JSON provider) with the single-pass orjson provider.
+
+Usage:
+    python -m benchmarks.json_serialization --sizes 50 500 5000
+"""
+import argparse
+import copy
+import timeit
+from datetime import datetime
+
+from bson import ObjectId
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.extensions.json_provider import MongoJSONProvider
+from app.extensions.mongo import serialize_document, serialize_id, _serialize_recursive
+
+
+def _product(i: int):
+    return {
+        "_id": ObjectId(),
+        "user_id": ObjectId(),
+        "name": f"Product {i}",
+        "description": "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 8,
+        "price": 19.99 + i,
+        "currency": "USD",
+        "inventory": i % 100,
+        "category": "electronics",
+        "images": [f"https://cdn.example.com/products/{i}/{n}.jpg" for n in range(4)],
+        "attributes": {"color": "black", "weight": "1.2kg", "dimensions": {"w": 10, "h": 20, "d": 5}},
+        "average_review": 4.2,
+        "reviews": 17,
+        "created_at": datetime.now(),
+        "updated_at": datetime.now(),
+    }
+
+
+def _legacy_encode(provider: DefaultJSONProvider, documents: list[dict]):
+    serialized = []
+    for document in documents:
+        item = _serialize_recursive(document)
+        item["id"] = serialize_id(item.pop("_id"))
+        serialized.append(item)
+    return provider.dumps(serialized).encode("utf-8")
+
+
+def _orjson_encode(provider: MongoJSONProvider, documents: list[dict]):
+    return provider.dumps_bytes([serialize_document(document) for document in documents])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500, 5000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    legacy, fast = DefaultJSONProvider(app), MongoJSONProvider(app)
+
+    print(f"{'documents':>10} {'legacy ms':>10} {'orjson ms':>10} {'speedup':>8}")
+    for size in args.sizes:
+        documents = [_product(i) for i in range(size)]
+        # serialize_document renames `_id` in place, so give every run a fresh copy.
+        copies = [copy.deepcopy(documents) for _ in range(args.repeat)]
+        legacy_ms = min(timeit.repeat(lambda: _legacy_encode(legacy, documents), number=1, repeat=args.repeat)) * 1000
+        fast_ms = min(timeit.repeat(lambda: _orjson_encode(fast, copies.pop()), number=1, repeat=args.repeat)) * 1000
+        print(f"{size:>10} {legacy_ms:>10.2f} {fast_ms:>10.2f} {legacy_ms / fast_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,374 @@
+"""
+Per-endpoint latency and throughput of every blueprint, with regression checks against stored baselines.
+
+Builds the app with `create_app()`, seeds a scratch database with `benchmarks.seed`,
+logs in a pool of seeded users and then sends `--requests` requests to each scenario
+through Flask's test client, so the numbers cover routing, auth, validation,
+serialization and the MongoDB/Redis round trips, but not the HTTP server. Payments
+use the stub provider (`PAYMENT_PROVIDER=stub`) and rate limits are disabled.
+
+Backends:
+    local  start a throwaway `mongod` and `redis-server` from PATH on free ports
+    env    use MONGO_URI / REDIS_HOST / REDIS_PORT as configured, with `--db` as database
+    fake   in-memory mongomock and fakeredis (`pip install mongomock fakeredis lupa`);
+           text search is skipped and latencies are not comparable with the others
+
+Results are compared with `benchmarks/baselines/<backend>-<scale>.json` when it exists,
+and the run fails if a metric is more than `--max-regression` percent worse.
+`--save-baseline` records the current run as the new baseline instead.
+
+Usage:
+    python -m benchmarks.load_suite --backend local --scale 100k
+    python -m benchmarks.load_suite --backend local --scale 100k --save-baseline
+    python -m benchmarks.load_suite --backend fake --only products. lists. --max-regression 30
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import ExitStack, closing
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Optional
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+
+LATENCY_METRICS = ("p50", "p95", "p99")
+
+
+@dataclass
+class Context:
+    """Seeded ids and logged-in users that scenarios build requests from."""
+
+    data: any
+    users: list[dict] = field(default_factory=list)
+    rng: random.Random = field(default_factory=lambda: random.Random(7))
+
+    def user(self):
+        return self.rng.choice(self.users)
+
+    def product_id(self):
+        return self.rng.choice(self.data.product_ids)
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    method: str
+    path: Callable[[Context, dict], str]
+    body: Optional[Callable[[Context, dict], dict]] = None
+    auth: bool = True
+    text_search: bool = False
+    expect: tuple[int, ...] = (200,)
+
+
+def _order_body(ctx: Context, user: dict):
+    items = [
+        {"product_id": ctx.product_id(), "product_name": "Bench product", "amount": 19.99, "quantity": 1, "currency": "USD"}
+        for _ in range(ctx.rng.randint(1, 3))
+    ]
+    return {"items": items, "name": "Bench User", "address": "1 Benchmark Street"}
+
+
+SCENARIOS = [
+    Scenario("products.list", "GET", lambda ctx, u: "/products/?limit=20", auth=False),
+    Scenario("products.list_card", "GET", lambda ctx, u: "/products/?limit=50&fields=card", auth=False),
+    Scenario("products.list_ids", "GET", lambda ctx, u: "/products/?ids=" + ",".join(ctx.rng.sample(ctx.data.product_ids, 10)), auth=False),
+    Scenario("products.search", "GET", lambda ctx, u: "/products/?query=wireless+headphones&limit=20", auth=False, text_search=True),
+    Scenario("products.detail", "GET", lambda ctx, u: f"/products/{ctx.product_id()}", auth=False),
+    Scenario("products.reviews", "GET", lambda ctx, u: f"/products/{ctx.rng.choice(ctx.data.reviewed_product_ids)}/reviews", auth=False),
+    Scenario(
+        "auth.login", "POST", lambda ctx, u: "/auth/login", auth=False,
+        body=lambda ctx, u: {"email": ctx.rng.choice(ctx.data.emails), "password": ctx.data.password},
+    ),
+    Scenario("auth.sessions", "GET", lambda ctx, u: "/auth/sessions"),
+    Scenario("orders.list", "GET", lambda ctx, u: "/orders/"),
+    Scenario("orders.create", "POST", lambda ctx, u: "/orders/", body=_order_body, expect=(202,)),
+    Scenario("orders.checkout_status", "GET", lambda ctx, u: f"/orders/{u['order_id']}/checkout"),
+    Scenario("lists.list", "GET", lambda ctx, u: "/lists/"),
+    Scenario("lists.expand", "GET", lambda ctx, u: f"/lists/{u['list_id']}?expand=products"),
+    Scenario("lists.add_product", "POST", lambda ctx, u: f"/lists/{u['list_id']}/product/{ctx.product_id()}"),
+    Scenario("settings.get", "GET", lambda ctx, u: "/settings/"),
+    Scenario("settings.update", "PUT", lambda ctx, u: "/settings/", body=lambda ctx, u: {"darkMode": ctx.rng.random() < 0.5}),
+]
+
+
+def _free_port():
+    with closing(socket.socket()) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_port(port: int, process: subprocess.Popen, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"{process.args[0]} exited with {process.returncode}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise SystemExit(f"{process.args[0]} did not start listening on {port}")
+
+
+def _start_local_services(stack: ExitStack):
+    mongod, redis_server = shutil.which("mongod"), shutil.which("redis-server")
+    if not mongod or not redis_server:
+        raise SystemExit("--backend local needs mongod and redis-server on PATH")
+    workdir = stack.enter_context(tempfile.TemporaryDirectory(prefix="load-suite-"))
+    mongo_port, redis_port = _free_port(), _free_port()
+
+    for args, port in [
+        ([mongod, "--dbpath", workdir, "--port", str(mongo_port), "--bind_ip", "127.0.0.1", "--quiet"], mongo_port),
+        ([redis_server, "--port", str(redis_port), "--save", "", "--appendonly", "no"], redis_port),
+    ]:
+        process = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        stack.callback(process.wait, timeout=30)
+        stack.callback(process.terminate)
+        _wait_for_port(port, process)
+
+    os.environ["MONGO_URI"] = f"mongodb://127.0.0.1:{mongo_port}"
+    os.environ["REDIS_HOST"] = "127.0.0.1"
+    os.environ["REDIS_PORT"] = str(redis_port)
+
+
+def _use_fakes(app):
+    try:
+        import fakeredis
+        import mongomock
+    except ImportError:
+        raise SystemExit("--backend fake needs mongomock and fakeredis: pip install mongomock fakeredis lupa") from None
+    client = mongomock.MongoClient()
+    app.mongo_client = client
+    app.mongo_client_pid = os.getpid()
+    app.redis_client = fakeredis.FakeRedis(decode_responses=True)
+
+
+def _cookie(response, name: str):
+    for header in response.headers.getlist("Set-Cookie"):
+        key, _, rest = header.partition("=")
+        if key == name:
+            return f"{name}={rest.split(';', 1)[0]}"
+    return None
+
+
+def _login_users(client, ctx: Context, count: int, cookie_name: str):
+    for email in ctx.rng.sample(ctx.data.emails, min(count, len(ctx.data.emails))):
+        response = client.post("/auth/login", json={"email": email, "password": ctx.data.password})
+        if response.status_code != 200:
+            raise SystemExit(f"login failed for {email}: {response.status_code} {response.get_data(as_text=True)[:200]}")
+        headers = {"Cookie": _cookie(response, cookie_name)}
+        list_id = client.get("/lists/", headers=headers).get_json()["items"][0]["id"]
+        order_id = client.get("/orders/?limit=1", headers=headers).get_json()["items"][0]["id"]
+        ctx.users.append({"email": email, "headers": headers, "list_id": list_id, "order_id": order_id})
+
+
+def _run_scenario(app, ctx: Context, scenario: Scenario, requests: int, warmup: int, threads: int):
+    latencies: list[float] = []
+    unexpected: dict[int, int] = {}
+    lock = threading.Lock()
+    per_thread = max(1, requests // threads)
+
+    def worker(measured: int, record: bool):
+        client = app.test_client(use_cookies=False)
+        for _ in range(measured):
+            with lock:
+                user = ctx.user()
+                path = scenario.path(ctx, user)
+                body = scenario.body(ctx, user) if scenario.body else None
+            headers = user["headers"] if scenario.auth else {}
+            started = time.perf_counter()
+            response = client.open(path, method=scenario.method, json=body, headers=headers)
+            elapsed = (time.perf_counter() - started) * 1000
+            response.close()
+            if not record:
+                continue
+            with lock:
+                if response.status_code in scenario.expect:
+                    latencies.append(elapsed)
+                else:
+                    unexpected[response.status_code] = unexpected.get(response.status_code, 0) + 1
+
+    worker(warmup, record=False)
+    pool = [threading.Thread(target=worker, args=(per_thread, True)) for _ in range(threads)]
+    started = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+
+    def percentile(p: float):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] if latencies else None
+
+    return {
+        "requests": len(latencies),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50": round(statistics.median(latencies), 3) if latencies else None,
+        "p95": round(percentile(0.95), 3) if latencies else None,
+        "p99": round(percentile(0.99), 3) if latencies else None,
+        "errors": {str(status): count for status, count in sorted(unexpected.items())},
+    }
+
+
+def compare(results: dict, baseline: dict, metrics: list[str], max_regression: float, min_delta_ms: float):
+    """
+    Find endpoints that got worse than the baseline by more than `max_regression` percent.
+
+    Latency metrics regress when they grow, `rps` when it shrinks. Latency changes smaller
+    than `min_delta_ms` are ignored, since a few tenths of a millisecond on a fast
+    endpoint are within run-to-run noise.
+
+    Args:
+        results (dict): Per-endpoint results of this run.
+        baseline (dict): Per-endpoint results of the baseline run.
+        metrics (list[str]): Metrics to check.
+        max_regression (float): Allowed slowdown in percent.
+        min_delta_ms (float): Smallest latency increase that can count as a regression.
+
+    Returns:
+        list[str]: One line per regression, or an empty list.
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        if current["errors"]:
+            regressions.append(f"{name}: unexpected responses {current['errors']}")
+        for metric in metrics:
+            now, before = current.get(metric), previous.get(metric)
+            if now is None or not before:
+                continue
+            if metric == "rps":
+                change = (before - now) / before * 100
+                worse = change > max_regression
+            else:
+                change = (now - before) / before * 100
+                worse = change > max_regression and now - before >= min_delta_ms
+            if worse:
+                regressions.append(f"{name}: {metric} {before} -> {now} ({change:+.0f}% worse)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=["local", "env", "fake"], default="local")
+    parser.add_argument("--scale", default="10k", help="10k, 100k or 1m (see benchmarks.seed)")
+    parser.add_argument("--db", default="ecommerce_bench", help="Scratch database; it is dropped and reseeded")
+    parser.add_argument("--no-seed", action="store_true", help="Reuse data from a previous run of the same scale")
+    parser.add_argument("--requests", type=int, default=300, help="Measured requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=30)
+    parser.add_argument("--threads", type=int, default=1, help="Concurrent clients per endpoint")
+    parser.add_argument("--users", type=int, default=50, help="Logged-in users the requests are spread over")
+    parser.add_argument("--only", nargs="+", default=None, help="Endpoint name prefixes to run, e.g. products. auth.login")
+    parser.add_argument("--baseline", type=Path, default=None, help="Defaults to baselines/<backend>-<scale>.json")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--metrics", nargs="+", default=["p50", "p95", "rps"], choices=[*LATENCY_METRICS, "rps"])
+    parser.add_argument("--max-regression", type=float, default=float(os.getenv("LOAD_TEST_MAX_REGRESSION_PCT", "20")))
+    parser.add_argument("--min-delta-ms", type=float, default=0.5)
+    parser.add_argument("--json", type=Path, default=None, help="Also write the results to this file")
+    args = parser.parse_args()
+
+    with ExitStack() as stack:
+        # Config reads the environment when it is imported, so the app comes after this.
+        if args.backend == "local":
+            _start_local_services(stack)
+        os.environ["MONGO_DB"] = args.db
+        os.environ["PAYMENT_PROVIDER"] = "stub"
+        os.environ["RATE_LIMIT_ENABLED"] = "0"
+        os.environ["MONGO_ENSURE_INDEXES"] = "0"  # seed() drops the collections and rebuilds them
+
+        from app import create_app
+        from app.config import Config
+        from app.extensions.mongo import get_mongo_db
+        from benchmarks.seed import PASSWORD, SCALES, SeededData, seed
+
+        app = create_app()
+        if args.backend == "fake":
+            _use_fakes(app)
+        db = get_mongo_db(app)
+
+        size = SCALES[args.scale]
+        if args.no_seed:
+            data = SeededData(
+                product_ids=[str(p["_id"]) for p in db.products.find({}, {"_id": 1}).limit(10_000)],
+                reviewed_product_ids=[str(p["_id"]) for p in db.products.find({"reviews": {"$gt": 0}}, {"_id": 1}).limit(1_000)],
+                emails=[u["email"] for u in db.users.find({"email": {"$regex": "@bench\\.example\\.com$"}}, {"email": 1}).limit(10_000)],
+                password=PASSWORD,
+            )
+        else:
+            started = time.perf_counter()
+            data = seed(db, products=size, users=size)
+            print(f"seeded {args.scale} in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+        ctx = Context(data=data)
+        _login_users(app.test_client(use_cookies=False), ctx, args.users, Config.JWT_COOKIE_NAME)
+
+        scenarios = [
+            s for s in SCENARIOS
+            if (not args.only or s.name.startswith(tuple(args.only))) and not (s.text_search and args.backend == "fake")
+        ]
+        results = {}
+        print(f"{'endpoint':<24} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}  errors")
+        for scenario in scenarios:
+            result = _run_scenario(app, ctx, scenario, args.requests, args.warmup, args.threads)
+            results[scenario.name] = result
+            cells = [f"{result[m]:>8.2f}" if result[m] is not None else f"{'-':>8}" for m in LATENCY_METRICS]
+            print(f"{scenario.name:<24} {result['rps']:>8.1f} {' '.join(cells)}  {result['errors'] or '-'}", flush=True)
+
+    report = {
+        "meta": {
+            "backend": args.backend,
+            "scale": args.scale,
+            "requests": args.requests,
+            "threads": args.threads,
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+            "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        },
+        "endpoints": results,
+    }
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2) + "\n")
+
+    baseline_path = args.baseline or BASELINE_DIR / f"{args.backend}-{args.scale}.json"
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"saved baseline to {baseline_path}")
+        return
+    if not baseline_path.exists():
+        print(f"no baseline at {baseline_path}; run with --save-baseline to record one")
+        return
+
+    regressions = compare(
+        results,
+        json.loads(baseline_path.read_text())["endpoints"],
+        metrics=args.metrics,
+        max_regression=args.max_regression,
+        min_delta_ms=args.min_delta_ms,
+    )
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.max_regression:g}% against {baseline_path}:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"\nno regressions over {args.max_regression:g}% against {baseline_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Compare request throughput with a MongoClient per request vs the pooled process-wide client.
+
+Requires a reachable MongoDB at `MONGO_URI`.
+
+Usage:
+    python -m benchmarks.mongo_pool --requests 2000 --threads 16
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pymongo import MongoClient
+
+from app import create_app
+from app.extensions.mongo import get_mongo_db
+
+
+def _per_request_ping(app):
+    with app.app_context():
+        client = MongoClient(app.config["MONGO_URI"])
+        try:
+            client[app.config["MONGO_DB"]].command("ping")
+        finally:
+            client.close()
+
+
+def _pooled_ping(app):
+    with app.app_context():
+        get_mongo_db().command("ping")
+
+
+def run(label: str, fn, app, requests: int, threads: int):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(lambda _: fn(app), range(requests)))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12} {requests} requests in {elapsed:.2f}s -> {requests / elapsed:,.0f} req/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=16)
+    args = parser.parse_args()
+
+    app = create_app()
+    run("per-request", _per_request_ping, app, args.requests, args.threads)
+    run("pooled", _pooled_ping, app, args.requests, args.threads)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Logins per second per core with inline hashing vs the password hashing pool.
+
+Runs `--threads` request threads that verify a password in a loop, like a threaded
+worker serving a login burst, while a probe thread measures how late a 1 ms sleep
+wakes up. The probe stands in for the other requests the worker is serving: with
+inline hashing they compete with every login thread for CPU, with the pool only
+`workers` processes hash at a time.
+
+Usage:
+    python -m benchmarks.password_hashing --threads 8 --pool-workers 1 2 4 --method scrypt
+"""
+import argparse
+import os
+import statistics
+import threading
+import time
+
+from werkzeug.security import generate_password_hash
+
+from app.auth.passwords import PasswordHasher
+
+PASSWORD = "correct horse battery staple"
+
+
+def _probe(stop: threading.Event, delays: list[float]):
+    while not stop.is_set():
+        started = time.perf_counter()
+        time.sleep(0.001)
+        delays.append((time.perf_counter() - started - 0.001) * 1000)
+
+
+def _run(hasher: PasswordHasher, pwhash: str, threads: int, seconds: float):
+    hasher.verify(pwhash, PASSWORD)  # start the pool outside the measurement
+    stop = threading.Event()
+    counts = [0] * threads
+    delays: list[float] = []
+
+    def login(index: int):
+        while not stop.is_set():
+            hasher.verify(pwhash, PASSWORD)
+            counts[index] += 1
+
+    workers = [threading.Thread(target=login, args=(i,)) for i in range(threads)]
+    workers.append(threading.Thread(target=_probe, args=(stop, delays)))
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    time.sleep(seconds)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+    hasher.shutdown()
+
+    delays.sort()
+    p99 = delays[int(len(delays) * 0.99)] if delays else 0.0
+    return sum(counts) / elapsed, statistics.median(delays) if delays else 0.0, p99
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=8, help="Concurrent login threads")
+    parser.add_argument("--pool-workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--method", default="scrypt")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    pwhash = generate_password_hash(PASSWORD, method=args.method)
+    print(f"method={pwhash.split('$', 1)[0]} threads={args.threads} cpus={os.cpu_count()}")
+    print(f"{'mode':<10} {'cores':>5} {'logins/s':>9} {'/s/core':>8} {'probe p50 ms':>13} {'probe p99 ms':>13}")
+
+    for workers in [0, *args.pool_workers]:
+        hasher = PasswordHasher(
+            method=args.method,
+            salt_length=16,
+            workers=workers,
+            max_pending=args.threads,
+            timeout_seconds=60,
+        )
+        rate, p50, p99 = _run(hasher, pwhash, args.threads, args.seconds)
+        cores = max(workers, 1)
+        mode = "inline" if not workers else "pool"
+        print(f"{mode:<10} {cores:>5} {rate:>9.1f} {rate / cores:>8.1f} {p50:>13.2f} {p99:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
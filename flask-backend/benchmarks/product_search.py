@@ -0,0 +1,98 @@
+"""
+Compare the legacy unanchored regex product search with the text-indexed search.
+
+Seeds a synthetic catalog into a scratch database in increasing steps and times both
+query styles at each size, so the linear growth of the regex scan can be compared with
+the index-backed search.
+
+Usage:
+    python -m benchmarks.product_search --sizes 10000 100000 1000000 --db ecommerce_bench
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+from datetime import datetime
+
+from pymongo import MongoClient
+
+from app.products.search import build_search_terms, ensure_search_index
+
+ADJECTIVES = ["wireless", "ergonomic", "vintage", "compact", "premium", "rugged", "organic", "smart", "portable", "classic"]
+NOUNS = ["keyboard", "headphones", "backpack", "lamp", "blender", "jacket", "watch", "speaker", "mug", "chair"]
+CATEGORIES = ["electronics", "home", "outdoor", "kitchen", "apparel", "office"]
+COLORS = ["red", "blue", "black", "white", "green", "silver"]
+QUERIES = ["wireless headphones", "vintage lamp", "ergonomic chair", "rugged backpack", "smart watch"]
+
+
+def _product(i: int):
+    rng = random.Random(i)
+    attributes = {"color": rng.choice(COLORS), "material": rng.choice(["steel", "cotton", "plastic", "wood"])}
+    name = f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {i}"
+    return {
+        "name": name,
+        "description": " ".join(rng.choices(ADJECTIVES + NOUNS + COLORS, k=30)),
+        "category": rng.choice(CATEGORIES),
+        "price": round(rng.uniform(1, 500), 2),
+        "currency": "USD",
+        "attributes": attributes,
+        "search_terms": build_search_terms(attributes),
+        "created_at": datetime.now(),
+    }
+
+
+def _seed(collection, start: int, stop: int, batch_size: int = 10_000):
+    for offset in range(start, stop, batch_size):
+        collection.insert_many([_product(i) for i in range(offset, min(offset + batch_size, stop))], ordered=False)
+
+
+def _time(fn, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--mongo-uri", default=os.getenv("MONGO_URI", "mongodb://localhost:27017"))
+    parser.add_argument("--db", default="ecommerce_bench")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+
+    client = MongoClient(args.mongo_uri)
+    collection = client[args.db].products
+    collection.drop()
+    ensure_search_index(collection)
+    collection.create_index([("created_at", -1)])
+
+    seeded = 0
+    print(f"{'products':>10} {'regex ms':>10} {'text ms':>10}")
+    for size in sorted(args.sizes):
+        _seed(collection, seeded, size)
+        seeded = size
+
+        def regex_search():
+            for query in QUERIES:
+                list(collection.find({"name": {"$regex": query, "$options": "i"}}).sort("created_at", -1).limit(args.limit))
+
+        def text_search():
+            for query in QUERIES:
+                list(
+                    collection.find({"$text": {"$search": query}}, {"score": {"$meta": "textScore"}})
+                    .sort([("score", {"$meta": "textScore"})])
+                    .limit(args.limit)
+                )
+
+        print(f"{size:>10,} {_time(regex_search, args.repeat):>10.1f} {_time(text_search, args.repeat):>10.1f}")
+
+    collection.drop()
+
+
+if __name__ == "__main__":
+    main()
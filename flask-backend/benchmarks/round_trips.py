@@ -0,0 +1,62 @@
+"""
+Count MongoDB round trips issued by each write endpoint.
+
+Drives a register -> write flow through the Flask test client against the configured
+MongoDB/Redis and prints the number of database commands each request sent.
+
+Usage:
+    MONGO_DB=ecommerce_bench python -m benchmarks.round_trips
+"""
+import threading
+import uuid
+
+from pymongo import monitoring
+
+from app import create_app
+
+
+class CommandCounter(monitoring.CommandListener):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def started(self, event):
+        with self._lock:
+            self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+def main():
+    app = create_app()
+    counter = CommandCounter()
+    app.mongo_event_listeners.append(counter)
+    client = app.test_client()
+
+    def call(label: str, method: str, url: str, **kwargs):
+        before = counter.count
+        response = client.open(url, method=method, **kwargs)
+        print(f"{label:<34} {response.status_code:>4} {counter.count - before:>3} round trips")
+        return response.get_json()
+
+    email = f"bench-{uuid.uuid4().hex[:8]}@example.com"
+    call("POST /auth/register", "POST", "/auth/register", json={"name": "Bench", "email": email, "password": "password123"})
+    call("POST /auth/login", "POST", "/auth/login", json={"email": email, "password": "password123"})
+    product = call("POST /products", "POST", "/products/", json={"name": "Bench product", "price": 9.5, "currency": "USD"})
+    call("PUT /products/<id>", "PUT", f"/products/{product['id']}", json={
+        "name": "Bench product", "price": 10.5, "currency": "USD", "description": "", "inventory": 1, "category": None,
+    })
+    lst = call("POST /lists", "POST", "/lists/", json={"name": "Bench list"})
+    call("PUT /lists/<id>", "PUT", f"/lists/{lst['id']}", json={"name": "Renamed"})
+    call("POST /lists/<id>/product/<pid>", "POST", f"/lists/{lst['id']}/product/{product['id']}")
+    call("DELETE /lists/<id>/product/<pid>", "DELETE", f"/lists/{lst['id']}/product/{product['id']}")
+    call("PUT /settings", "PUT", "/settings/", json={"darkMode": True})
+    call("DELETE /auth/delete", "DELETE", "/auth/delete")
+
+
+if __name__ == "__main__":
+    main()
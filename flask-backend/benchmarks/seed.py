@@ -0,0 +1,205 @@
+"""
+Synthetic data for load tests: a product catalog, users and their per-user documents.
+
+Documents are built with the repositories' own `build_*` helpers, so they have the
+shape the app writes. Every user gets settings, a wishlist, orders and the shared
+`PASSWORD`, and a share of the products get reviews with matching aggregates. The
+declared indexes are created afterwards, as `flask db ensure-indexes` would.
+
+Scales:
+    10k    10,000 products and 10,000 users
+    100k   100,000 products and 100,000 users
+    1m     1,000,000 products and 1,000,000 users
+
+Usage:
+    python -m benchmarks.seed --scale 100k --db ecommerce_bench
+"""
+import argparse
+import os
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from pymongo import MongoClient
+from pymongo.database import Database
+from werkzeug.security import generate_password_hash
+
+from app import INDEXED_REPOSITORIES
+from app.config import Config
+from app.extensions.mongo import ensure_indexes
+from app.lists import ListsRepository
+from app.orders import OrdersRepository
+from app.products import ProductsRepository
+from app.products.reviews import RATINGS
+from app.settings import SettingsRepository
+
+PASSWORD = "load-test-password"
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+ADJECTIVES = ["wireless", "ergonomic", "vintage", "compact", "premium", "rugged", "organic", "smart", "portable", "classic"]
+NOUNS = ["keyboard", "headphones", "backpack", "lamp", "blender", "jacket", "watch", "speaker", "mug", "chair"]
+CATEGORIES = ["electronics", "home", "outdoor", "kitchen", "apparel", "office"]
+COLORS = ["red", "blue", "black", "white", "green", "silver"]
+
+
+@dataclass
+class SeededData:
+    """Ids and credentials the load test picks its requests from."""
+
+    product_ids: list[str]
+    reviewed_product_ids: list[str]
+    emails: list[str]
+    password: str = PASSWORD
+
+
+def _product(i: int, rng: random.Random, seller_id: ObjectId, created_at: datetime):
+    attributes = {"color": rng.choice(COLORS), "material": rng.choice(["steel", "cotton", "plastic", "wood"])}
+    product = ProductsRepository.build_product(seller_id, {
+        "name": f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {i}",
+        "description": " ".join(rng.choices(ADJECTIVES + NOUNS + COLORS, k=30)),
+        "category": rng.choice(CATEGORIES),
+        "price": round(rng.uniform(1, 500), 2),
+        "currency": "USD",
+        "inventory": rng.randint(0, 500),
+        "images": [f"https://images.example.com/products/{i}/{n}.jpg" for n in range(rng.randint(1, 4))],
+        "attributes": attributes,
+    })
+    product["_id"] = ObjectId()
+    product["created_at"] = product["updated_at"] = created_at
+    return product
+
+
+def _reviews(rng: random.Random, product: dict, reviewer_ids: list[ObjectId], count: int):
+    reviews, histogram = [], {str(rating): 0 for rating in RATINGS}
+    for user_id in rng.sample(reviewer_ids, min(count, len(reviewer_ids))):
+        rating = rng.choice(RATINGS)
+        histogram[str(rating)] += 1
+        created_at = product["created_at"] + timedelta(minutes=rng.randint(1, 10_000))
+        reviews.append({
+            "product_id": product["_id"],
+            "user_id": user_id,
+            "rating": rating,
+            "title": f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)}",
+            "description": " ".join(rng.choices(ADJECTIVES + NOUNS, k=20)),
+            "created_at": created_at,
+            "updated_at": created_at,
+        })
+    total = sum(review["rating"] for review in reviews)
+    product.update({
+        "reviews": len(reviews),
+        "review_sum": total,
+        "average_review": total / len(reviews) if reviews else 0,
+        "review_histogram": histogram,
+    })
+    return reviews
+
+
+def seed(
+    db: Database,
+    products: int,
+    users: int,
+    reviewed_share: float = 0.05,
+    reviews_per_product: int = 20,
+    lists_size: int = 10,
+    orders_per_user: int = 2,
+    batch_size: int = 5_000,
+    random_seed: int = 42,
+):
+    """
+    Replace the app's collections in `db` with a synthetic data set.
+
+    Args:
+        db (Database): Scratch database to fill; its app collections are dropped first.
+        products (int): Catalog size.
+        users (int): Number of users, each with settings, a wishlist and orders.
+        reviewed_share (float): Share of products that get reviews.
+        reviews_per_product (int): Reviews per reviewed product.
+        lists_size (int): Products on each user's wishlist.
+        orders_per_user (int): Orders per user.
+        batch_size (int): Documents per `insert_many`.
+        random_seed (int): Seed for reproducible data.
+
+    Returns:
+        SeededData: Ids and credentials for building requests.
+    """
+    rng = random.Random(random_seed)
+    for name in ("users", "products", "reviews", "lists", "settings", "orders"):
+        db.drop_collection(name)
+
+    # One hash for everyone: hashing a million passwords would dominate the seed time.
+    password_hash = generate_password_hash(PASSWORD, method=Config.PASSWORD_HASH_METHOD, salt_length=Config.PASSWORD_SALT_LENGTH)
+    user_ids = [ObjectId() for _ in range(users)]
+    emails = [f"user{i}@bench.example.com" for i in range(users)]
+    now = datetime.now()
+    for start in range(0, users, batch_size):
+        db.users.insert_many([
+            {
+                "_id": user_ids[i],
+                "name": f"User {i}",
+                "email": emails[i],
+                "password_hash": password_hash,
+                "role": "customer",
+                "created_at": now,
+            }
+            for i in range(start, min(start + batch_size, users))
+        ], ordered=False)
+
+    sellers = user_ids[: max(1, users // 100)]
+    product_ids, reviewed_ids = [], []
+    for start in range(0, products, batch_size):
+        batch, reviews = [], []
+        for i in range(start, min(start + batch_size, products)):
+            product = _product(i, rng, rng.choice(sellers), now - timedelta(seconds=products - i))
+            if rng.random() < reviewed_share:
+                reviews.extend(_reviews(rng, product, user_ids, reviews_per_product))
+                reviewed_ids.append(str(product["_id"]))
+            batch.append(product)
+            product_ids.append(str(product["_id"]))
+        db.products.insert_many(batch, ordered=False)
+        if reviews:
+            db.reviews.insert_many(reviews, ordered=False)
+
+    for start in range(0, users, batch_size):
+        settings, lists, orders = [], [], []
+        for user_id in user_ids[start: start + batch_size]:
+            settings.append(SettingsRepository.build_settings(user_id=user_id))
+            lists.append(ListsRepository.build_list(user_id=user_id, name="Wishlist", product_ids=rng.sample(product_ids, min(lists_size, products))))
+            for _ in range(orders_per_user):
+                order = OrdersRepository.build_order(user_id=user_id, product_ids=rng.sample(product_ids, min(3, products)), name="Bench User", address="1 Benchmark Street")
+                order["payment"] = {"status": "paid", "checkout_url": None, "error": None}
+                orders.append(order)
+        db.settings.insert_many(settings, ordered=False)
+        db.lists.insert_many(lists, ordered=False)
+        if orders:
+            db.orders.insert_many(orders, ordered=False)
+
+    ensure_indexes(db, INDEXED_REPOSITORIES)
+    return SeededData(product_ids=product_ids, reviewed_product_ids=reviewed_ids, emails=emails)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=SCALES, default="10k")
+    parser.add_argument("--products", type=int, help="Overrides the catalog size of --scale")
+    parser.add_argument("--users", type=int, help="Overrides the user count of --scale")
+    parser.add_argument("--mongo-uri", default=os.getenv("MONGO_URI", "mongodb://localhost:27017"))
+    parser.add_argument("--db", default="ecommerce_bench")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    data = seed(
+        MongoClient(args.mongo_uri)[args.db],
+        products=args.products or SCALES[args.scale],
+        users=args.users or SCALES[args.scale],
+    )
+    print(
+        f"Seeded {len(data.product_ids)} products ({len(data.reviewed_product_ids)} reviewed) and "
+        f"{len(data.emails)} users into {args.db} in {time.perf_counter() - started:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Measure Redis memory used by sessions keyed by full JWT vs compact session ids.
+
+Writes sample sessions into a scratch Redis database (flushed before and after each
+layout) and extrapolates `used_memory` growth to one million sessions.
+
+Usage:
+    python -m benchmarks.session_memory --sessions 100000 --redis-db 15
+"""
+import argparse
+import json
+import os
+import time
+
+import jwt
+import redis
+from bson import ObjectId
+
+from app.auth.sessions import session_id_for_token
+
+SESSIONS_PER_USER = 3
+TTL_SECONDS = 3600
+
+
+def _sample_tokens(count: int):
+    now = int(time.time())
+    for i in range(count):
+        user_id = str(ObjectId())
+        payload = {"sub": user_id, "iat": now, "exp": now + TTL_SECONDS, "email": f"user{i}@example.com", "role": "customer"}
+        yield user_id, jwt.encode(payload, "benchmark-secret", algorithm="HS256")
+
+
+def _legacy_layout(client: redis.Redis, tokens):
+    pipe = client.pipeline(transaction=False)
+    for user_id, token in tokens:
+        value = json.dumps({"user_id": user_id, "role": "customer", "email": "user@example.com"})
+        pipe.set(f"user_session:{token}", value, ex=TTL_SECONDS)
+    pipe.execute()
+
+
+def _indexed_layout(client: redis.Redis, tokens):
+    pipe = client.pipeline(transaction=False)
+    for i, (user_id, token) in enumerate(tokens):
+        # Group several sessions under the same user so the index sets are realistic.
+        owner = f"user{i // SESSIONS_PER_USER}"
+        session_id = session_id_for_token(token)
+        value = json.dumps(
+            {"user_id": user_id, "role": "customer", "email": "user@example.com", "created_at": "2025-01-01T00:00:00", "user_agent": ""},
+            separators=(",", ":"),
+        )
+        pipe.set(f"session:{session_id}", value, ex=TTL_SECONDS)
+        pipe.sadd(f"user_sessions:{owner}", session_id)
+        pipe.expire(f"user_sessions:{owner}", TTL_SECONDS)
+    pipe.execute()
+
+
+def _measure(client: redis.Redis, layout, tokens):
+    client.flushdb()
+    before = client.info("memory")["used_memory"]
+    layout(client, tokens)
+    after = client.info("memory")["used_memory"]
+    client.flushdb()
+    return after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--redis-host", default=os.getenv("REDIS_HOST", "localhost"))
+    parser.add_argument("--redis-port", type=int, default=int(os.getenv("REDIS_PORT", "6379")))
+    parser.add_argument("--redis-db", type=int, default=15)
+    args = parser.parse_args()
+
+    client = redis.Redis(host=args.redis_host, port=args.redis_port, db=args.redis_db)
+    tokens = list(_sample_tokens(args.sessions))
+    scale = 1_000_000 / args.sessions
+
+    legacy = _measure(client, _legacy_layout, tokens) * scale
+    indexed = _measure(client, _indexed_layout, tokens) * scale
+
+    mib = 1024 * 1024
+    print(f"legacy  (user_session:<jwt>):            {legacy / mib:,.1f} MiB per 1M sessions")
+    print(f"indexed (session:<id> + user_sessions): {indexed / mib:,.1f} MiB per 1M sessions")
+    print(f"saved: {(legacy - indexed) / mib:,.1f} MiB ({(1 - indexed / legacy) * 100:.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
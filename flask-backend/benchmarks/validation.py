@@ -0,0 +1,77 @@
+"""
+Micro-benchmark of request body validation for large checkout carts.
+
+Compares the previous path (`request.get_json()` through the orjson provider, then
+`OrderWithPaymentSchema(**payload)`) with `validate_body`'s single pass, in which the
+precompiled `TypeAdapter` validates the raw bytes directly. Reports the best time per
+body and the peak memory allocated while validating one body.
+
+Usage:
+    python -m benchmarks.validation --items 10 100 1000 10000
+"""
+import argparse
+import timeit
+import tracemalloc
+
+from bson import ObjectId
+from flask import Flask
+
+from app.extensions.json_provider import MongoJSONProvider
+from app.extensions.validation import body_adapter
+from app.orders.routes import OrderWithPaymentSchema
+
+
+def _cart(items: int):
+    return {
+        "name": "Load Test",
+        "address": "1 Benchmark Street, Springfield",
+        "items": [
+            {
+                "product_id": str(ObjectId()),
+                "product_name": f"Wireless keyboard {i}",
+                "amount": 19.99 + i % 100,
+                "quantity": 1 + i % 5,
+                "currency": "USD",
+            }
+            for i in range(items)
+        ],
+    }
+
+
+def _peak_kib(validate, raw: bytes):
+    tracemalloc.start()
+    validate(raw)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    provider = MongoJSONProvider(Flask(__name__))
+    adapter = body_adapter(OrderWithPaymentSchema)
+
+    def legacy(raw: bytes):
+        return OrderWithPaymentSchema(**provider.loads(raw))
+
+    def single_pass(raw: bytes):
+        return adapter.validate_json(raw)
+
+    print(f"{'items':>7} {'body KiB':>9} {'dict ms':>9} {'raw ms':>9} {'speedup':>8} {'dict peak KiB':>14} {'raw peak KiB':>13}")
+    for items in args.items:
+        raw = provider.dumps_bytes(_cart(items))
+        assert legacy(raw) == single_pass(raw)
+        legacy_ms = min(timeit.repeat(lambda: legacy(raw), number=1, repeat=args.repeat)) * 1000
+        fast_ms = min(timeit.repeat(lambda: single_pass(raw), number=1, repeat=args.repeat)) * 1000
+        print(
+            f"{items:>7} {len(raw) / 1024:>9.1f} {legacy_ms:>9.3f} {fast_ms:>9.3f} {legacy_ms / fast_ms:>7.1f}x "
+            f"{_peak_kib(legacy, raw):>14.0f} {_peak_kib(single_pass, raw):>13.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Throughput of the production gunicorn setup as workers go from 1 to N.
+
+For each worker count, starts `gunicorn` with this directory's `gunicorn.conf.py`
+(`WSGI_WORKERS=<n>`), drives `--path` from `--clients` load generator processes with
+`--concurrency` keep-alive connections in total, and reports requests per second and
+the speedup over one worker. The load generators compete with the server for CPU,
+so leave them fewer cores than the largest worker count or run this from another
+host with `--url`.
+
+Usage:
+    python -m benchmarks.worker_scaling --workers 1 2 4 8 --path /products/?limit=20
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+from app.serving import available_cpus
+from benchmarks.async_load import Connection
+
+
+def _client(host: str, port: int, path: str, connections: int, seconds: float):
+    async def run():
+        done, errors = 0, 0
+        deadline = time.perf_counter() + seconds
+
+        async def loop():
+            nonlocal done, errors
+            conn = Connection(host, port)
+            while time.perf_counter() < deadline:
+                try:
+                    status, _, _ = await conn.request("GET", path)
+                except (OSError, asyncio.IncompleteReadError):
+                    errors += 1
+                    await conn.close()
+                    continue
+                if status < 500:
+                    done += 1
+                else:
+                    errors += 1
+            await conn.close()
+
+        await asyncio.gather(*(loop() for _ in range(connections)))
+        return done, errors
+
+    return asyncio.run(run())
+
+
+def _wait_until_serving(host: str, port: int, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            status, _, _ = asyncio.run(Connection(host, port).request("GET", "/health"))
+            if status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise SystemExit("gunicorn did not start")
+
+
+def _measure(args, host: str, port: int, workers: int):
+    env = {**os.environ, "WSGI_WORKERS": str(workers), "WSGI_BIND": f"{host}:{port}"}
+    if args.threads:
+        env["WSGI_THREADS"] = str(args.threads)
+    server = subprocess.Popen([sys.executable, "-m", "gunicorn"], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        _wait_until_serving(host, port)
+        per_client = max(1, args.concurrency // args.clients)
+        with multiprocessing.get_context("spawn").Pool(args.clients) as pool:
+            started = time.perf_counter()
+            results = pool.starmap(_client, [(host, port, args.path, per_client, args.seconds)] * args.clients)
+            elapsed = time.perf_counter() - started
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=30)
+    return sum(done for done, _ in results) / elapsed, sum(errors for _, errors in results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:5077", help="Address gunicorn binds to")
+    parser.add_argument("--path", default="/health")
+    parser.add_argument("--workers", type=int, nargs="+", default=None, help="Defaults to 1, 2, 4, ... up to the usable CPUs")
+    parser.add_argument("--threads", type=int, default=0, help="Threads per worker; 0 = gunicorn.conf.py sizing")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--clients", type=int, default=2, help="Load generator processes")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+
+    cpus = available_cpus()
+    worker_counts = args.workers or sorted({min(2 ** i, cpus) for i in range(cpus.bit_length() + 1)})
+    url = urlsplit(args.url)
+
+    print(f"path={args.path} cpus={cpus} concurrency={args.concurrency} clients={args.clients}")
+    print(f"{'workers':>7} {'req/s':>9} {'speedup':>8} {'errors':>7}")
+    baseline = None
+    for workers in worker_counts:
+        rate, errors = _measure(args, url.hostname, url.port, workers)
+        baseline = baseline or rate
+        print(f"{workers:>7} {rate:>9.1f} {rate / baseline:>7.2f}x {errors:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Production gunicorn settings, picked up automatically by `gunicorn` run from this directory.
+
+    gunicorn
+
+Workers and threads are sized by `app.serving.plan_workers` from the usable CPUs and
+`WSGI_IO_RATIO`; `WSGI_WORKERS` / `WSGI_THREADS` override either. The app is
+preloaded in the master, which closes its client connections before forking, and
+every worker builds its own MongoDB and Redis clients in `post_fork`.
+
+`kill -HUP <master>` re-reads this file and replaces the workers one generation at a
+time, letting in-flight requests finish within `WSGI_GRACEFUL_TIMEOUT_SECONDS`. A
+preloaded master keeps the code it started with, so deploy new code with
+`kill -USR2 <master>` (starts a new master next to the old one) followed by
+`kill -TERM <old master>` once the new workers are up.
+
+Export `PROMETHEUS_MULTIPROC_DIR` (an empty directory) so `/metrics` aggregates all workers.
+"""
+import os
+
+from app.config import Config
+from app.serving import plan_workers, release_clients, reinit_clients
+
+plan = plan_workers(
+    io_ratio=Config.WSGI_IO_RATIO,
+    workers=Config.WSGI_WORKERS,
+    threads=Config.WSGI_THREADS,
+    max_threads=Config.WSGI_MAX_THREADS,
+)
+
+wsgi_app = "app:create_app()"
+bind = Config.WSGI_BIND
+workers = plan.workers
+threads = plan.threads
+worker_class = "gthread" if plan.threads > 1 else "sync"
+preload_app = Config.WSGI_PRELOAD
+timeout = Config.WSGI_TIMEOUT_SECONDS
+graceful_timeout = Config.WSGI_GRACEFUL_TIMEOUT_SECONDS
+keepalive = Config.WSGI_KEEPALIVE_SECONDS
+max_requests = Config.WSGI_MAX_REQUESTS
+max_requests_jitter = Config.WSGI_MAX_REQUESTS // 10
+
+
+def when_ready(server):
+    server.log.info(
+        "Serving with %d workers x %d threads (%d usable CPUs, io_ratio=%s)",
+        plan.workers, plan.threads, plan.cpus, Config.WSGI_IO_RATIO,
+    )
+    if plan.threads > Config.MONGO_MAX_POOL_SIZE:
+        server.log.warning(
+            "WSGI threads (%d) exceed MONGO_MAX_POOL_SIZE (%d); requests will queue for connections",
+            plan.threads, Config.MONGO_MAX_POOL_SIZE,
+        )
+    if preload_app:
+        release_clients(server.app.wsgi())
+
+
+def post_fork(server, worker):
+    if preload_app:
+        reinit_clients(server.app.wsgi())
+
+
+def child_exit(server, worker):
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        # Drop the exited worker's live gauges; its counters and histograms are kept.
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -1,5 +1,5 @@
 import { apiConfig, baseHeaders } from "@/config";
-import { handleResponseError } from "@/utils/api";
+import { handleResponseError, type Page } from "@/utils/api";
 
 export type List = {
     id: string;
@@ -28,7 +28,7 @@ export const getListsRequest = async (): Promise<ListsResponse> => {
     const defaultErrorMessage = "Unable to fetch lists.";
     await handleResponseError(response, defaultErrorMessage);
 
-    return await response.json();
+    return ((await response.json()) as Page<List>).items;
 };
 
 export const createListRequest = async (
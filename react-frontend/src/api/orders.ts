@@ -1,5 +1,5 @@
 import { apiConfig, baseHeaders } from "@/config";
-import { handleResponseError } from "@/utils/api";
+import { handleResponseError, type Page } from "@/utils/api";
 import { type CartItem } from "@/features/cart/CartContext";
 
 export type Order = {
@@ -31,6 +31,20 @@ export type CreateOrderWithPaymentResponse = {
     error?: string;
 };
 
+export type CheckoutStatusResponse = {
+    order_id: string;
+    status: "pending" | "ready" | "failed" | "unknown";
+    url: string | null;
+    error: string | null;
+};
+
+// Seconds the server may hold each status request open waiting for the payment session.
+// Only the ASGI server long-polls; the WSGI server answers at once, so pending answers
+// that come back early are retried after a short pause until the overall deadline.
+const CHECKOUT_POLL_WAIT_SECONDS = 10;
+const CHECKOUT_POLL_TIMEOUT_MS = 60_000;
+const CHECKOUT_POLL_MIN_INTERVAL_MS = 1_000;
+
 export const getOrdersRequest = async (): Promise<OrdersResponse> => {
     const response = await fetch(apiConfig.orders.base, {
         method: "GET",
@@ -40,7 +54,7 @@ export const getOrdersRequest = async (): Promise<OrdersResponse> => {
     const defaultErrorMessage = "Unable to fetch orders.";
     await handleResponseError(response, defaultErrorMessage);
 
-    return await response.json();
+    return ((await response.json()) as Page<Order>).items;
 };
 
 export const createOrderWithPayment = async (
@@ -69,5 +83,32 @@ export const createOrderWithPayment = async (
     const defaultErrorMessage = "Unable to create order and start payment.";
     await handleResponseError(response, defaultErrorMessage);
 
-    return await response.json() as Promise<CreateOrderWithPaymentResponse>;
+    const { order_id } = (await response.json()) as { order_id: string };
+    const checkout = await waitForCheckout(order_id);
+    if (checkout.status !== "ready" || !checkout.url) {
+        throw new Error(checkout.error ?? defaultErrorMessage);
+    }
+    return { order_id, url: checkout.url };
+};
+
+export const waitForCheckout = async (orderId: string): Promise<CheckoutStatusResponse> => {
+    const deadline = Date.now() + CHECKOUT_POLL_TIMEOUT_MS;
+    while (Date.now() < deadline) {
+        const startedAt = Date.now();
+        const response = await fetch(apiConfig.orders.checkout(orderId, CHECKOUT_POLL_WAIT_SECONDS), {
+            method: "GET",
+            credentials: "include",
+            headers: baseHeaders(),
+        });
+        await handleResponseError(response, "Unable to fetch payment status.");
+
+        const status = (await response.json()) as CheckoutStatusResponse;
+        if (status.status !== "pending") return status;
+
+        const elapsed = Date.now() - startedAt;
+        if (elapsed < CHECKOUT_POLL_MIN_INTERVAL_MS) {
+            await new Promise((resolve) => setTimeout(resolve, CHECKOUT_POLL_MIN_INTERVAL_MS - elapsed));
+        }
+    }
+    throw new Error("Payment is taking longer than expected. Please check your orders shortly.");
 };
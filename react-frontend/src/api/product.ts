@@ -1,5 +1,5 @@
 import { apiConfig, baseHeaders } from "@/config";
-import { handleResponseError } from "@/utils/api";
+import { handleResponseError, type Page } from "@/utils/api";
 
 export type Product = {
     id: string;
@@ -14,6 +14,7 @@ export type Product = {
     attributes: Record<string, string>;
     average_review: number;
     reviews: number;
+    review_histogram?: Record<"1" | "2" | "3" | "4" | "5", number>;
     created_at?: string;
     updated_at?: string;
 };
@@ -79,7 +80,7 @@ export const getProductsRequest = async (
     const defaultErrorMessage = "Unable to fetch products.";
     await handleResponseError(response, defaultErrorMessage);
 
-    return (await response.json()) as ProductsResponse;
+    return ((await response.json()) as Page<Product>).items;
 };
 
 export const getProductByIdRequest = async (
@@ -105,7 +106,7 @@ export const getProductReviewsRequest = async (
     const defaultErrorMessage = "Unable to fetch product reviews.";
     await handleResponseError(response, defaultErrorMessage);
 
-    return await response.json() as Promise<ProductReviewsResponse>;
+    return ((await response.json()) as Page<ProductReview>).items;
 }
 
 export const createProductRequest = async (
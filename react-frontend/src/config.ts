@@ -47,5 +47,6 @@ export const apiConfig = {
     orders: {
         base: `${BASE}/orders`,
         detail: (orderId: string) => `${BASE}/orders/${orderId}`,
+        checkout: (orderId: string, wait: number) => `${BASE}/orders/${orderId}/checkout?wait=${wait}`,
     },
 } as const;
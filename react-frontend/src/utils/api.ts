@@ -5,3 +5,8 @@ export async function handleResponseError(response: Response, defaultErrorMessag
         throw new Error(message);
     }
 }
+
+export type Page<T> = {
+    items: T[];
+    next_cursor: string | null;
+};